@@ -0,0 +1,180 @@
+"""Compare plain and seekable zstd TAR replicas for size and dataset fetches."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from seekable_tar import (
+    DEFAULT_COMPRESSION_LEVEL,
+    DEFAULT_FRAME_BYTES,
+    SeekableTarReader,
+    dataset_for_member,
+    dataset_members,
+    read_tar_index,
+    replica_path_for_tar,
+    scan_tar_members,
+    write_seekable_replica,
+)
+
+
+def fetch_plain(tar_path: Path, members: list[dict[str, Any]]) -> int:
+    """Read every file member of one dataset from an uncompressed TAR."""
+    total = 0
+    with tar_path.open("rb") as stream:
+        for member in members:
+            if member["type"] == "5":
+                continue
+            stream.seek(member["offset_data"])
+            total += len(stream.read(member["size"]))
+    return total
+
+
+def fetch_seekable(replica_path: Path, members: list[dict[str, Any]]) -> int:
+    """Read every file member of one dataset from a seekable replica."""
+    total = 0
+    with SeekableTarReader(replica_path) as reader:
+        for member in members:
+            if member["type"] == "5":
+                continue
+            total += len(reader.read(member["offset_data"], member["size"]))
+    return total
+
+
+def time_fetches(
+    function: Any,
+    path: Path,
+    samples: list[list[dict[str, Any]]],
+    repeat: int,
+) -> list[float]:
+    """Return per-fetch wall times in milliseconds."""
+    timings: list[float] = []
+    for _ in range(repeat):
+        for members in samples:
+            start = time.perf_counter()
+            function(path, members)
+            timings.append((time.perf_counter() - start) * 1e3)
+    return timings
+
+
+def summarize(timings: list[float]) -> dict[str, float]:
+    """Return mean, median, and maximum fetch times."""
+    ordered = sorted(timings)
+    return {
+        "mean_ms": statistics.fmean(ordered),
+        "p50_ms": ordered[len(ordered) // 2],
+        "max_ms": ordered[-1],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Benchmark a seekable zstd replica against its uncompressed TAR."
+        )
+    )
+    parser.add_argument("tar", type=Path, help="Uncompressed campaign TAR.")
+    parser.add_argument(
+        "--replica",
+        type=Path,
+        help="Existing .tar.zst replica; otherwise one is written to a temp dir.",
+    )
+    parser.add_argument("--frame-bytes", type=int, default=DEFAULT_FRAME_BYTES)
+    parser.add_argument("--level", type=int, default=DEFAULT_COMPRESSION_LEVEL)
+    parser.add_argument(
+        "--datasets",
+        type=int,
+        default=10,
+        help="Number of randomly sampled datasets to fetch (default: 10).",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", type=Path, help="Optional JSON result file.")
+    args = parser.parse_args()
+
+    index_path = args.tar.with_name(f"{args.tar.name}.idx")
+    members = (
+        read_tar_index(index_path)
+        if index_path.is_file()
+        else scan_tar_members(args.tar)
+    )
+    datasets = sorted(
+        {
+            dataset
+            for dataset in map(dataset_for_member, (m["name"] for m in members))
+            if dataset is not None
+        }
+    )
+    if not datasets:
+        raise ValueError(f"No BP5 datasets found in {args.tar}")
+    sampled = random.Random(args.seed).sample(
+        datasets, min(args.datasets, len(datasets))
+    )
+    samples = [dataset_members(members, dataset) for dataset in sampled]
+
+    with tempfile.TemporaryDirectory() as scratch:
+        replica_path = args.replica
+        compress_seconds = None
+        if replica_path is None:
+            replica_path = Path(scratch) / replica_path_for_tar(args.tar).name
+            start = time.perf_counter()
+            write_seekable_replica(
+                args.tar,
+                index_path=index_path if index_path.is_file() else None,
+                replica_path=replica_path,
+                frame_bytes=args.frame_bytes,
+                level=args.level,
+            )
+            compress_seconds = time.perf_counter() - start
+
+        plain_size = args.tar.stat().st_size
+        replica_size = replica_path.stat().st_size
+        plain = time_fetches(fetch_plain, args.tar, samples, args.repeat)
+        seekable = time_fetches(fetch_seekable, replica_path, samples, args.repeat)
+
+    result = {
+        "tar": str(args.tar),
+        "datasets_in_tar": len(datasets),
+        "datasets_sampled": len(samples),
+        "frame_bytes": args.frame_bytes,
+        "level": args.level,
+        "plain_bytes": plain_size,
+        "seekable_bytes": replica_size,
+        "compression_ratio": plain_size / replica_size,
+        "compress_seconds": compress_seconds,
+        "plain_fetch": summarize(plain),
+        "seekable_fetch": summarize(seekable),
+    }
+
+    print(f"TAR             : {args.tar}")
+    print(f"Datasets        : {len(samples)} sampled of {len(datasets)}")
+    print(f"Plain size      : {plain_size / 2**20:.2f} MiB")
+    print(
+        f"Seekable size   : {replica_size / 2**20:.2f} MiB "
+        f"(ratio {result['compression_ratio']:.2f}x)"
+    )
+    if compress_seconds is not None:
+        print(f"Compression time: {compress_seconds:.2f} s")
+    for label, key in (
+        ("Plain fetch", "plain_fetch"),
+        ("Seekable fetch", "seekable_fetch"),
+    ):
+        stats = result[key]
+        print(
+            f"{label:<16}: mean {stats['mean_ms']:.2f} ms, "
+            f"p50 {stats['p50_ms']:.2f} ms, max {stats['max_ms']:.2f} ms"
+        )
+
+    if args.json is not None:
+        args.json.write_text(json.dumps(result, indent=2), encoding="utf-8")
+        print(f"\nSaved benchmark results to: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,17 +5,27 @@ from __future__ import annotations
 import argparse
 import hashlib
 import json
-import re
 import shlex
 import subprocess
 from collections import defaultdict
 from pathlib import Path
 from typing import Any
 
+from rhino.campaign.archive_layout import locate_dataset, run_id_from_path
+from seekable_tar import (
+    DEFAULT_FRAME_BYTES,
+    dataset_for_member,
+    frame_index_path_for_replica,
+    read_tar_index,
+    replica_path_for_tar,
+    write_seekable_replica,
+)
+
 
 DEFAULT_SPEC = Path(__file__).with_name("campaign_spec.json")
-RUN_ID_PATTERN = re.compile(r"\d{2}-\d{2}-\d{2}.*")
 SUPPORTED_TAR_STORAGE_SYSTEMS = {"Kronos", "HPSS", "fs", "https", "S3"}
+SUPPORTED_TAR_COMPRESSION = {"none", "zstd-seekable"}
+TAR_BLOCK_BYTES = 512
 
 
 def load_spec(path: Path) -> dict[str, Any]:
@@ -60,6 +70,26 @@ def load_spec(path: Path) -> dict[str, Any]:
     if not spec["TAR_STORAGE_HOST"]:
         raise ValueError("TAR_STORAGE_HOST must not be empty")
 
+    spec.setdefault("TAR_MAX_BYTES", None)
+    if spec["TAR_MAX_BYTES"] is not None and (
+        isinstance(spec["TAR_MAX_BYTES"], bool)
+        or not isinstance(spec["TAR_MAX_BYTES"], int)
+    ):
+        raise TypeError("Setting 'TAR_MAX_BYTES' must be int or null")
+    if spec["TAR_MAX_BYTES"] is not None and spec["TAR_MAX_BYTES"] <= 0:
+        raise ValueError("TAR_MAX_BYTES must be greater than zero")
+    spec.setdefault("TAR_COMPRESSION", "none")
+    spec.setdefault("TAR_FRAME_BYTES", DEFAULT_FRAME_BYTES)
+    if spec["TAR_COMPRESSION"] not in SUPPORTED_TAR_COMPRESSION:
+        allowed = ", ".join(sorted(SUPPORTED_TAR_COMPRESSION))
+        raise ValueError(f"TAR_COMPRESSION must be one of: {allowed}")
+    if isinstance(spec["TAR_FRAME_BYTES"], bool) or not isinstance(
+        spec["TAR_FRAME_BYTES"], int
+    ):
+        raise TypeError("Setting 'TAR_FRAME_BYTES' must be int")
+    if spec["TAR_FRAME_BYTES"] <= 0:
+        raise ValueError("TAR_FRAME_BYTES must be greater than zero")
+
     return spec
 
 
@@ -103,12 +133,6 @@ def discover_datasets(input_directories: list[Path]) -> list[Path]:
     return sorted(datasets, key=lambda path: str(path))
 
 
-def run_id_from_path(dataset: Path) -> str:
-    """Derive a RHINO run identifier from a BP5 dataset name."""
-    match = RUN_ID_PATTERN.search(dataset.stem)
-    return match.group(0) if match else dataset.stem
-
-
 def run_command(command: list[str], *, cwd: Path, dry_run: bool) -> None:
     """Display and optionally execute one external command."""
     print(f"  Command : {shlex.join(command)}")
@@ -155,24 +179,173 @@ def verify_checksum(tar_path: Path) -> None:
         )
 
 
+def prepare_seekable_replica(
+    tar_path: Path,
+    index_path: Path,
+    *,
+    frame_bytes: int,
+    rebuild: bool,
+    dry_run: bool,
+) -> None:
+    """Create or verify the seekable zstd replica of one indexed TAR."""
+    replica_path = replica_path_for_tar(tar_path)
+    frame_index_path = frame_index_path_for_replica(replica_path)
+    replica_is_stale = (
+        replica_path.exists()
+        and tar_path.exists()
+        and tar_path.stat().st_mtime_ns > replica_path.stat().st_mtime_ns
+    )
+    if rebuild or replica_is_stale or not replica_path.exists() or (
+        not frame_index_path.exists()
+    ):
+        print(f"  Compress: {replica_path}")
+        print(f"  Frames  : {frame_index_path}")
+        if not dry_run:
+            write_seekable_replica(
+                tar_path,
+                index_path=index_path,
+                replica_path=replica_path,
+                frame_bytes=frame_bytes,
+            )
+            write_checksum(replica_path)
+        return
+
+    print(f"  Reusing  : {replica_path}")
+    if dry_run:
+        print(f"  Verify   : {replica_path.name}.sha256")
+    else:
+        verify_checksum(replica_path)
+        print(f"  Verified : {replica_path.name}.sha256")
+
+
 def tar_path_for_directory(
-    input_directory: Path, tar_output_dir: Path, tar_prefix: str
+    input_directory: Path,
+    tar_output_dir: Path,
+    tar_prefix: str,
+    shard_number: int | None = None,
 ) -> Path:
-    """Return the TAR path associated with one configured input directory."""
-    return tar_output_dir / f"{tar_prefix}-{input_directory.name}.tar"
+    """Return the TAR path associated with one input directory or its shard."""
+    if shard_number is None:
+        return tar_output_dir / f"{tar_prefix}-{input_directory.name}.tar"
+    return (
+        tar_output_dir
+        / f"{tar_prefix}-{input_directory.name}-part{shard_number:03d}.tar"
+    )
+
+
+def tar_file_set(tar_path: Path) -> list[Path]:
+    """Return a TAR with its checksum, index, and seekable-replica sidecars."""
+    replica_path = replica_path_for_tar(tar_path)
+    return [
+        tar_path,
+        tar_path.with_name(f"{tar_path.name}.sha256"),
+        tar_path.with_name(f"{tar_path.name}.idx"),
+        replica_path,
+        replica_path.with_name(f"{replica_path.name}.sha256"),
+        frame_index_path_for_replica(replica_path),
+    ]
+
+
+def stale_tar_paths(
+    input_directory: Path,
+    tar_output_dir: Path,
+    tar_prefix: str,
+    planned: set[Path],
+) -> list[Path]:
+    """Return TARs of one input directory that the current shard plan omits.
+
+    These are left behind when a directory is re-archived with fewer shards or
+    switches between one TAR and shards.
+    """
+    candidates = [
+        tar_path_for_directory(input_directory, tar_output_dir, tar_prefix),
+        *tar_output_dir.glob(
+            f"{tar_prefix}-{input_directory.name}-part[0-9][0-9][0-9].tar"
+        ),
+    ]
+    return sorted(
+        path for path in candidates if path.exists() and path not in planned
+    )
+
+
+def estimated_tar_bytes(dataset: Path) -> int:
+    """Estimate the TAR bytes of one BP5 dataset, including member headers."""
+    total = TAR_BLOCK_BYTES
+    for path in dataset.rglob("*"):
+        total += TAR_BLOCK_BYTES
+        if path.is_file():
+            size = path.stat().st_size
+            total += -(-size // TAR_BLOCK_BYTES) * TAR_BLOCK_BYTES
+    return total
+
+
+def plan_tar_shards(
+    datasets: list[Path], max_bytes: int | None
+) -> list[list[Path]]:
+    """Split sorted datasets into consecutive shards of at most `max_bytes`.
+
+    Shards always hold whole datasets. A dataset larger than the limit is
+    placed in a shard of its own.
+    """
+    if max_bytes is None:
+        return [datasets]
+
+    shards: list[list[Path]] = []
+    current: list[Path] = []
+    current_bytes = 0
+    for dataset in datasets:
+        dataset_bytes = estimated_tar_bytes(dataset)
+        if current and current_bytes + dataset_bytes > max_bytes:
+            shards.append(current)
+            current = []
+            current_bytes = 0
+        current.append(dataset)
+        current_bytes += dataset_bytes
+    if current:
+        shards.append(current)
+    return shards
+
+
+def verify_shard_members(
+    index_path: Path, datasets: list[Path], data_root: Path
+) -> None:
+    """Raise an error if a reused TAR shard no longer holds its planned datasets."""
+    expected = {str(dataset.relative_to(data_root)) for dataset in datasets}
+    actual = {
+        dataset
+        for dataset in (
+            dataset_for_member(member["name"])
+            for member in read_tar_index(index_path)
+        )
+        if dataset is not None
+    }
+    if actual != expected:
+        raise ValueError(
+            f"TAR shard {index_path.name.removesuffix('.idx')} does not match "
+            "the current shard plan. Use --rebuild-tars to replace it."
+        )
 
 
 def create_tar_archives(
     *,
     data_root: Path,
     input_directories: list[Path],
+    datasets: list[Path],
     tar_output_dir: Path,
     tar_prefix: str,
     rebuild_tars: bool,
     dry_run: bool,
+    compression: str = "none",
+    frame_bytes: int = DEFAULT_FRAME_BYTES,
+    max_tar_bytes: int | None = None,
 ) -> dict[Path, Path]:
-    """Create, verify, and index one TAR for each BP5 input directory."""
-    tar_paths: dict[Path, Path] = {}
+    """Create, verify, and index the TARs for each BP5 input directory.
+
+    Without `max_tar_bytes`, each input directory becomes one TAR. Otherwise
+    its datasets are split into numbered, dataset-aligned shards. The returned
+    mapping gives the TAR that holds each dataset.
+    """
+    dataset_tars: dict[Path, Path] = {}
     seen_paths: set[Path] = set()
 
     if not dry_run:
@@ -180,71 +353,125 @@ def create_tar_archives(
 
     for input_directory in input_directories:
         relative_directory = input_directory.relative_to(data_root)
-        tar_path = tar_path_for_directory(
-            input_directory, tar_output_dir, tar_prefix
-        )
-        checksum_path = tar_path.with_name(f"{tar_path.name}.sha256")
-        index_path = tar_path.with_name(f"{tar_path.name}.idx")
-
-        if tar_path in seen_paths:
-            raise ValueError(
-                f"Multiple INPUT_DIRS produce the same TAR name: {tar_path}"
-            )
-        seen_paths.add(tar_path)
-        tar_paths[input_directory] = tar_path
         if tar_output_dir.is_relative_to(input_directory):
             raise ValueError(
                 f"TAR_OUTPUT_DIR cannot be inside a directory being archived: "
                 f"{input_directory}"
             )
 
-        print(f"\nPreparing TAR for {relative_directory}:")
-        create_tar = rebuild_tars or not tar_path.exists()
-        if create_tar:
-            run_command(
-                ["tar", "-cf", str(tar_path), str(relative_directory)],
-                cwd=data_root,
-                dry_run=dry_run,
-            )
-            print(f"  Checksum: {checksum_path}")
-            if not dry_run:
-                write_checksum(tar_path)
+        directory_datasets = [
+            dataset for dataset in datasets if dataset.parent == input_directory
+        ]
+        if max_tar_bytes is None:
+            shards = [(None, [relative_directory], directory_datasets)]
         else:
-            print(f"  Reusing  : {tar_path}")
-            if not checksum_path.is_file():
-                raise FileNotFoundError(
-                    f"Existing TAR has no checksum file: {checksum_path}. "
-                    "Use --rebuild-tars to replace it."
+            shards = [
+                (
+                    number,
+                    [dataset.relative_to(data_root) for dataset in shard],
+                    shard,
                 )
-            if dry_run:
-                print(f"  Verify   : {checksum_path}")
-            else:
-                verify_checksum(tar_path)
-                print(f"  Verified : {checksum_path}")
+                for number, shard in enumerate(
+                    plan_tar_shards(directory_datasets, max_tar_bytes),
+                    start=1,
+                )
+            ]
 
-        index_is_stale = (
-            tar_path.exists()
-            and index_path.exists()
-            and tar_path.stat().st_mtime_ns > index_path.stat().st_mtime_ns
+        stale = stale_tar_paths(
+            input_directory,
+            tar_output_dir,
+            tar_prefix,
+            {
+                tar_path_for_directory(
+                    input_directory, tar_output_dir, tar_prefix, number
+                )
+                for number, _, _ in shards
+            },
         )
-        if create_tar or not index_path.exists() or index_is_stale:
-            run_command(
-                ["hpc_campaign", "taridx", str(tar_path), str(index_path)],
-                cwd=data_root,
-                dry_run=dry_run,
+        if stale and not rebuild_tars:
+            raise ValueError(
+                f"TAR file(s) from an earlier shard plan of {relative_directory} "
+                f"would be registered with the new ones: "
+                f"{', '.join(path.name for path in stale)}. "
+                "Use --rebuild-tars to remove them."
             )
-        else:
-            print(f"  Reusing  : {index_path}")
+        for tar_path in stale:
+            print(f"\nRemoving stale TAR: {tar_path}")
+            if not dry_run:
+                for path in tar_file_set(tar_path):
+                    path.unlink(missing_ok=True)
+
+        for shard_number, members, shard_datasets in shards:
+            tar_path = tar_path_for_directory(
+                input_directory, tar_output_dir, tar_prefix, shard_number
+            )
+            checksum_path = tar_path.with_name(f"{tar_path.name}.sha256")
+            index_path = tar_path.with_name(f"{tar_path.name}.idx")
 
-    return tar_paths
+            if tar_path in seen_paths:
+                raise ValueError(
+                    f"Multiple INPUT_DIRS produce the same TAR name: {tar_path}"
+                )
+            seen_paths.add(tar_path)
+            for dataset in shard_datasets:
+                dataset_tars[dataset] = tar_path
 
+            if shard_number is None:
+                print(f"\nPreparing TAR for {relative_directory}:")
+            else:
+                print(
+                    f"\nPreparing TAR shard {shard_number} of {len(shards)} "
+                    f"for {relative_directory} ({len(shard_datasets)} dataset(s)):"
+                )
+            create_tar = rebuild_tars or not tar_path.exists()
+            if create_tar:
+                run_command(
+                    ["tar", "-cf", str(tar_path), *map(str, members)],
+                    cwd=data_root,
+                    dry_run=dry_run,
+                )
+                print(f"  Checksum: {checksum_path}")
+                if not dry_run:
+                    write_checksum(tar_path)
+            else:
+                print(f"  Reusing  : {tar_path}")
+                if not checksum_path.is_file():
+                    raise FileNotFoundError(
+                        f"Existing TAR has no checksum file: {checksum_path}. "
+                        "Use --rebuild-tars to replace it."
+                    )
+                if dry_run:
+                    print(f"  Verify   : {checksum_path}")
+                else:
+                    verify_checksum(tar_path)
+                    print(f"  Verified : {checksum_path}")
+
+            index_is_stale = (
+                tar_path.exists()
+                and index_path.exists()
+                and tar_path.stat().st_mtime_ns > index_path.stat().st_mtime_ns
+            )
+            if create_tar or not index_path.exists() or index_is_stale:
+                run_command(
+                    ["hpc_campaign", "taridx", str(tar_path), str(index_path)],
+                    cwd=data_root,
+                    dry_run=dry_run,
+                )
+            else:
+                print(f"  Reusing  : {index_path}")
+            if shard_number is not None and not dry_run:
+                verify_shard_members(index_path, shard_datasets, data_root)
+
+            if compression == "zstd-seekable":
+                prepare_seekable_replica(
+                    tar_path,
+                    index_path,
+                    frame_bytes=frame_bytes,
+                    rebuild=create_tar,
+                    dry_run=dry_run,
+                )
 
-def archive_name_for_dataset(
-    dataset_number: int, archive_prefix: str, archive_size: int
-) -> str:
-    """Return the campaign archive name for a zero-based dataset position."""
-    archive_number = dataset_number // archive_size + 1
-    return f"{archive_prefix}{archive_number}.aca"
+    return dataset_tars
 
 
 def create_campaign_archives(
@@ -260,10 +487,9 @@ def create_campaign_archives(
     archive_datasets: dict[str, list[Path]] = defaultdict(list)
 
     for dataset_number, dataset in enumerate(datasets):
-        archive = archive_name_for_dataset(
+        _, archive, datasetid = locate_dataset(
             dataset_number, archive_prefix, archive_size
         )
-        position = dataset_number % archive_size
         relative_dataset = dataset.relative_to(data_root)
         run_id = run_id_from_path(dataset)
         archive_datasets[archive].append(dataset)
@@ -280,7 +506,7 @@ def create_campaign_archives(
             str(campaign_store),
             archive,
         ]
-        if position == 0:
+        if datasetid == 1:
             command.append("--truncate")
         command.extend(["data", str(relative_dataset), "--name", run_id])
         run_command(command, cwd=data_root, dry_run=dry_run)
@@ -291,8 +517,7 @@ def create_campaign_archives(
 def register_tar_replicas(
     *,
     archive_datasets: dict[str, list[Path]],
-    input_directories: list[Path],
-    tar_paths: dict[Path, Path],
+    dataset_tars: dict[Path, Path],
     data_root: Path,
     campaign_store: Path,
     storage_system: str,
@@ -300,23 +525,12 @@ def register_tar_replicas(
     dry_run: bool,
 ) -> None:
     """Register only the TAR files containing datasets in each campaign archive."""
-    dataset_directories = {
-        dataset: next(
-            directory
-            for directory in input_directories
-            if dataset.parent == directory
-        )
-        for datasets in archive_datasets.values()
-        for dataset in datasets
-    }
-
     for archive, datasets in archive_datasets.items():
-        relevant_directories = sorted(
-            {dataset_directories[dataset] for dataset in datasets},
+        relevant_tars = sorted(
+            {dataset_tars[dataset] for dataset in datasets},
             key=str,
         )
-        for input_directory in relevant_directories:
-            tar_path = tar_paths[input_directory]
+        for tar_path in relevant_tars:
             index_path = tar_path.with_name(f"{tar_path.name}.idx")
             print("\nRegistering TAR replicas:")
             print(f"  Archive : {archive}")
@@ -365,13 +579,17 @@ def create_archives(
     tar_output_dir = resolve_from_root(
         data_root, spec["TAR_OUTPUT_DIR"]
     ).resolve()
-    tar_paths = create_tar_archives(
+    dataset_tars = create_tar_archives(
         data_root=data_root,
         input_directories=input_directories,
+        datasets=datasets,
         tar_output_dir=tar_output_dir,
         tar_prefix=spec["TAR_PREFIX"],
         rebuild_tars=rebuild_tars,
         dry_run=dry_run,
+        compression=spec["TAR_COMPRESSION"],
+        frame_bytes=spec["TAR_FRAME_BYTES"],
+        max_tar_bytes=spec["TAR_MAX_BYTES"],
     )
     archive_datasets = create_campaign_archives(
         datasets=datasets,
@@ -383,8 +601,7 @@ def create_archives(
     )
     register_tar_replicas(
         archive_datasets=archive_datasets,
-        input_directories=input_directories,
-        tar_paths=tar_paths,
+        dataset_tars=dataset_tars,
         data_root=data_root,
         campaign_store=campaign_store,
         storage_system=spec["TAR_STORAGE_SYSTEM"],
@@ -394,7 +611,8 @@ def create_archives(
 
     print(
         f"\nCampaign archive creation complete: {archive_count} archive(s), "
-        f"{len(tar_paths)} TAR file(s), up to {archive_size} datasets per archive."
+        f"{len(set(dataset_tars.values()))} TAR file(s), "
+        f"up to {archive_size} datasets per archive."
     )
 
 
@@ -9,6 +9,11 @@ import subprocess
 from pathlib import Path
 from typing import Any
 
+from rhino.campaign.attribute_cache import (
+    attribute_cache_path,
+    build_attribute_cache,
+)
+
 
 DEFAULT_SPEC = Path(__file__).with_name("campaign_spec.json")
 
@@ -95,6 +100,11 @@ def create_index(spec: dict[str, Any], *, dry_run: bool = False) -> None:
     if not dry_run:
         subprocess.run(inspect_command, cwd=campaign_store, check=True)
 
+    cache_path = attribute_cache_path(index_path)
+    print(f"Typed attribute cache: {cache_path}")
+    if not dry_run:
+        build_attribute_cache(index_path, cache_path)
+
     print(f"Campaign index creation complete: {index_path}")
 
 
@@ -49,6 +49,10 @@ rm -f "$CAMPAIGN_INDEX"
 
 hpc_campaign index "$CAMPAIGN_INDEX" add "${archive_files[@]}"
 
+echo
+echo "Building typed attribute cache: ${CAMPAIGN_INDEX}.attrs.sqlite"
+rhino-attribute-cache "$CAMPAIGN_INDEX"
+
 echo
 echo "Inspecting index:"
 hpc_campaign index "$CAMPAIGN_INDEX" ls
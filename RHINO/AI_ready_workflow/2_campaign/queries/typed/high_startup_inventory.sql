@@ -0,0 +1,19 @@
+--
+-- Startup inventory greater than 2000, filtered through the typed cache index
+
+SELECT
+  d.datasetid,
+  d.dsid,
+  d.name AS dataset,
+  a.name AS archive,
+  av.value_real AS I_startup_g
+FROM typed.attribute_values av
+JOIN datasets d
+  ON d.archiveid = av.archiveid
+ AND d.datasetid = av.datasetid
+JOIN archives a
+  ON a.archiveid = d.archiveid
+WHERE av.name = '/output:I_startup (g)'
+  AND av.value_real > 2000
+  AND a.name LIKE 'IFE/rhino%.aca'
+ORDER BY av.value_real DESC;
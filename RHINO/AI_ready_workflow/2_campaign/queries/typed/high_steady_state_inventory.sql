@@ -0,0 +1,19 @@
+--
+-- Steady state inventory > 4000, filtered through the typed cache index
+
+SELECT
+  d.datasetid,
+  d.dsid,
+  d.name AS dataset,
+  a.name AS archive,
+  av.value_real AS steady_state_inventory_g
+FROM typed.attribute_values av
+JOIN datasets d
+  ON d.archiveid = av.archiveid
+ AND d.datasetid = av.datasetid
+JOIN archives a
+  ON a.archiveid = d.archiveid
+WHERE av.name = '/output:Iops (g)'
+  AND av.value_real > 4000
+  AND a.name LIKE 'IFE/rhino%.aca'
+ORDER BY av.value_real ASC;
@@ -0,0 +1,16 @@
+SELECT
+    a.name AS archive,
+    d.datasetid,
+    d.name AS run_id,
+    SUBSTR(av.value_text, 1, 10) AS simulation_date,
+    SUBSTR(av.value_text, 12, 8) AS simulation_time,
+    av.value_text AS simulation_datetime
+FROM typed.attribute_values av
+JOIN datasets d
+    ON d.archiveid = av.archiveid
+   AND d.datasetid = av.datasetid
+JOIN archives a
+    ON d.archiveid = a.archiveid
+WHERE av.name = '/date'
+  AND a.name LIKE :archive_name
+ORDER BY a.name, d.datasetid;
@@ -0,0 +1,14 @@
+SELECT
+    a.name AS archive,
+    d.datasetid,
+    d.name AS run_id,
+    av.value_real AS tritium_burning_rate_g_per_day
+FROM typed.attribute_values av
+JOIN datasets d
+    ON d.archiveid = av.archiveid
+   AND d.datasetid = av.datasetid
+JOIN archives a
+    ON d.archiveid = a.archiveid
+WHERE av.name = '/input:Ndotminus:Tritium burned per day'
+  AND a.name LIKE :archive_name
+ORDER BY a.name, d.datasetid;
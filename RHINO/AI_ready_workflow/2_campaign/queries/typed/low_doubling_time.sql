@@ -0,0 +1,19 @@
+--
+-- Low doubling time, filtered through the typed cache index
+
+SELECT
+  d.datasetid,
+  d.dsid,
+  d.name AS dataset,
+  a.name AS archive,
+  av.value_real AS doubling_time_days
+FROM typed.attribute_values av
+JOIN datasets d
+  ON d.archiveid = av.archiveid
+ AND d.datasetid = av.datasetid
+JOIN archives a
+  ON a.archiveid = d.archiveid
+WHERE av.name = '/output:plant_doubling_time (days)'
+  AND av.value_real < 4
+  AND a.name LIKE 'IFE/rhino%.aca'
+ORDER BY av.value_real ASC;
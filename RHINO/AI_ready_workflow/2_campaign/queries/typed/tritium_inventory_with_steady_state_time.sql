@@ -0,0 +1,24 @@
+--
+-- List runs with Tritium steady-state inventory and steady-state time,
+-- filtered through the typed cache index
+
+SELECT
+  d.datasetid,
+  d.dsid,
+  d.name AS dataset,
+  a.name AS archive,
+  tri.value_real AS tritium_inventory,
+  ss.value_real AS steady_state_time_days
+FROM typed.attribute_values tri
+JOIN datasets d
+  ON d.archiveid = tri.archiveid
+ AND d.datasetid = tri.datasetid
+JOIN archives a
+  ON d.archiveid = a.archiveid
+JOIN typed.attribute_values ss
+  ON ss.archiveid = d.archiveid
+ AND ss.datasetid = d.datasetid
+ AND ss.name = '/output:Steady state time (days)'
+WHERE tri.name = '/data/inventory/Tritium/mass_steady_total'
+  AND tri.value_real > 2
+ORDER BY tri.value_real DESC;
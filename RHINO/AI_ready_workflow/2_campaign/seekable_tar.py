@@ -0,0 +1,417 @@
+"""Write and read seekable zstd replicas of RHINO campaign TAR files.
+
+A seekable replica is a sequence of independently compressed zstd frames
+followed by the standard zstd seek table, so any byte range of the original TAR
+can be recovered by decompressing only the frames that cover it. Frames never
+span two BP5 datasets. Offsets are those of the uncompressed TAR, which means
+the member offsets in the `.tar.idx` written by `hpc_campaign taridx` can be
+used unchanged to address data in the compressed replica.
+"""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import csv
+import json
+import struct
+import tarfile
+from pathlib import Path
+from typing import Any, BinaryIO
+
+
+DEFAULT_FRAME_BYTES = 4 * 1024 * 1024
+DEFAULT_COMPRESSION_LEVEL = 9
+SKIPPABLE_FRAME_MAGIC = 0x184D2A5E
+SEEKABLE_FOOTER_MAGIC = 0x8F92EAB1
+SEEK_TABLE_FOOTER_SIZE = 9
+SEEK_TABLE_ENTRY_SIZE = 8
+MAX_FRAME_BYTES = 0xFFFFFFFF
+
+
+def _require_zstandard() -> Any:
+    try:
+        import zstandard
+    except ImportError as error:
+        raise RuntimeError(
+            "Seekable zstd TAR replicas require the zstandard package"
+        ) from error
+    return zstandard
+
+
+def replica_path_for_tar(tar_path: Path) -> Path:
+    """Return the seekable zstd replica path associated with a TAR file."""
+    return tar_path.with_name(f"{tar_path.name}.zst")
+
+
+def frame_index_path_for_replica(replica_path: Path) -> Path:
+    """Return the JSON frame-index path associated with a seekable replica."""
+    return replica_path.with_name(f"{replica_path.name}.frames.json")
+
+
+def dataset_for_member(name: str) -> str | None:
+    """Return the BP5 dataset path that contains one TAR member, if any."""
+    parts = Path(name).parts
+    for position, part in enumerate(parts):
+        if part.endswith(".bp5"):
+            return str(Path(*parts[: position + 1]))
+    return None
+
+
+def read_tar_index(index_path: Path) -> list[dict[str, Any]]:
+    """Read the member table written by `hpc_campaign taridx`.
+
+    Each CSV row holds the entry type, header offset, data offset, data size,
+    and member name of one entry in the uncompressed TAR.
+    """
+    members: list[dict[str, Any]] = []
+    with index_path.open(encoding="utf-8", newline="") as stream:
+        for row in csv.reader(stream):
+            if not row:
+                continue
+            if len(row) != 5:
+                raise ValueError(f"Invalid TAR index row in {index_path}: {row}")
+            members.append(
+                {
+                    "type": row[0],
+                    "offset": int(row[1]),
+                    "offset_data": int(row[2]),
+                    "size": int(row[3]),
+                    "name": row[4],
+                }
+            )
+    return members
+
+
+def scan_tar_members(tar_path: Path) -> list[dict[str, Any]]:
+    """Read member offsets directly from TAR headers in archive order."""
+    members: list[dict[str, Any]] = []
+    with tarfile.open(tar_path, mode="r:") as archive:
+        for member in archive:
+            members.append(
+                {
+                    "type": "5" if member.isdir() else "0",
+                    "offset": member.offset,
+                    "offset_data": member.offset_data,
+                    "size": member.size,
+                    "name": member.name,
+                }
+            )
+    return members
+
+
+def plan_frames(
+    members: list[dict[str, Any]],
+    archive_size: int,
+    frame_bytes: int = DEFAULT_FRAME_BYTES,
+) -> list[tuple[int, int]]:
+    """Return `(offset, size)` frame extents covering the complete TAR.
+
+    A new frame starts at every BP5 dataset boundary and at the first member
+    header after a frame has reached `frame_bytes`. Members larger than the
+    frame size are split into fixed-size pieces.
+    """
+    if frame_bytes <= 0 or frame_bytes > MAX_FRAME_BYTES:
+        raise ValueError(
+            f"Frame size must be between 1 and {MAX_FRAME_BYTES} bytes"
+        )
+
+    cuts = {0, archive_size}
+    frame_start = 0
+    current_dataset: str | None = None
+    for member in sorted(members, key=lambda item: item["offset"]):
+        dataset = dataset_for_member(member["name"])
+        header = member["offset"]
+        if header > frame_start and (
+            dataset != current_dataset or header - frame_start >= frame_bytes
+        ):
+            cuts.add(header)
+            frame_start = header
+        current_dataset = dataset
+
+    boundaries = sorted(cut for cut in cuts if 0 <= cut <= archive_size)
+    frames: list[tuple[int, int]] = []
+    for start, end in zip(boundaries, boundaries[1:]):
+        for offset in range(start, end, frame_bytes):
+            frames.append((offset, min(frame_bytes, end - offset)))
+    return frames
+
+
+def _seek_table(frame_sizes: list[tuple[int, int]]) -> bytes:
+    """Encode the zstd seekable-format seek table as a skippable frame."""
+    entries = b"".join(
+        struct.pack("<II", compressed, decompressed)
+        for compressed, decompressed in frame_sizes
+    )
+    footer = struct.pack("<IBI", len(frame_sizes), 0, SEEKABLE_FOOTER_MAGIC)
+    payload = entries + footer
+    return struct.pack("<II", SKIPPABLE_FRAME_MAGIC, len(payload)) + payload
+
+
+def write_seekable_replica(
+    tar_path: Path,
+    *,
+    index_path: Path | None = None,
+    replica_path: Path | None = None,
+    frame_bytes: int = DEFAULT_FRAME_BYTES,
+    level: int = DEFAULT_COMPRESSION_LEVEL,
+) -> Path:
+    """Compress a TAR into a seekable zstd replica and write its frame index."""
+    zstandard = _require_zstandard()
+    replica_path = replica_path or replica_path_for_tar(tar_path)
+    members = (
+        read_tar_index(index_path)
+        if index_path is not None and index_path.is_file()
+        else scan_tar_members(tar_path)
+    )
+    archive_size = tar_path.stat().st_size
+    frames = plan_frames(members, archive_size, frame_bytes)
+
+    compressor = zstandard.ZstdCompressor(level=level, write_content_size=True)
+    frame_records: list[dict[str, int]] = []
+    frame_sizes: list[tuple[int, int]] = []
+    partial_path = replica_path.with_name(f"{replica_path.name}.partial")
+    compressed_offset = 0
+    with tar_path.open("rb") as source, partial_path.open("wb") as target:
+        for offset, size in frames:
+            source.seek(offset)
+            block = source.read(size)
+            if len(block) != size:
+                raise ValueError(f"Unexpected end of TAR data in {tar_path}")
+            compressed = compressor.compress(block)
+            target.write(compressed)
+            frame_records.append(
+                {
+                    "offset": offset,
+                    "size": size,
+                    "compressed_offset": compressed_offset,
+                    "compressed_size": len(compressed),
+                }
+            )
+            frame_sizes.append((len(compressed), size))
+            compressed_offset += len(compressed)
+        target.write(_seek_table(frame_sizes))
+    partial_path.replace(replica_path)
+
+    starts = [frame["offset"] for frame in frame_records]
+    member_records = []
+    for member in members:
+        end = member["offset_data"] + member["size"]
+        first = bisect.bisect_right(starts, member["offset"]) - 1
+        last = bisect.bisect_right(starts, max(end - 1, member["offset"])) - 1
+        member_records.append(
+            {
+                **member,
+                "dataset": dataset_for_member(member["name"]),
+                "first_frame": first,
+                "last_frame": last,
+            }
+        )
+
+    document = {
+        "tar": tar_path.name,
+        "tar_size": archive_size,
+        "replica": replica_path.name,
+        "replica_size": replica_path.stat().st_size,
+        "compression": "zstd-seekable",
+        "level": level,
+        "frame_bytes": frame_bytes,
+        "frames": frame_records,
+        "members": member_records,
+    }
+    frame_index_path_for_replica(replica_path).write_text(
+        json.dumps(document, indent=1),
+        encoding="utf-8",
+    )
+    return replica_path
+
+
+def _read_seek_table(stream: BinaryIO) -> list[tuple[int, int]]:
+    """Return `(compressed, decompressed)` frame sizes from a replica footer."""
+    stream.seek(0, 2)
+    replica_size = stream.tell()
+    if replica_size < SEEK_TABLE_FOOTER_SIZE:
+        raise ValueError("File is too small to be a seekable zstd replica")
+    stream.seek(replica_size - SEEK_TABLE_FOOTER_SIZE)
+    frame_count, descriptor, magic = struct.unpack(
+        "<IBI", stream.read(SEEK_TABLE_FOOTER_SIZE)
+    )
+    if magic != SEEKABLE_FOOTER_MAGIC:
+        raise ValueError("File does not end with a zstd seek table")
+    entry_size = SEEK_TABLE_ENTRY_SIZE + (4 if descriptor & 0x80 else 0)
+    table_size = frame_count * entry_size
+    stream.seek(replica_size - SEEK_TABLE_FOOTER_SIZE - table_size)
+    table = stream.read(table_size)
+    return [
+        struct.unpack_from("<II", table, position * entry_size)
+        for position in range(frame_count)
+    ]
+
+
+class SeekableTarReader:
+    """Read byte ranges of the original TAR from a seekable zstd replica."""
+
+    def __init__(self, replica_path: str | Path) -> None:
+        """Open a replica and load its seek table."""
+        self.replica_path = Path(replica_path)
+        self._decompressor = _require_zstandard().ZstdDecompressor()
+        self._stream = self.replica_path.open("rb")
+        self.frames_decompressed = 0
+        try:
+            sizes = _read_seek_table(self._stream)
+        except Exception:
+            self._stream.close()
+            raise
+
+        self._compressed_offsets = [0]
+        self._offsets = [0]
+        self._compressed_sizes: list[int] = []
+        self._sizes: list[int] = []
+        for compressed, decompressed in sizes:
+            self._compressed_offsets.append(self._compressed_offsets[-1] + compressed)
+            self._offsets.append(self._offsets[-1] + decompressed)
+            self._compressed_sizes.append(compressed)
+            self._sizes.append(decompressed)
+        self.size = self._offsets[-1]
+
+    def __enter__(self) -> "SeekableTarReader":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the underlying replica file."""
+        self._stream.close()
+
+    def _frame(self, position: int) -> bytes:
+        self._stream.seek(self._compressed_offsets[position])
+        compressed = self._stream.read(self._compressed_sizes[position])
+        self.frames_decompressed += 1
+        return self._decompressor.decompress(
+            compressed,
+            max_output_size=self._sizes[position],
+        )
+
+    def read(self, offset: int, size: int) -> bytes:
+        """Return `size` bytes starting at an uncompressed TAR offset."""
+        if offset < 0 or size < 0 or offset + size > self.size:
+            raise ValueError(
+                f"Range {offset}+{size} is outside the {self.size}-byte TAR"
+            )
+        if size == 0:
+            return b""
+
+        first = bisect.bisect_right(self._offsets, offset) - 1
+        last = bisect.bisect_right(self._offsets, offset + size - 1) - 1
+        blocks = [self._frame(position) for position in range(first, last + 1)]
+        data = b"".join(blocks)
+        start = offset - self._offsets[first]
+        return data[start : start + size]
+
+    def fetch_members(
+        self,
+        members: list[dict[str, Any]],
+        destination: Path,
+    ) -> list[Path]:
+        """Write TAR members to `destination`, preserving their member paths."""
+        written: list[Path] = []
+        for member in sorted(members, key=lambda item: item["offset_data"]):
+            target = destination / member["name"]
+            if member["type"] == "5":
+                target.mkdir(parents=True, exist_ok=True)
+                continue
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_bytes(self.read(member["offset_data"], member["size"]))
+            written.append(target)
+        return written
+
+
+def dataset_members(
+    members: list[dict[str, Any]],
+    dataset: str,
+) -> list[dict[str, Any]]:
+    """Select the TAR members belonging to one BP5 dataset path."""
+    selected = [
+        member
+        for member in members
+        if dataset_for_member(member["name"]) == dataset.rstrip("/")
+    ]
+    if not selected:
+        raise KeyError(f"Dataset is not present in the TAR index: {dataset}")
+    return selected
+
+
+def fetch_dataset(
+    replica_path: Path,
+    index_path: Path,
+    dataset: str,
+    destination: Path,
+) -> list[Path]:
+    """Restore one BP5 dataset from a seekable replica using a `.tar.idx`."""
+    members = dataset_members(read_tar_index(index_path), dataset)
+    with SeekableTarReader(replica_path) as reader:
+        return reader.fetch_members(members, destination)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Create or read seekable zstd replicas of campaign TARs."
+    )
+    subcommands = parser.add_subparsers(dest="command", required=True)
+
+    compress = subcommands.add_parser(
+        "compress", help="Write a seekable .tar.zst replica for one TAR."
+    )
+    compress.add_argument("tar", type=Path, help="Uncompressed TAR file.")
+    compress.add_argument(
+        "--index",
+        type=Path,
+        help="TAR index from hpc_campaign taridx (default: <tar>.idx).",
+    )
+    compress.add_argument(
+        "--frame-bytes",
+        type=int,
+        default=DEFAULT_FRAME_BYTES,
+        help=f"Maximum uncompressed frame size (default: {DEFAULT_FRAME_BYTES}).",
+    )
+    compress.add_argument(
+        "--level",
+        type=int,
+        default=DEFAULT_COMPRESSION_LEVEL,
+        help=f"zstd compression level (default: {DEFAULT_COMPRESSION_LEVEL}).",
+    )
+
+    fetch = subcommands.add_parser(
+        "fetch", help="Restore one BP5 dataset from a seekable replica."
+    )
+    fetch.add_argument("replica", type=Path, help="Seekable .tar.zst replica.")
+    fetch.add_argument("index", type=Path, help="TAR index (.tar.idx).")
+    fetch.add_argument("dataset", help="BP5 member path, e.g. 2026-04-29/x.bp5.")
+    fetch.add_argument(
+        "--destination",
+        type=Path,
+        default=Path("."),
+        help="Directory in which the dataset is restored (default: .).",
+    )
+    args = parser.parse_args()
+
+    if args.command == "compress":
+        index_path = args.index or args.tar.with_name(f"{args.tar.name}.idx")
+        replica = write_seekable_replica(
+            args.tar,
+            index_path=index_path,
+            frame_bytes=args.frame_bytes,
+            level=args.level,
+        )
+        print(f"Seekable replica: {replica}")
+        print(f"Frame index     : {frame_index_path_for_replica(replica)}")
+    else:
+        written = fetch_dataset(
+            args.replica, args.index, args.dataset, args.destination
+        )
+        print(f"Restored {len(written)} file(s) under {args.destination}")
+
+
+if __name__ == "__main__":
+    main()
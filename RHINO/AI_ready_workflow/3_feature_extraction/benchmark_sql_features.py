@@ -0,0 +1,282 @@
+"""Benchmark SQL feature table construction on a synthetic campaign index."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+from rhino.campaign.attribute_cache import build_attribute_cache
+from rhino.campaign.query_cache import CachedQueryRunner
+
+from campaign_reader import (
+    IDENTITY_COLUMNS,
+    build_sql_feature_table,
+    load_query_features,
+)
+
+
+DEFAULT_QUERY_DIR = Path(__file__).resolve().parents[1] / "2_campaign" / "queries"
+
+# The query-file specs used before attribute-backed specs were introduced.
+QUERY_SPECS = [
+    {
+        "key": "simulation_date",
+        "source": "campaign_sql",
+        "query": "list_simulation_datetime.sql",
+        "column": "simulation_date",
+    },
+    {
+        "key": "simulation_time",
+        "source": "campaign_sql",
+        "query": "list_simulation_datetime.sql",
+        "column": "simulation_time",
+    },
+    {
+        "key": "simulation_datetime",
+        "source": "campaign_sql",
+        "query": "list_simulation_datetime.sql",
+        "column": "simulation_datetime",
+    },
+    {
+        "key": "tritium_burning_rate",
+        "source": "campaign_sql",
+        "query": "list_tritium_burning_rate.sql",
+        "column": "tritium_burning_rate_g_per_day",
+    },
+    {
+        "key": "burn_fraction",
+        "source": "campaign_sql",
+        "query": "list_burn_fraction.sql",
+        "column": "burn_fraction",
+    },
+    {
+        "key": "plant_doubling_time_days",
+        "source": "campaign_sql",
+        "query": "list_plant_doubling_time.sql",
+        "column": "plant_doubling_time_days",
+    },
+    {
+        "key": "minimum_startup_inventory_g",
+        "source": "campaign_sql",
+        "query": "list_minimum_startup_inventory.sql",
+        "column": "minimum_startup_inventory_g",
+    },
+]
+
+ATTRIBUTE_SPECS = [
+    *QUERY_SPECS[:3],
+    {
+        "key": "tritium_burning_rate",
+        "source": "campaign_sql",
+        "attribute": "/input:Ndotminus:Tritium burned per day",
+        "value_type": "real",
+    },
+    {
+        "key": "burn_fraction",
+        "source": "campaign_sql",
+        "attribute": "/input:beta:Burn fraction",
+        "value_type": "real",
+    },
+    {
+        "key": "plant_doubling_time_days",
+        "source": "campaign_sql",
+        "attribute": "/output:plant_doubling_time (days)",
+        "value_type": "real",
+    },
+    {
+        "key": "minimum_startup_inventory_g",
+        "source": "campaign_sql",
+        "attribute": "/output:I_startup (g)",
+        "value_type": "real",
+    },
+]
+
+NUMERIC_ATTRIBUTES = [
+    spec["attribute"] for spec in ATTRIBUTE_SPECS if "attribute" in spec
+]
+
+
+def write_synthetic_index(
+    index_path: Path,
+    *,
+    runs: int,
+    runs_per_archive: int,
+    extra_attributes: int,
+    seed: int,
+) -> None:
+    """Write a minimal campaign index with RHINO-like text attribute values."""
+    rng = random.Random(seed)
+    extra_names = [f"/output:extra_{number}" for number in range(extra_attributes)]
+
+    connection = sqlite3.connect(index_path)
+    try:
+        connection.executescript(
+            """
+            CREATE TABLE archives (archiveid INTEGER PRIMARY KEY, name TEXT);
+            CREATE TABLE datasets (
+                datasetid INTEGER PRIMARY KEY,
+                archiveid INTEGER,
+                dsid TEXT,
+                name TEXT
+            );
+            CREATE TABLE attributes (
+                archiveid INTEGER,
+                datasetid INTEGER,
+                name TEXT,
+                value TEXT
+            );
+            """
+        )
+        archive_count = (runs + runs_per_archive - 1) // runs_per_archive
+        connection.executemany(
+            "INSERT INTO archives VALUES (?, ?)",
+            (
+                (archiveid, f"IFE/rhino{archiveid}.aca")
+                for archiveid in range(1, archive_count + 1)
+            ),
+        )
+        for datasetid in range(1, runs + 1):
+            archiveid = (datasetid - 1) // runs_per_archive + 1
+            hours, minutes, seconds = (
+                datasetid // 3600 % 24,
+                datasetid // 60 % 60,
+                datasetid % 60,
+            )
+            run_id = f"{hours:02d}-{minutes:02d}-{seconds:02d}"
+            connection.execute(
+                "INSERT INTO datasets VALUES (?, ?, ?, ?)",
+                (datasetid, archiveid, f"uuid-{datasetid}", run_id),
+            )
+            rows = [
+                (
+                    archiveid,
+                    datasetid,
+                    "/date",
+                    f'["2026-04-29T{hours:02d}:{minutes:02d}:{seconds:02d}"]',
+                ),
+                *(
+                    (archiveid, datasetid, name, f"[{rng.uniform(0, 5000):.6g}]")
+                    for name in [*NUMERIC_ATTRIBUTES, *extra_names]
+                ),
+            ]
+            connection.executemany(
+                "INSERT INTO attributes VALUES (?, ?, ?, ?)", rows
+            )
+        connection.commit()
+    finally:
+        connection.close()
+
+
+def build_per_query_table(
+    acx_path: Path, query_dir: Path, specs: list[dict[str, Any]]
+) -> pd.DataFrame:
+    """Reference path: one connection and query per spec, then chained merges."""
+    feature_frame: pd.DataFrame | None = None
+    for spec in specs:
+        with CachedQueryRunner(acx_path) as runner:
+            frame = load_query_features(
+                runner, query_dir, spec["query"], [spec], "%"
+            )
+        feature_frame = (
+            frame
+            if feature_frame is None
+            else feature_frame.merge(frame, on=IDENTITY_COLUMNS, how="outer")
+        )
+    assert feature_frame is not None
+    return feature_frame
+
+
+def time_builds(function: Any, repeat: int) -> tuple[list[float], pd.DataFrame]:
+    """Return wall times in seconds and the final table of repeated builds."""
+    timings: list[float] = []
+    frame = pd.DataFrame()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        frame = function()
+        timings.append(time.perf_counter() - start)
+    return timings, frame
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Compare per-query SQL feature builds with the single-pass engine "
+            "on a synthetic campaign index."
+        )
+    )
+    parser.add_argument("--runs", type=int, default=10_000)
+    parser.add_argument("--runs-per-archive", type=int, default=100)
+    parser.add_argument(
+        "--extra-attributes",
+        type=int,
+        default=40,
+        help="Unrelated attributes per run, to size the attributes table.",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--query-dir", type=Path, default=DEFAULT_QUERY_DIR)
+    parser.add_argument("--json", type=Path, help="Optional JSON result file.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        acx_path = Path(scratch) / "rhino.acx"
+        write_synthetic_index(
+            acx_path,
+            runs=args.runs,
+            runs_per_archive=args.runs_per_archive,
+            extra_attributes=args.extra_attributes,
+            seed=args.seed,
+        )
+        start = time.perf_counter()
+        build_attribute_cache(acx_path)
+        cache_seconds = time.perf_counter() - start
+
+        per_query, reference = time_builds(
+            lambda: build_per_query_table(acx_path, args.query_dir, QUERY_SPECS),
+            args.repeat,
+        )
+        single_pass, result = time_builds(
+            lambda: build_sql_feature_table(
+                acx_path, args.query_dir, "%", ATTRIBUTE_SPECS
+            ),
+            args.repeat,
+        )
+
+    columns = [*IDENTITY_COLUMNS, *(spec["key"] for spec in QUERY_SPECS)]
+    reference = reference[columns].sort_values(IDENTITY_COLUMNS, ignore_index=True)
+    result = result[columns].sort_values(IDENTITY_COLUMNS, ignore_index=True)
+    pd.testing.assert_frame_equal(reference, result, check_dtype=False)
+
+    summary = {
+        "runs": args.runs,
+        "attribute_rows": args.runs
+        * (len(NUMERIC_ATTRIBUTES) + 1 + args.extra_attributes),
+        "cache_build_seconds": cache_seconds,
+        "per_query_seconds": statistics.median(per_query),
+        "single_pass_seconds": statistics.median(single_pass),
+    }
+    summary["speedup"] = summary["per_query_seconds"] / summary["single_pass_seconds"]
+
+    print(f"Runs             : {summary['runs']}")
+    print(f"Attribute rows   : {summary['attribute_rows']}")
+    print(f"Cache build      : {cache_seconds:.3f} s (once per index)")
+    print(f"Per-query build  : {summary['per_query_seconds']:.3f} s (median)")
+    print(f"Single-pass build: {summary['single_pass_seconds']:.3f} s (median)")
+    print(f"Speedup          : {summary['speedup']:.1f}x")
+    print("Tables match     : yes")
+
+    if args.json is not None:
+        args.json.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+        print(f"\nSaved benchmark results to: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
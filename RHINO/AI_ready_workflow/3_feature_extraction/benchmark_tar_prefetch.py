@@ -0,0 +1,150 @@
+"""Benchmark TAR-offset-ordered, prefetched reads against run-order reads."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import sqlite3
+import statistics
+import time
+from pathlib import Path
+from typing import Any
+
+from tar_read_planner import (
+    DEFAULT_MAX_GAP_BYTES,
+    coalesce_extents,
+    load_tar_members,
+    plan_tar_reads,
+    prefetch_extents,
+)
+
+
+READ_BYTES = 64 * 1024
+
+
+def archive_run_ids(archive_path: Path) -> list[str]:
+    """Return every dataset name registered in one campaign archive."""
+    archive_uri = f"{archive_path.resolve().as_uri()}?mode=ro"
+    connection = sqlite3.connect(archive_uri, uri=True)
+    try:
+        return [name for (name,) in connection.execute("SELECT name FROM dataset")]
+    finally:
+        connection.close()
+
+
+def evict(tars: set[Path]) -> None:
+    """Drop the TARs from the page cache so every trial starts cold."""
+    for tar in tars:
+        with tar.open("rb") as stream:
+            os.fsync(stream.fileno())
+            os.posix_fadvise(stream.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+
+
+def read_members(members: list[dict[str, Any]], run_order: list[str]) -> int:
+    """Read each run's TAR members in `run_order` using small requests."""
+    by_run: dict[str, list[dict[str, Any]]] = {}
+    for member in members:
+        by_run.setdefault(member["run_id"], []).append(member)
+
+    total = 0
+    streams: dict[Path, Any] = {}
+    try:
+        for run_id in run_order:
+            for member in by_run.get(run_id, []):
+                stream = streams.get(member["tar"])
+                if stream is None:
+                    stream = streams[member["tar"]] = member["tar"].open(
+                        "rb", buffering=0
+                    )
+                stream.seek(member["start"])
+                remaining = member["end"] - member["start"]
+                while remaining > 0:
+                    chunk = stream.read(min(READ_BYTES, remaining))
+                    if not chunk:
+                        break
+                    remaining -= len(chunk)
+                    total += len(chunk)
+    finally:
+        for stream in streams.values():
+            stream.close()
+    return total
+
+
+def main() -> None:
+    if not hasattr(os, "posix_fadvise"):
+        raise RuntimeError("This benchmark requires os.posix_fadvise")
+
+    parser = argparse.ArgumentParser(
+        description=(
+            "Compare reading campaign runs from their TAR replica in run order "
+            "with the offset-ordered, prefetched read plan."
+        )
+    )
+    parser.add_argument("archive", type=Path, help="Campaign archive (.aca).")
+    parser.add_argument(
+        "--runs",
+        type=int,
+        help="Number of randomly sampled runs to read (default: all).",
+    )
+    parser.add_argument("--max-gap", type=int, default=DEFAULT_MAX_GAP_BYTES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", type=Path, help="Optional JSON result file.")
+    args = parser.parse_args()
+
+    run_ids = archive_run_ids(args.archive)
+    rng = random.Random(args.seed)
+    run_ids = rng.sample(run_ids, min(args.runs or len(run_ids), len(run_ids)))
+    members = load_tar_members(args.archive, run_ids)
+    if not members:
+        raise ValueError(f"No TAR replicas are registered in {args.archive}")
+    tars = {member["tar"] for member in members}
+    missing = sorted(str(tar) for tar in tars if not tar.is_file())
+    if missing:
+        raise FileNotFoundError(f"TAR replica is not local: {', '.join(missing)}")
+
+    run_order: list[float] = []
+    planned: list[float] = []
+    total_bytes = 0
+    for _ in range(args.repeat):
+        evict(tars)
+        start = time.perf_counter()
+        total_bytes = read_members(members, run_ids)
+        run_order.append(time.perf_counter() - start)
+
+        evict(tars)
+        start = time.perf_counter()
+        plan = plan_tar_reads(args.archive, run_ids, args.max_gap)
+        prefetch_extents(plan["extents"])
+        read_members(members, plan["run_ids"])
+        planned.append(time.perf_counter() - start)
+
+    extents = coalesce_extents(members, args.max_gap)
+    result = {
+        "archive": str(args.archive),
+        "runs": len(run_ids),
+        "members": len(members),
+        "extents": len(extents),
+        "bytes": total_bytes,
+        "run_order_seconds": statistics.median(run_order),
+        "planned_seconds": statistics.median(planned),
+    }
+    result["speedup"] = result["run_order_seconds"] / result["planned_seconds"]
+
+    print(f"Archive          : {args.archive}")
+    print(f"Runs             : {len(run_ids)} ({len(members)} TAR members)")
+    print(f"Coalesced extents: {len(extents)}")
+    print(f"Bytes read       : {total_bytes / 2**20:.2f} MiB")
+    print(f"Run order (cold) : {result['run_order_seconds']:.3f} s (median)")
+    print(f"Planned (cold)   : {result['planned_seconds']:.3f} s (median)")
+    print(f"Speedup          : {result['speedup']:.2f}x")
+
+    if args.json is not None:
+        args.json.write_text(json.dumps(result, indent=2), encoding="utf-8")
+        print(f"\nSaved benchmark results to: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
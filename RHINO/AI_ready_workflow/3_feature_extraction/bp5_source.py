@@ -0,0 +1,264 @@
+"""Build RHINO features directly from BP5 output, without campaign packaging."""
+
+from __future__ import annotations
+
+import json
+import re
+import sqlite3
+import tempfile
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from pathlib import Path
+from typing import Any, Iterable
+
+import numpy as np
+import pandas as pd
+from rhino.campaign.archive_layout import locate_dataset, run_id_from_path
+from rhino.campaign.attribute_cache import build_attribute_cache
+
+from campaign_adios import ADIOS_SOURCES, build_adios_variable_name, read_adios_feature
+from campaign_reader import (
+    build_sql_feature_table,
+    merge_adios_features,
+    order_feature_table,
+)
+
+
+LAYOUT_SETTINGS = {
+    "RHINO_DATA_ROOT": str,
+    "INPUT_DIRS": list,
+    "ARCHIVE_PREFIX": str,
+    "DATASETS_PER_ARCHIVE": int,
+}
+
+INDEX_SCHEMA = """
+CREATE TABLE archives (archiveid INTEGER PRIMARY KEY, name TEXT NOT NULL);
+CREATE TABLE datasets (
+    archiveid INTEGER NOT NULL,
+    datasetid INTEGER NOT NULL,
+    dsid TEXT NOT NULL,
+    name TEXT NOT NULL
+);
+CREATE TABLE attributes (
+    archiveid INTEGER NOT NULL,
+    datasetid INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    value TEXT
+);
+"""
+
+
+def load_bp5_layout(path: str | Path) -> dict[str, Any]:
+    """Load the BP5 discovery and archive-grouping settings of a campaign spec."""
+    with Path(path).open(encoding="utf-8") as stream:
+        spec = json.load(stream)
+    for key, expected_type in LAYOUT_SETTINGS.items():
+        if key not in spec:
+            raise ValueError(f"Missing required setting: {key}")
+        if not isinstance(spec[key], expected_type) or isinstance(spec[key], bool):
+            raise TypeError(
+                f"Setting '{key}' must be {expected_type.__name__}, "
+                f"not {type(spec[key]).__name__}"
+            )
+    if spec["DATASETS_PER_ARCHIVE"] <= 0:
+        raise ValueError("DATASETS_PER_ARCHIVE must be greater than zero")
+    return {key: spec[key] for key in LAYOUT_SETTINGS}
+
+
+def discover_bp5_runs(layout: dict[str, Any]) -> list[dict[str, Any]]:
+    """Return every BP5 run with the identity the campaign workflow would give it.
+
+    Runs are discovered and grouped into archives exactly as
+    ``create_archives.py`` does, so ``archive``, ``datasetid``, and ``run_id``
+    match a feature table built from the packaged campaign.
+    """
+    data_root = Path(layout["RHINO_DATA_ROOT"]).expanduser().resolve()
+    datasets: list[Path] = []
+    for directory in layout["INPUT_DIRS"]:
+        input_directory = data_root / directory
+        if not input_directory.is_dir():
+            raise FileNotFoundError(
+                f"BP5 input directory does not exist: {input_directory}"
+            )
+        datasets.extend(input_directory.glob("*.bp5"))
+
+    runs = []
+    for dataset_number, dataset in enumerate(sorted(datasets, key=str)):
+        archiveid, archive, datasetid = locate_dataset(
+            dataset_number, layout["ARCHIVE_PREFIX"], layout["DATASETS_PER_ARCHIVE"]
+        )
+        relative_path = str(dataset.relative_to(data_root))
+        runs.append(
+            {
+                "path": str(dataset),
+                "archiveid": archiveid,
+                "archive": archive,
+                "datasetid": datasetid,
+                "dsid": str(uuid.uuid5(uuid.NAMESPACE_URL, relative_path)),
+                "run_id": run_id_from_path(dataset),
+            }
+        )
+    return runs
+
+
+def matches_like(name: str, pattern: str) -> bool:
+    """Return whether `name` matches an SQL LIKE pattern, as SQLite does."""
+    expression = "".join(
+        ".*" if character == "%" else "." if character == "_" else re.escape(character)
+        for character in pattern
+    )
+    return re.fullmatch(expression, name, re.IGNORECASE | re.DOTALL) is not None
+
+
+def encode_attribute_value(value: Any) -> str:
+    """Encode an ADIOS attribute as the bracketed text stored by the index."""
+    if isinstance(value, (np.ndarray, np.generic)):
+        value = value.tolist()
+    if not isinstance(value, list):
+        value = [value]
+    return json.dumps(value)
+
+
+class PrefixedRunReader:
+    """Read one BP5 run with the ``<run_id>/`` variable names of an archive."""
+
+    def __init__(self, reader: Any, run_id: str) -> None:
+        self.reader = reader
+        self.prefix = f"{run_id}/"
+
+    def read(self, name: str, **selection: Any) -> Any:
+        return self.reader.read(f"/{name.removeprefix(self.prefix)}", **selection)
+
+
+def read_bp5_run(
+    run: dict[str, Any], adios_specs: list[dict[str, Any]]
+) -> tuple[list[tuple[str, str]], dict[str, Any]]:
+    """Return the attributes and ADIOS-backed features of one BP5 run."""
+    import adios2
+
+    from campaign_timeseries import read_timeseries_features
+
+    run_id = run["run_id"]
+    reader = adios2.FileReader(run["path"])
+    try:
+        attributes = [
+            (name, encode_attribute_value(reader.read_attribute(name)))
+            for name in reader.available_attributes()
+        ]
+        available_vars = {
+            build_adios_variable_name(run_id, name): info
+            for name, info in reader.available_variables().items()
+        }
+        run_reader = PrefixedRunReader(reader, run_id)
+        row = {"archive": run["archive"], "run_id": run_id}
+        for spec in adios_specs:
+            if spec["source"] == "campaign_adios":
+                row[spec["key"]] = read_adios_feature(
+                    reader=run_reader,
+                    available_vars=available_vars,
+                    run_id=run_id,
+                    spec=spec,
+                )
+        series_specs = [
+            spec for spec in adios_specs
+            if spec["source"] == "campaign_adios_timeseries"
+        ]
+        if series_specs:
+            row.update(
+                read_timeseries_features(
+                    run_reader, available_vars, run_id, series_specs
+                )
+            )
+    finally:
+        reader.close()
+    return attributes, row
+
+
+def write_bp5_index(
+    index_path: Path,
+    runs: list[dict[str, Any]],
+    run_attributes: Iterable[list[tuple[str, str]]],
+) -> None:
+    """Write an index with the campaign tables used by the feature queries."""
+    connection = sqlite3.connect(index_path)
+    try:
+        connection.executescript(INDEX_SCHEMA)
+        connection.executemany(
+            "INSERT OR IGNORE INTO archives VALUES (?, ?)",
+            ((run["archiveid"], run["archive"]) for run in runs),
+        )
+        connection.executemany(
+            "INSERT INTO datasets VALUES (?, ?, ?, ?)",
+            (
+                (run["archiveid"], run["datasetid"], run["dsid"], run["run_id"])
+                for run in runs
+            ),
+        )
+        for run, attributes in zip(runs, run_attributes):
+            connection.executemany(
+                "INSERT INTO attributes VALUES (?, ?, ?, ?)",
+                (
+                    (run["archiveid"], run["datasetid"], name, value)
+                    for name, value in attributes
+                ),
+            )
+        connection.commit()
+    finally:
+        connection.close()
+
+
+def build_bp5_feature_table(
+    layout: dict[str, Any],
+    query_dir: str | Path,
+    feature_specs: list[dict[str, Any]],
+    archive_name: str = "%",
+    jobs: int = 1,
+) -> pd.DataFrame:
+    """Build the feature table from BP5 runs, reading them in parallel.
+
+    Each run is opened once by a worker, which returns its attributes and its
+    ADIOS-backed features. The attributes are written to a temporary index with
+    the campaign tables and a typed attribute cache, so the SQL features use the
+    same queries as the campaign path.
+    """
+    runs = [
+        run
+        for run in discover_bp5_runs(layout)
+        if matches_like(run["archive"], archive_name)
+    ]
+    adios_specs = [
+        spec for spec in feature_specs if spec["source"] in ADIOS_SOURCES
+    ]
+    rows: list[dict[str, Any]] = []
+
+    def collect(results: Iterable[tuple[list[tuple[str, str]], dict[str, Any]]]):
+        for attributes, row in results:
+            rows.append(row)
+            yield attributes
+
+    with tempfile.TemporaryDirectory(prefix="rhino-bp5-") as directory:
+        index_path = Path(directory) / "bp5.acx"
+        if jobs > 1 and len(runs) > 1:
+            with ProcessPoolExecutor(max_workers=min(jobs, len(runs))) as pool:
+                results = pool.map(
+                    read_bp5_run,
+                    runs,
+                    repeat(adios_specs),
+                    chunksize=max(1, len(runs) // (4 * jobs)),
+                )
+                write_bp5_index(index_path, runs, collect(results))
+        else:
+            results = map(read_bp5_run, runs, repeat(adios_specs))
+            write_bp5_index(index_path, runs, collect(results))
+        build_attribute_cache(index_path)
+        feature_frame = build_sql_feature_table(
+            acx_path=index_path,
+            query_dir=query_dir,
+            archive_name=archive_name,
+            feature_specs=feature_specs,
+        )
+
+    if adios_specs:
+        feature_frame = merge_adios_features(feature_frame, rows, adios_specs)
+    return order_feature_table(feature_frame, feature_specs)
@@ -3,8 +3,18 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
+import time
+from datetime import datetime, timezone
 from pathlib import Path
+from typing import Any
 
+from feature_output import (
+    feature_format,
+    write_feature_batches,
+    write_feature_table,
+)
+from feature_profile import format_profile, profile_records, write_profile
 from spec_loader import load_feature_spec
 
 
@@ -21,17 +31,24 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--acx",
         type=Path,
-        required=True,
         help="Path to the SQLite-backed campaign index (.acx).",
     )
     parser.add_argument(
         "--campaign-store",
         type=Path,
-        required=True,
         help=(
             "Base directory used to resolve archive names stored in the index."
         ),
     )
+    parser.add_argument(
+        "--bp5-spec",
+        type=Path,
+        help=(
+            "Campaign JSON spec (campaign_spec.json) whose RHINO_DATA_ROOT and "
+            "INPUT_DIRS are read directly as BP5 output, instead of --acx and "
+            "--campaign-store."
+        ),
+    )
     parser.add_argument(
         "--spec",
         type=Path,
@@ -49,49 +66,192 @@ def parse_args() -> argparse.Namespace:
         default="%",
         help="SQL LIKE pattern used to select archive names (default: %%).",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes used to read campaign archives (default: 1).",
+    )
+    parser.add_argument(
+        "--tar-prefetch",
+        action="store_true",
+        help=(
+            "Read runs in TAR-offset order and prefetch their TAR replica "
+            "extents before opening each archive."
+        ),
+    )
+    parser.add_argument(
+        "--feature-cache",
+        type=Path,
+        help=(
+            "SQLite cache of extracted ADIOS values; reruns read only new runs "
+            "and changed feature definitions."
+        ),
+    )
+    parser.add_argument(
+        "--query-cache",
+        type=Path,
+        help=(
+            "Directory caching SQL query results per index file; reruns against "
+            "an unchanged .acx skip the index queries."
+        ),
+    )
+    parser.add_argument(
+        "--batch-runs",
+        type=int,
+        help=(
+            "Stream the table archive by archive in batches of at most this many "
+            "runs, keeping memory bounded for large campaigns."
+        ),
+    )
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        help=(
+            "Print per-feature wall time, SQLite steps, archives opened, ADIOS "
+            "bytes read, and cache hits, and save them to this JSON file."
+        ),
+    )
     parser.add_argument(
         "--output",
         type=Path,
         default=Path("rhino_features.csv"),
-        help="Output CSV file (default: rhino_features.csv).",
+        help=(
+            "Output feature table; .parquet, .feather, or .arrow select a typed "
+            "Arrow file instead of CSV (default: rhino_features.csv)."
+        ),
     )
     return parser.parse_args()
 
 
+def build_provenance(args: argparse.Namespace) -> dict[str, Any]:
+    """Describe the inputs of one feature build for embedding in its output."""
+    provenance: dict[str, Any] = {
+        "created_utc": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+    if args.bp5_spec is not None:
+        provenance["bp5_spec"] = str(args.bp5_spec.resolve())
+        provenance["bp5_spec_sha256"] = hashlib.sha256(
+            args.bp5_spec.read_bytes()
+        ).hexdigest()
+    else:
+        acx_status = args.acx.stat()
+        provenance.update(
+            acx=str(args.acx.resolve()),
+            acx_size=acx_status.st_size,
+            acx_mtime_ns=acx_status.st_mtime_ns,
+            campaign_store=str(args.campaign_store.resolve()),
+        )
+    provenance.update(
+        archive_name=args.archive_name,
+        feature_spec=str(args.spec.resolve()),
+        feature_spec_sha256=hashlib.sha256(args.spec.read_bytes()).hexdigest(),
+        query_dir=str(args.query_dir.resolve()),
+    )
+    return provenance
+
+
 def main() -> None:
     args = parse_args()
-    if not args.acx.is_file():
-        raise FileNotFoundError(f"Campaign index does not exist: {args.acx}")
-    if not args.campaign_store.is_dir():
-        raise FileNotFoundError(
-            f"Campaign store does not exist: {args.campaign_store}"
-        )
+    feature_format(args.output)
+    if args.bp5_spec is not None:
+        if args.acx is not None or args.campaign_store is not None:
+            raise ValueError(
+                "--bp5-spec cannot be combined with --acx or --campaign-store"
+            )
+        for option in (
+            "tar_prefetch",
+            "feature_cache",
+            "query_cache",
+            "batch_runs",
+            "profile",
+        ):
+            if getattr(args, option):
+                raise ValueError(
+                    f"--{option.replace('_', '-')} requires a campaign index (--acx)"
+                )
+        if not args.bp5_spec.is_file():
+            raise FileNotFoundError(
+                f"BP5 campaign spec does not exist: {args.bp5_spec}"
+            )
+    else:
+        if args.acx is None or args.campaign_store is None:
+            raise ValueError(
+                "Either --acx and --campaign-store or --bp5-spec is required"
+            )
+        if not args.acx.is_file():
+            raise FileNotFoundError(f"Campaign index does not exist: {args.acx}")
+        if not args.campaign_store.is_dir():
+            raise FileNotFoundError(
+                f"Campaign store does not exist: {args.campaign_store}"
+            )
+    if args.jobs < 1:
+        raise ValueError("--jobs must be at least 1")
+    if args.batch_runs is not None and args.batch_runs < 1:
+        raise ValueError("--batch-runs must be at least 1")
     if not args.query_dir.is_dir():
         raise FileNotFoundError(
             f"Campaign query directory does not exist: {args.query_dir}"
         )
 
-    from campaign_reader import build_feature_table
+    from campaign_reader import build_feature_table, iter_feature_batches
 
     specification = load_feature_spec(args.spec)
-    frame = build_feature_table(
-        acx_path=args.acx,
-        query_dir=args.query_dir,
-        campaign_store=args.campaign_store,
-        archive_name=args.archive_name,
-        feature_specs=specification["features"],
-    )
-    if frame.empty:
-        raise ValueError(
-            f"No campaign runs matched archive pattern {args.archive_name!r}"
-        )
-
+    profile = None if args.profile is None else {}
+    started = time.perf_counter()
+    options = {
+        "acx_path": args.acx,
+        "query_dir": args.query_dir,
+        "campaign_store": args.campaign_store,
+        "archive_name": args.archive_name,
+        "feature_specs": specification["features"],
+        "jobs": args.jobs,
+        "tar_prefetch": args.tar_prefetch,
+        "feature_cache": args.feature_cache,
+        "query_cache": args.query_cache,
+        "profile": profile,
+    }
     args.output.parent.mkdir(parents=True, exist_ok=True)
-    frame.to_csv(args.output, index=False)
+    if args.batch_runs is None:
+        if args.bp5_spec is not None:
+            from bp5_source import build_bp5_feature_table, load_bp5_layout
+
+            frame = build_bp5_feature_table(
+                layout=load_bp5_layout(args.bp5_spec),
+                query_dir=args.query_dir,
+                feature_specs=specification["features"],
+                archive_name=args.archive_name,
+                jobs=args.jobs,
+            )
+        else:
+            frame = build_feature_table(**options)
+        if frame.empty:
+            raise ValueError(
+                f"No campaign runs matched archive pattern {args.archive_name!r}"
+            )
+        write_feature_table(
+            frame,
+            args.output,
+            specification["features"],
+            build_provenance(args),
+        )
+        print(frame.head())
+        rows, columns = frame.shape
+        missing = frame.isna().sum()
+    else:
+        rows, missing = write_feature_batches(
+            iter_feature_batches(batch_runs=args.batch_runs, **options),
+            args.output,
+            specification["features"],
+            build_provenance(args),
+        )
+        if not rows:
+            raise ValueError(
+                f"No campaign runs matched archive pattern {args.archive_name!r}"
+            )
+        columns = len(missing)
 
-    print(frame.head())
-    print(f"\nRows: {len(frame)}, columns: {len(frame.columns)}")
-    missing = frame.isna().sum()
+    print(f"\nRows: {rows}, columns: {columns}")
     missing = missing[missing > 0]
     if missing.empty:
         print("Missing values: none")
@@ -100,6 +260,15 @@ def main() -> None:
         print(missing.to_string())
     print(f"\nSaved feature table to: {args.output}")
 
+    if profile is not None:
+        total_seconds = time.perf_counter() - started
+        records = profile_records(profile, specification["features"])
+        print("\nFeature profile:")
+        print(format_profile(records, total_seconds))
+        args.profile.parent.mkdir(parents=True, exist_ok=True)
+        write_profile(args.profile, records, total_seconds)
+        print(f"Saved feature profile to: {args.profile}")
+
 
 if __name__ == "__main__":
     main()
@@ -5,60 +5,151 @@ from __future__ import annotations
 from pathlib import Path
 from typing import Any, Iterable
 
+from feature_profile import CountingReader, charge, measure
+from tar_read_planner import plan_tar_reads, prefetch_extents
+
+
+ADIOS_SOURCES = {"campaign_adios", "campaign_adios_timeseries"}
+
 
 def build_adios_variable_name(run_id: str, variable: str) -> str:
     """Build the campaign-reader variable name for one represented RHINO run."""
     return f"{run_id}/{variable.lstrip('/')}"
 
 
+def variable_shape(info: dict[str, str]) -> tuple[int, ...]:
+    """Parse the global shape reported by `available_variables()`."""
+    shape = info.get("Shape", "").strip()
+    if not shape:
+        return ()
+    return tuple(int(extent) for extent in shape.split(","))
+
+
 def read_adios_feature(
     reader: Any,
     available_vars: dict[str, Any],
     run_id: str,
     spec: dict[str, Any],
 ) -> Any:
-    """Read and optionally index one ADIOS-backed feature value."""
+    """Read and optionally index one ADIOS-backed feature value.
+
+    An indexed feature of a single-step array is read with an ADIOS selection,
+    so only the requested element (or row) is transferred.
+    """
     variable_name = build_adios_variable_name(run_id, spec["variable"])
     if variable_name not in available_vars:
         print(f"Missing ADIOS variable: {variable_name}")
         return None
-
-    value = reader.read(variable_name)
     if "index" not in spec:
-        return value
+        return reader.read(variable_name)
 
-    try:
-        return value[spec["index"]]
-    except IndexError as error:
-        subsystem = spec.get("subsystem", "requested subsystem")
-        raise IndexError(
-            f"Index {spec['index']} for {subsystem!r} is outside ADIOS variable "
-            f"{variable_name!r}"
-        ) from error
+    index = spec["index"]
+    info = available_vars[variable_name]
+    shape = variable_shape(info)
+    if shape and info.get("AvailableStepsCount", "1") == "1":
+        if index < shape[0]:
+            selection = reader.read(
+                variable_name,
+                start=[index, *(0 for _ in shape[1:])],
+                count=[1, *shape[1:]],
+            )
+            return selection[0]
+        error: IndexError | None = None
+    else:
+        try:
+            return reader.read(variable_name)[index]
+        except IndexError as caught:
+            error = caught
+
+    subsystem = spec.get("subsystem", "requested subsystem")
+    raise IndexError(
+        f"Index {index} for {subsystem!r} is outside ADIOS variable "
+        f"{variable_name!r}"
+    ) from error
 
 
 def load_adios_feature_table(
     archive_path: str | Path,
     run_ids: Iterable[str],
-    spec: dict[str, Any],
+    specs: list[dict[str, Any]],
+    tar_prefetch: bool = False,
+    profile: dict[str, dict[str, float]] | None = None,
 ) -> list[dict[str, Any]]:
-    """Read one ADIOS-backed feature for every requested campaign run."""
+    """Read every ADIOS-backed feature for every requested run of one archive.
+
+    With `tar_prefetch`, runs are read in the order of their data in the
+    archive's TAR replicas, and the coalesced TAR extents are prefetched before
+    the archive is opened. Rows are returned in the order of `run_ids`.
+    ``campaign_adios_timeseries`` specs are reduced with chunked reads by
+    `campaign_timeseries.read_timeseries_features`. Read time and bytes are
+    added to `profile` per feature; opening the archive is shared by all.
+    """
     import adios2
 
-    reader = adios2.FileReader(str(archive_path))
+    from campaign_timeseries import read_timeseries_features
+
+    profile = {} if profile is None else profile
+    keys = [spec["key"] for spec in specs]
+    value_specs = [spec for spec in specs if spec["source"] == "campaign_adios"]
+    series_specs = [
+        spec for spec in specs if spec["source"] == "campaign_adios_timeseries"
+    ]
+    series_keys = [spec["key"] for spec in series_specs]
+
+    with measure(profile, keys):
+        run_ids = list(run_ids)
+        read_order = run_ids
+        if tar_prefetch:
+            plan = plan_tar_reads(archive_path, run_ids)
+            prefetch_extents(plan["extents"])
+            read_order = plan["run_ids"]
+        reader = CountingReader(adios2.FileReader(str(archive_path)))
+    charge(profile, keys, archives_opened=1)
+
     try:
-        available_vars = reader.available_variables()
-        return [
-            {
+        with measure(profile, keys):
+            available_vars = reader.available_variables()
+        rows = {}
+        for run_id in read_order:
+            values = {}
+            for spec in value_specs:
+                with measure(profile, [spec["key"]], reader):
+                    values[spec["key"]] = read_adios_feature(
+                        reader=reader,
+                        available_vars=available_vars,
+                        run_id=run_id,
+                        spec=spec,
+                    )
+            if series_specs:
+                with measure(profile, series_keys, reader):
+                    values.update(
+                        read_timeseries_features(
+                            reader, available_vars, run_id, series_specs
+                        )
+                    )
+            rows[run_id] = {
                 "run_id": run_id,
-                spec["key"]: read_adios_feature(
-                    reader=reader,
-                    available_vars=available_vars,
-                    run_id=run_id,
-                    spec=spec,
-                ),
+                **{spec["key"]: values[spec["key"]] for spec in specs},
             }
-            for run_id in run_ids
-        ]
     finally:
         reader.close()
+    charge(profile, keys, rows=len(run_ids))
+    return [rows[run_id] for run_id in run_ids]
+
+
+def load_adios_feature_profile(
+    archive_path: str | Path,
+    run_ids: Iterable[str],
+    specs: list[dict[str, Any]],
+    tar_prefetch: bool = False,
+) -> tuple[list[dict[str, Any]], dict[str, dict[str, float]]]:
+    """Return the rows of `load_adios_feature_table` and their profile.
+
+    Worker processes use this form, since they cannot update the caller's
+    profile in place.
+    """
+    profile: dict[str, dict[str, float]] = {}
+    rows = load_adios_feature_table(
+        archive_path, run_ids, specs, tar_prefetch=tar_prefetch, profile=profile
+    )
+    return rows, profile
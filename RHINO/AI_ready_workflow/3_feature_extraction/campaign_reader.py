@@ -2,16 +2,34 @@
 
 from __future__ import annotations
 
-import sqlite3
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import repeat
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
 import pandas as pd
+from rhino.campaign.attribute_cache import (
+    CACHE_ALIAS,
+    attach_attribute_cache,
+    is_attribute_cache_current,
+    parse_attribute_value,
+)
+from rhino.campaign.query_cache import CachedQueryRunner
 
-from campaign_adios import load_adios_feature_table
+from campaign_adios import ADIOS_SOURCES, load_adios_feature_profile
+from feature_cache import (
+    feature_spec_hash,
+    load_cached_features,
+    open_feature_cache,
+    store_features,
+)
+from feature_profile import charge, measure, merge_profile
 
 
 IDENTITY_COLUMNS = ["archive", "datasetid", "run_id"]
+ATTRIBUTE_CACHE_REFERENCE = re.compile(rf"\b{CACHE_ALIAS}\.", re.IGNORECASE)
 
 
 def read_sql_file(query_dir: str | Path, query_name: str) -> str:
@@ -22,35 +40,157 @@ def read_sql_file(query_dir: str | Path, query_name: str) -> str:
     return query_path.read_text(encoding="utf-8")
 
 
-def load_sql_feature(
-    acx_path: str | Path,
+def quote_identifier(name: str) -> str:
+    """Quote one SQLite identifier, such as a feature key used as a column."""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def compile_attribute_query(
+    specs: list[dict[str, Any]],
+) -> tuple[str, dict[str, str]]:
+    """Compile attribute-backed specs into one pivot over the typed cache.
+
+    Each spec becomes one output column named by its feature key. The query
+    also expects the ``:archive_name`` parameter used by the SQL files.
+    """
+    attributes = list(dict.fromkeys(spec["attribute"] for spec in specs))
+    params = {
+        f"attribute_{position}": attribute
+        for position, attribute in enumerate(attributes)
+    }
+    parameter_for = {attribute: name for name, attribute in params.items()}
+    columns = ",\n".join(
+        f"    MAX(CASE WHEN av.name = :{parameter_for[spec['attribute']]} "
+        f"THEN av.value_{spec['value_type']} END) "
+        f"AS {quote_identifier(spec['key'])}"
+        for spec in specs
+    )
+    placeholders = ", ".join(f":{name}" for name in params)
+    query = f"""
+SELECT
+    a.name AS archive,
+    d.datasetid,
+    d.name AS run_id,
+{columns}
+FROM {CACHE_ALIAS}.attribute_values av
+JOIN datasets d
+    ON d.archiveid = av.archiveid
+   AND d.datasetid = av.datasetid
+JOIN archives a
+    ON a.archiveid = d.archiveid
+WHERE av.name IN ({placeholders})
+  AND a.name LIKE :archive_name
+GROUP BY a.name, d.datasetid, d.name
+"""
+    return query, params
+
+
+def compile_raw_attribute_query(
+    specs: list[dict[str, Any]],
+) -> tuple[str, dict[str, str]]:
+    """Compile attribute-backed specs into one query over the raw index values.
+
+    The query returns one row per stored value; `load_raw_attribute_features`
+    parses and pivots them when the typed cache is missing or stale.
+    """
+    attributes = list(dict.fromkeys(spec["attribute"] for spec in specs))
+    params = {
+        f"attribute_{position}": attribute
+        for position, attribute in enumerate(attributes)
+    }
+    placeholders = ", ".join(f":{name}" for name in params)
+    query = f"""
+SELECT
+    a.name AS archive,
+    d.datasetid,
+    d.name AS run_id,
+    av.name AS attribute,
+    av.value
+FROM attributes av
+JOIN datasets d
+    ON d.archiveid = av.archiveid
+   AND d.datasetid = av.datasetid
+JOIN archives a
+    ON a.archiveid = d.archiveid
+WHERE av.name IN ({placeholders})
+  AND a.name LIKE :archive_name
+"""
+    return query, params
+
+
+def load_attribute_features(
+    runner: CachedQueryRunner,
+    specs: list[dict[str, Any]],
+    archive_name: str,
+) -> pd.DataFrame:
+    """Read all attribute-backed features for the selected runs in one query."""
+    query, params = compile_attribute_query(specs)
+    frame = runner.read_sql(query, {**params, "archive_name": archive_name})
+    if frame.duplicated(IDENTITY_COLUMNS).any():
+        raise ValueError("Attribute features returned duplicate campaign run rows")
+    return frame
+
+
+def load_raw_attribute_features(
+    runner: CachedQueryRunner,
+    specs: list[dict[str, Any]],
+    archive_name: str,
+) -> pd.DataFrame:
+    """Read attribute-backed features by parsing the raw index values.
+
+    Values are parsed with the typed cache's own rule, so the table equals the
+    one `load_attribute_features` reads from a current cache.
+    """
+    query, params = compile_raw_attribute_query(specs)
+    frame = runner.read_sql(query, {**params, "archive_name": archive_name})
+    parsed = frame["value"].map(parse_attribute_value)
+    values = frame[[*IDENTITY_COLUMNS, "attribute"]].assign(
+        real=pd.to_numeric(parsed.str[0]),
+        text=parsed.str[1],
+    )
+    grouped = values.groupby([*IDENTITY_COLUMNS, "attribute"])
+    attributes = list(params.values())
+    pivots = {
+        value_type: grouped[value_type]
+        .max()
+        .unstack("attribute")
+        .reindex(columns=attributes)
+        for value_type in ("real", "text")
+    }
+    table = pd.DataFrame(
+        {
+            spec["key"]: pivots[spec["value_type"]][spec["attribute"]]
+            for spec in specs
+        },
+        index=pivots["real"].index,
+    )
+    return table.reset_index()
+
+
+def load_query_features(
+    runner: CachedQueryRunner,
     query_dir: str | Path,
-    spec: dict[str, Any],
+    query_name: str,
+    specs: list[dict[str, Any]],
     archive_name: str,
 ) -> pd.DataFrame:
-    """Execute one SQL feature specification and normalize its output column."""
-    query = read_sql_file(query_dir, spec["query"])
-    with sqlite3.connect(acx_path) as connection:
-        frame = pd.read_sql_query(
-            query,
-            connection,
-            params={"archive_name": archive_name},
-        )
+    """Run one SQL file once and normalize every feature column it provides."""
+    frame = runner.read_sql(
+        read_sql_file(query_dir, query_name), {"archive_name": archive_name}
+    )
 
-    required_columns = [*IDENTITY_COLUMNS, spec["column"]]
+    required_columns = [*IDENTITY_COLUMNS, *(spec["column"] for spec in specs)]
     missing = [column for column in required_columns if column not in frame.columns]
     if missing:
         raise ValueError(
-            f"Query {spec['query']!r} did not return required column(s): "
-            f"{', '.join(missing)}"
+            f"Query {query_name!r} did not return required column(s): "
+            f"{', '.join(dict.fromkeys(missing))}"
         )
-
-    frame = frame[required_columns].copy()
     if frame.duplicated(IDENTITY_COLUMNS).any():
-        raise ValueError(
-            f"Query {spec['query']!r} returned duplicate campaign run rows"
-        )
-    return frame.rename(columns={spec["column"]: spec["key"]})
+        raise ValueError(f"Query {query_name!r} returned duplicate campaign run rows")
+
+    columns = {spec["key"]: frame[spec["column"]] for spec in specs}
+    return pd.concat([frame[IDENTITY_COLUMNS], pd.DataFrame(columns)], axis=1)
 
 
 def build_sql_feature_table(
@@ -58,31 +198,217 @@ def build_sql_feature_table(
     query_dir: str | Path,
     archive_name: str,
     feature_specs: list[dict[str, Any]],
+    query_cache: str | Path | None = None,
+    profile: dict[str, dict[str, float]] | None = None,
 ) -> pd.DataFrame:
-    """Outer-join all SQL-backed features by campaign run identity."""
+    """Build all SQL-backed features over one shared index connection.
+
+    Attribute-backed specs are answered by a single pivot query over the typed
+    attribute cache, and each query file runs once for all specs that use it.
+    Without a current cache, attribute values are parsed from the index with
+    the cache's rule instead.
+    The partial tables are outer-joined by campaign run identity in one step.
+    With ``query_cache``, results of earlier builds against the same index file
+    are reused, and the index is only opened for queries not in the cache.
+    Each query's cost is added to ``profile``, split among the specs it serves.
+    """
+    profile = {} if profile is None else profile
     sql_specs = [
         spec for spec in feature_specs if spec["source"] == "campaign_sql"
     ]
     if not sql_specs:
         raise ValueError("At least one campaign_sql feature is required")
 
-    feature_frame: pd.DataFrame | None = None
+    attribute_specs = [spec for spec in sql_specs if "attribute" in spec]
+    query_specs: dict[str, list[dict[str, Any]]] = {}
     for spec in sql_specs:
-        frame = load_sql_feature(
-            acx_path=acx_path,
-            query_dir=query_dir,
-            spec=spec,
-            archive_name=archive_name,
+        if "attribute" not in spec:
+            query_specs.setdefault(spec["query"], []).append(spec)
+
+    use_attribute_cache = bool(attribute_specs) and is_attribute_cache_current(
+        acx_path
+    )
+    if attribute_specs and not use_attribute_cache:
+        print(
+            "Typed attribute cache is missing or older than the index; parsing "
+            "attribute values from the index. Run rhino-attribute-cache to "
+            "build it."
         )
-        feature_frame = (
-            frame
-            if feature_frame is None
-            else feature_frame.merge(frame, on=IDENTITY_COLUMNS, how="outer")
+
+    prepare = None
+    if use_attribute_cache or any(
+        ATTRIBUTE_CACHE_REFERENCE.search(read_sql_file(query_dir, name))
+        for name in query_specs
+    ):
+        prepare = partial(attach_attribute_cache, index_path=acx_path)
+
+    loaders = []
+    if attribute_specs:
+        loaders.append(
+            (
+                attribute_specs,
+                partial(
+                    load_attribute_features
+                    if use_attribute_cache
+                    else load_raw_attribute_features,
+                    specs=attribute_specs,
+                    archive_name=archive_name,
+                ),
+            )
+        )
+    for query_name, specs in query_specs.items():
+        loaders.append(
+            (
+                specs,
+                partial(
+                    load_query_features,
+                    query_dir=query_dir,
+                    query_name=query_name,
+                    specs=specs,
+                    archive_name=archive_name,
+                ),
+            )
         )
 
-    if feature_frame is None:
-        raise RuntimeError("SQL feature table construction produced no table")
-    return feature_frame
+    with CachedQueryRunner(acx_path, query_cache, prepare=prepare) as runner:
+        frames: list[pd.DataFrame] = []
+        for specs, loader in loaders:
+            keys = [spec["key"] for spec in specs]
+            hits, vm_steps = runner.hits, runner.vm_steps
+            with measure(profile, keys):
+                frames.append(loader(runner))
+            charge(
+                profile,
+                keys,
+                rows=len(frames[-1]),
+                sqlite_vm_steps=runner.vm_steps - vm_steps,
+                cache_hits=runner.hits - hits,
+            )
+    if query_cache is not None:
+        print(
+            f"Query cache: {runner.hits} result(s) reused, "
+            f"{runner.misses} queried"
+        )
+
+    return pd.concat(
+        [frame.set_index(IDENTITY_COLUMNS) for frame in frames],
+        axis=1,
+        join="outer",
+    ).reset_index()
+
+
+def list_archives(
+    acx_path: str | Path,
+    archive_name: str = "%",
+    query_cache: str | Path | None = None,
+) -> list[str]:
+    """Return the sorted names of the index archives matching a LIKE pattern."""
+    with CachedQueryRunner(acx_path, query_cache) as runner:
+        frame = runner.read_sql(
+            "SELECT name FROM archives WHERE name LIKE ? ORDER BY name",
+            (archive_name,),
+        )
+    return frame["name"].tolist()
+
+
+def read_adios_features(
+    campaign_store: str | Path,
+    archives: list[str],
+    archive_runs: list[list[str]],
+    adios_specs: list[dict[str, Any]],
+    jobs: int = 1,
+    tar_prefetch: bool = False,
+    feature_cache: str | Path | None = None,
+    profile: dict[str, dict[str, float]] | None = None,
+) -> list[dict[str, Any]]:
+    """Return one row of ADIOS-backed features per run, archive by archive.
+
+    Values found in ``feature_cache`` are reused; only runs and features with
+    missing values are read, and newly read values are added to the cache.
+    Per-feature read costs and cache hits are added to ``profile``.
+    """
+    profile = {} if profile is None else profile
+    spec_hashes = [feature_spec_hash(spec) for spec in adios_specs]
+    cache = None if feature_cache is None else open_feature_cache(feature_cache)
+    try:
+        archive_values = [
+            {}
+            if cache is None
+            else load_cached_features(cache, archive, runs, spec_hashes)
+            for archive, runs in zip(archives, archive_runs)
+        ]
+        for spec, spec_hash in zip(adios_specs, spec_hashes):
+            hits = sum(
+                1
+                for values in archive_values
+                for _, cached_hash in values
+                if cached_hash == spec_hash
+            )
+            charge(profile, [spec["key"]], cache_hits=hits)
+
+        pending: list[tuple[int, list[str], list[dict[str, Any]]]] = []
+        for position, (runs, values) in enumerate(zip(archive_runs, archive_values)):
+            missing = [
+                (run_id, spec)
+                for run_id in runs
+                for spec, spec_hash in zip(adios_specs, spec_hashes)
+                if (run_id, spec_hash) not in values
+            ]
+            if missing:
+                missing_runs = list(dict.fromkeys(run_id for run_id, _ in missing))
+                missing_keys = {spec["key"] for _, spec in missing}
+                missing_specs = [
+                    spec for spec in adios_specs if spec["key"] in missing_keys
+                ]
+                pending.append((position, missing_runs, missing_specs))
+
+        arguments = (
+            [Path(campaign_store) / archives[position] for position, _, _ in pending],
+            [runs for _, runs, _ in pending],
+            [specs for _, _, specs in pending],
+            repeat(tar_prefetch),
+        )
+        if jobs > 1 and len(pending) > 1:
+            with ProcessPoolExecutor(max_workers=min(jobs, len(pending))) as pool:
+                results = list(pool.map(load_adios_feature_profile, *arguments))
+        else:
+            results = list(map(load_adios_feature_profile, *arguments))
+
+        extracted_count = 0
+        for (position, _, specs), (rows, read_profile) in zip(pending, results):
+            merge_profile(profile, read_profile)
+            extracted = {
+                (row["run_id"], feature_spec_hash(spec)): row[spec["key"]]
+                for row in rows
+                for spec in specs
+            }
+            extracted_count += len(extracted)
+            archive_values[position].update(extracted)
+            if cache is not None:
+                store_features(cache, archives[position], extracted)
+    finally:
+        if cache is not None:
+            cache.close()
+
+    if cache is not None:
+        total = sum(map(len, archive_runs)) * len(set(spec_hashes))
+        print(
+            f"Feature cache: {total - extracted_count} ADIOS value(s) reused, "
+            f"{extracted_count} extracted"
+        )
+
+    return [
+        {
+            "archive": archive,
+            "run_id": run_id,
+            **{
+                spec["key"]: values.get((run_id, spec_hash))
+                for spec, spec_hash in zip(adios_specs, spec_hashes)
+            },
+        }
+        for archive, runs, values in zip(archives, archive_runs, archive_values)
+        for run_id in runs
+    ]
 
 
 def build_feature_table(
@@ -91,42 +417,74 @@ def build_feature_table(
     campaign_store: str | Path,
     feature_specs: list[dict[str, Any]],
     archive_name: str = "%",
+    jobs: int = 1,
+    tar_prefetch: bool = False,
+    feature_cache: str | Path | None = None,
+    query_cache: str | Path | None = None,
+    profile: dict[str, dict[str, float]] | None = None,
 ) -> pd.DataFrame:
-    """Build the complete SQL- and ADIOS-backed feature table."""
+    """Build the complete SQL- and ADIOS-backed feature table.
+
+    With ``jobs`` greater than one, archives are read by that many worker
+    processes. Results are collected in archive order, so the table is
+    identical to the serial build. ``tar_prefetch`` enables the TAR read
+    planner in `load_adios_feature_table`. With ``feature_cache``, ADIOS values
+    already extracted for the same archive, run, and feature definition are
+    taken from that database, and only the missing ones are read.
+    ``query_cache`` is the result cache directory used for the SQL features.
+    Per-feature costs are accumulated in ``profile`` when it is given.
+    """
     feature_frame = build_sql_feature_table(
         acx_path=acx_path,
         query_dir=query_dir,
         archive_name=archive_name,
         feature_specs=feature_specs,
+        query_cache=query_cache,
+        profile=profile,
     )
 
     adios_specs = [
-        spec for spec in feature_specs if spec["source"] == "campaign_adios"
+        spec for spec in feature_specs if spec["source"] in ADIOS_SOURCES
     ]
-    for spec in adios_specs:
-        all_rows: list[dict[str, Any]] = []
-        for archive, group in feature_frame.groupby("archive", sort=True):
-            archive_path = Path(campaign_store) / archive
-            rows = load_adios_feature_table(
-                archive_path=archive_path,
-                run_ids=group["run_id"].tolist(),
-                spec=spec,
-            )
-            for row in rows:
-                row["archive"] = archive
-            all_rows.extend(rows)
-
-        adios_frame = pd.DataFrame(
-            all_rows,
-            columns=["archive", "run_id", spec["key"]],
-        )
-        feature_frame = feature_frame.merge(
-            adios_frame,
-            on=["archive", "run_id"],
-            how="left",
-            validate="one_to_one",
+    if adios_specs:
+        groups = feature_frame.groupby("archive", sort=True)["run_id"]
+        all_rows = read_adios_features(
+            campaign_store=campaign_store,
+            archives=list(groups.groups),
+            archive_runs=[group.tolist() for _, group in groups],
+            adios_specs=adios_specs,
+            jobs=jobs,
+            tar_prefetch=tar_prefetch,
+            feature_cache=feature_cache,
+            profile=profile,
         )
+        feature_frame = merge_adios_features(feature_frame, all_rows, adios_specs)
+
+    return order_feature_table(feature_frame, feature_specs)
 
+
+def merge_adios_features(
+    feature_frame: pd.DataFrame,
+    rows: list[dict[str, Any]],
+    adios_specs: list[dict[str, Any]],
+) -> pd.DataFrame:
+    """Left-join ADIOS feature rows onto SQL features by archive and run ID."""
+    adios_frame = pd.DataFrame(
+        rows,
+        columns=["archive", "run_id", *(spec["key"] for spec in adios_specs)],
+    )
+    return feature_frame.merge(
+        adios_frame,
+        on=["archive", "run_id"],
+        how="left",
+        validate="one_to_one",
+    )
+
+
+def order_feature_table(
+    feature_frame: pd.DataFrame, feature_specs: list[dict[str, Any]]
+) -> pd.DataFrame:
+    """Return the identity and feature columns in spec order, sorted by run."""
     ordered_columns = [
         *IDENTITY_COLUMNS,
         *(spec["key"] for spec in feature_specs),
@@ -134,3 +492,66 @@ def build_feature_table(
     return feature_frame.reindex(columns=ordered_columns).sort_values(
         IDENTITY_COLUMNS
     ).reset_index(drop=True)
+
+
+def iter_feature_batches(
+    acx_path: str | Path,
+    query_dir: str | Path,
+    campaign_store: str | Path,
+    feature_specs: list[dict[str, Any]],
+    archive_name: str = "%",
+    batch_runs: int | None = None,
+    jobs: int = 1,
+    tar_prefetch: bool = False,
+    feature_cache: str | Path | None = None,
+    query_cache: str | Path | None = None,
+    profile: dict[str, dict[str, float]] | None = None,
+) -> Iterator[pd.DataFrame]:
+    """Yield the feature table archive by archive in batches of runs.
+
+    Each archive's SQL features are queried separately and split into batches
+    of at most ``batch_runs`` runs (default: the whole archive), so memory is
+    bounded by one batch rather than by the campaign. Concatenated, the batches
+    equal the table returned by `build_feature_table`. With ``jobs`` greater
+    than one, the runs of each batch are split among that many workers.
+    """
+    adios_specs = [
+        spec for spec in feature_specs if spec["source"] in ADIOS_SOURCES
+    ]
+    for archive in list_archives(acx_path, archive_name, query_cache):
+        sql_frame = build_sql_feature_table(
+            acx_path=acx_path,
+            query_dir=query_dir,
+            archive_name=archive,
+            feature_specs=feature_specs,
+            query_cache=query_cache,
+            profile=profile,
+        )
+        # The archive name is a LIKE pattern and may match similar names.
+        sql_frame = sql_frame[sql_frame["archive"] == archive].sort_values(
+            IDENTITY_COLUMNS
+        )
+        if sql_frame.empty:
+            continue
+        size = batch_runs or len(sql_frame)
+        for start in range(0, len(sql_frame), size):
+            batch = sql_frame.iloc[start : start + size]
+            if adios_specs:
+                runs = batch["run_id"].tolist()
+                step = -(-len(runs) // jobs)
+                run_slices = [
+                    runs[offset : offset + step]
+                    for offset in range(0, len(runs), step)
+                ]
+                rows = read_adios_features(
+                    campaign_store=campaign_store,
+                    archives=[archive] * len(run_slices),
+                    archive_runs=run_slices,
+                    adios_specs=adios_specs,
+                    jobs=jobs,
+                    tar_prefetch=tar_prefetch,
+                    feature_cache=feature_cache,
+                    profile=profile,
+                )
+                batch = merge_adios_features(batch, rows, adios_specs)
+            yield order_feature_table(batch, feature_specs)
@@ -0,0 +1,275 @@
+"""Reduce ADIOS time series to scalar RHINO features with chunked reads."""
+
+from __future__ import annotations
+
+from typing import Any, Iterator
+
+import numpy as np
+
+from campaign_adios import build_adios_variable_name, variable_shape
+
+
+DEFAULT_TIME_VARIABLE = "/data/inventory/Times/data"
+DEFAULT_CHUNK_SAMPLES = 4096
+
+
+def _series_selection(
+    shape: tuple[int, ...], index: int | None, start: int, count: int
+) -> tuple[list[int], list[int]]:
+    """Return the ADIOS start/count of samples `start:start+count` of one series.
+
+    Time is the last axis. For a two-dimensional variable such as ``mass``
+    (subsystem x time), `index` selects the row.
+    """
+    if len(shape) == 1:
+        return [start], [count]
+    return [index, start], [1, count]
+
+
+def _series_metadata(
+    available_vars: dict[str, Any], run_id: str, spec: dict[str, Any]
+) -> tuple[str, str, tuple[int, ...], int] | None:
+    """Return variable names, value shape, and sample count of one series."""
+    variable_name = build_adios_variable_name(run_id, spec["variable"])
+    time_name = build_adios_variable_name(
+        run_id, spec.get("time_variable", DEFAULT_TIME_VARIABLE)
+    )
+    for name in (variable_name, time_name):
+        if name not in available_vars:
+            print(f"Missing ADIOS variable: {name}")
+            return None
+
+    shape = variable_shape(available_vars[variable_name])
+    samples = variable_shape(available_vars[time_name])
+    if len(shape) not in (1, 2) or len(samples) != 1 or shape[-1] != samples[0]:
+        raise ValueError(
+            f"ADIOS variable {variable_name!r} with shape {shape} is not a time "
+            f"series over {time_name!r} with shape {samples}"
+        )
+    if len(shape) == 2 and not 0 <= spec.get("index", -1) < shape[0]:
+        subsystem = spec.get("subsystem", "requested subsystem")
+        raise IndexError(
+            f"Index {spec.get('index')} for {subsystem!r} is outside ADIOS "
+            f"variable {variable_name!r}"
+        )
+    return variable_name, time_name, shape, samples[0]
+
+
+def _iter_chunks(
+    reader: Any,
+    variable_name: str,
+    time_name: str,
+    shape: tuple[int, ...],
+    index: int | None,
+    samples: int,
+    window: tuple[float, float],
+    chunk_samples: int,
+) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+    """Yield (times, values) chunks of the samples inside `window`.
+
+    Values are only read for chunks that overlap the window, and reading stops
+    after the window ends. Time samples must be increasing.
+    """
+    lower, upper = window
+    for start in range(0, samples, chunk_samples):
+        count = min(chunk_samples, samples - start)
+        times = np.asarray(reader.read(time_name, start=[start], count=[count]))
+        inside = (times >= lower) & (times <= upper)
+        if inside.any():
+            first = int(np.argmax(inside))
+            last = len(inside) - int(np.argmax(inside[::-1]))
+            series_start, series_count = _series_selection(
+                shape, index, start + first, last - first
+            )
+            values = reader.read(
+                variable_name, start=series_start, count=series_count
+            )
+            yield times[first:last], np.asarray(values, dtype=float).ravel()
+        if times[-1] > upper:
+            return
+
+
+def _time_above(
+    times: np.ndarray, values: np.ndarray, threshold: float
+) -> float:
+    """Return the time a piecewise-linear series spends above `threshold`."""
+    before, after = values[:-1], values[1:]
+    above_before, above_after = before > threshold, after > threshold
+    with np.errstate(divide="ignore", invalid="ignore"):
+        crossing = np.where(
+            above_before, before - threshold, after - threshold
+        ) / np.abs(after - before)
+    fraction = np.where(
+        above_before & above_after,
+        1.0,
+        np.where(above_before ^ above_after, crossing, 0.0),
+    )
+    return float(np.sum(fraction * np.diff(times)))
+
+
+def _update(
+    state: dict[str, Any], spec: dict[str, Any], times: np.ndarray, values: np.ndarray
+) -> None:
+    """Fold one chunk of samples into the running state of one reduction."""
+    reduction = spec["reduction"]
+    if reduction == "max":
+        state["value"] = max(state.get("value", -np.inf), float(values.max()))
+        return
+    if reduction == "min":
+        state["value"] = min(state.get("value", np.inf), float(values.min()))
+        return
+    if reduction == "steady_state_time":
+        deviation = np.abs(values - state["final"])
+        violations = np.flatnonzero(
+            deviation > spec["tolerance"] * abs(state["final"])
+        )
+        if violations.size == 0:
+            if state["pending"]:
+                state["value"], state["pending"] = float(times[0]), False
+        elif violations[-1] + 1 < len(times):
+            state["value"] = float(times[violations[-1] + 1])
+            state["pending"] = False
+        else:
+            state["pending"] = True
+        return
+
+    # Trapezoid-based reductions carry the previous sample across chunks.
+    if "previous" in state:
+        times = np.concatenate(([state["previous"][0]], times))
+        values = np.concatenate(([state["previous"][1]], values))
+    else:
+        state.update(first_time=float(times[0]), first_value=float(values[0]))
+    state["previous"] = (float(times[-1]), float(values[-1]))
+    state["last_time"] = float(times[-1])
+    if reduction == "time_above":
+        state["value"] = state.get("value", 0.0) + _time_above(
+            times, values, spec["threshold"]
+        )
+    else:
+        state["value"] = state.get("value", 0.0) + float(
+            np.sum(np.diff(times) * (values[:-1] + values[1:]) / 2.0)
+        )
+
+
+def _finalize(state: dict[str, Any], spec: dict[str, Any]) -> float:
+    """Return the reduced value from the final running state."""
+    if "value" not in state:
+        raise ValueError(
+            f"Feature {spec['key']!r} has no samples of {spec['variable']!r} "
+            f"inside window {spec.get('window')}"
+        )
+    if spec["reduction"] == "mean":
+        duration = state["last_time"] - state["first_time"]
+        return state["value"] / duration if duration > 0 else state["first_value"]
+    return state["value"]
+
+
+def _value_at(
+    reader: Any,
+    variable_name: str,
+    time_name: str,
+    shape: tuple[int, ...],
+    samples: int,
+    spec: dict[str, Any],
+    chunk_samples: int,
+) -> float:
+    """Linearly interpolate the series at ``spec["time"]`` from two samples."""
+    time = spec["time"]
+    index = spec.get("index")
+    previous_time: float | None = None
+    for start in range(0, samples, chunk_samples):
+        count = min(chunk_samples, samples - start)
+        times = np.asarray(reader.read(time_name, start=[start], count=[count]))
+        position = int(np.searchsorted(times, time))
+        if position == len(times):
+            previous_time = float(times[-1])
+            continue
+        next_time = float(times[position])
+        if position > 0:
+            previous_time = float(times[position - 1])
+        if next_time == time:
+            series_start, series_count = _series_selection(
+                shape, index, start + position, 1
+            )
+            value = reader.read(variable_name, start=series_start, count=series_count)
+            return float(np.ravel(value)[0])
+        if previous_time is None:
+            break
+
+        series_start, series_count = _series_selection(
+            shape, index, start + position - 1, 2
+        )
+        before, after = np.ravel(
+            reader.read(variable_name, start=series_start, count=series_count)
+        )
+        weight = (time - previous_time) / (next_time - previous_time)
+        return float(before + weight * (after - before))
+
+    raise ValueError(
+        f"Feature {spec['key']!r} time {time} is outside the time range of "
+        f"{time_name!r}"
+    )
+
+
+def read_timeseries_features(
+    reader: Any,
+    available_vars: dict[str, Any],
+    run_id: str,
+    specs: list[dict[str, Any]],
+    chunk_samples: int = DEFAULT_CHUNK_SAMPLES,
+) -> dict[str, Any]:
+    """Return every time-series reduction of one run, keyed by feature key.
+
+    Specs over the same series share one streaming pass that reads the union
+    of their windows in chunks of `chunk_samples`; each chunk is folded into
+    every reduction and discarded, so a full series is never held in memory.
+    """
+    features: dict[str, Any] = {}
+    series: dict[tuple[Any, ...], list[dict[str, Any]]] = {}
+    for spec in specs:
+        metadata = _series_metadata(available_vars, run_id, spec)
+        if metadata is None:
+            features[spec["key"]] = None
+            continue
+        variable_name, time_name, shape, samples = metadata
+        if spec["reduction"] == "value_at":
+            features[spec["key"]] = _value_at(
+                reader, variable_name, time_name, shape, samples, spec, chunk_samples
+            )
+            continue
+        group = (variable_name, time_name, shape, samples, spec.get("index"))
+        series.setdefault(group, []).append(spec)
+
+    for (variable_name, time_name, shape, samples, index), group in series.items():
+        windows = [
+            tuple(spec.get("window", (-np.inf, np.inf))) for spec in group
+        ]
+        states: list[dict[str, Any]] = [{} for _ in group]
+        for spec, state in zip(group, states):
+            if spec["reduction"] == "steady_state_time":
+                series_start, series_count = _series_selection(
+                    shape, index, samples - 1, 1
+                )
+                final = reader.read(
+                    variable_name, start=series_start, count=series_count
+                )
+                state.update(final=float(np.ravel(final)[0]), pending=True)
+
+        for times, values in _iter_chunks(
+            reader,
+            variable_name,
+            time_name,
+            shape,
+            index,
+            samples,
+            (min(lower for lower, _ in windows), max(upper for _, upper in windows)),
+            chunk_samples,
+        ):
+            for spec, state, (lower, upper) in zip(group, states, windows):
+                inside = (times >= lower) & (times <= upper)
+                if inside.any():
+                    _update(state, spec, times[inside], values[inside])
+
+        for spec, state in zip(group, states):
+            features[spec["key"]] = _finalize(state, spec)
+    return features
@@ -0,0 +1,100 @@
+"""Persist extracted ADIOS feature values between feature-table builds."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+from pathlib import Path
+from typing import Any, Iterable
+
+import numpy as np
+
+
+# Fields that only name or describe a feature; changing them does not change
+# the extracted value, so they are excluded from the spec hash.
+DESCRIPTIVE_FIELDS = {"key", "display_name", "role"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS feature_values (
+    archive TEXT NOT NULL,
+    run_id TEXT NOT NULL,
+    spec_hash TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (archive, run_id, spec_hash)
+) WITHOUT ROWID
+"""
+
+
+def feature_spec_hash(spec: dict[str, Any]) -> str:
+    """Return a stable hash of the fields that determine a feature's value."""
+    definition = {
+        field: value
+        for field, value in spec.items()
+        if field not in DESCRIPTIVE_FIELDS
+    }
+    encoded = json.dumps(definition, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def encode_value(value: Any) -> str:
+    """Encode one scalar or array feature value as JSON.
+
+    NumPy values are stored with their dtype, so a float32 value read from
+    ADIOS decodes to the same float32 rather than to a float64.
+    """
+    if isinstance(value, (np.ndarray, np.generic)):
+        return json.dumps({"dtype": value.dtype.str, "value": value.tolist()})
+    return json.dumps(value)
+
+
+def decode_value(encoded: str) -> Any:
+    """Decode a cached value, restoring NumPy values with their dtype."""
+    value = json.loads(encoded)
+    if isinstance(value, dict):
+        return np.asarray(value["value"], dtype=value["dtype"])[()]
+    return np.asarray(value) if isinstance(value, list) else value
+
+
+def open_feature_cache(path: str | Path) -> sqlite3.Connection:
+    """Open or create a feature cache database."""
+    connection = sqlite3.connect(path)
+    connection.execute(SCHEMA)
+    return connection
+
+
+def load_cached_features(
+    connection: sqlite3.Connection,
+    archive: str,
+    run_ids: Iterable[str],
+    spec_hashes: Iterable[str],
+) -> dict[tuple[str, str], Any]:
+    """Return cached values of one archive keyed by (run_id, spec hash)."""
+    run_ids = set(run_ids)
+    spec_hashes = set(spec_hashes)
+    rows = connection.execute(
+        "SELECT run_id, spec_hash, value FROM feature_values WHERE archive = ?",
+        (archive,),
+    )
+    return {
+        (run_id, spec_hash): decode_value(value)
+        for run_id, spec_hash, value in rows
+        if run_id in run_ids and spec_hash in spec_hashes
+    }
+
+
+def store_features(
+    connection: sqlite3.Connection,
+    archive: str,
+    values: dict[tuple[str, str], Any],
+) -> None:
+    """Store newly extracted values; missing (None) values are not cached."""
+    connection.executemany(
+        "INSERT OR REPLACE INTO feature_values VALUES (?, ?, ?, ?)",
+        (
+            (archive, run_id, spec_hash, encode_value(value))
+            for (run_id, spec_hash), value in values.items()
+            if value is not None
+        ),
+    )
+    connection.commit()
@@ -0,0 +1,179 @@
+"""Write RHINO feature tables as CSV or typed, self-describing Arrow files."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Iterable
+
+import pandas as pd
+
+
+FEATURE_FORMATS = {
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".feather": "feather",
+    ".arrow": "feather",
+}
+PROVENANCE_METADATA_KEY = b"rhino.provenance"
+
+
+def feature_format(path: Path) -> str:
+    """Return the output format selected by a feature-table file suffix."""
+    try:
+        return FEATURE_FORMATS[path.suffix.lower()]
+    except KeyError as error:
+        allowed = ", ".join(sorted(FEATURE_FORMATS))
+        raise ValueError(
+            f"Unsupported feature table suffix {path.suffix!r}; use one of: {allowed}"
+        ) from error
+
+
+def _require_pyarrow() -> Any:
+    try:
+        import pyarrow
+    except ImportError as error:
+        raise RuntimeError(
+            "Parquet/Feather output was requested but pyarrow is not installed"
+        ) from error
+    return pyarrow
+
+
+def feature_schema(
+    feature_specs: list[dict[str, Any]], provenance: dict[str, Any]
+) -> Any:
+    """Return the explicit Arrow schema of a feature table.
+
+    Identity columns are strings plus an int64 dataset ID. Model inputs and
+    outputs, numeric attributes, and ADIOS values are float64; metadata from
+    query files or text attributes is stored as strings. The provenance
+    dictionary is embedded as JSON in the schema metadata.
+    """
+    text_model_columns = [
+        spec["key"]
+        for spec in feature_specs
+        if spec["role"] != "metadata" and spec.get("value_type") == "text"
+    ]
+    if text_model_columns:
+        raise ValueError(
+            "Model inputs and outputs are float64 in Parquet/Feather tables, "
+            "but these are read as text attributes: "
+            + ", ".join(text_model_columns)
+            + ". Use value_type real, the metadata role, or CSV output."
+        )
+
+    pa = _require_pyarrow()
+    fields = [
+        pa.field("archive", pa.string(), nullable=False),
+        pa.field("datasetid", pa.int64(), nullable=False),
+        pa.field("run_id", pa.string(), nullable=False),
+    ]
+    for spec in feature_specs:
+        text = spec["role"] == "metadata" and (
+            "query" in spec or spec.get("value_type") == "text"
+        )
+        fields.append(pa.field(spec["key"], pa.string() if text else pa.float64()))
+
+    roles = {
+        role: [spec["key"] for spec in feature_specs if spec["role"] == role]
+        for role in ("metadata", "input", "output")
+    }
+    document = {**provenance, "columns": roles}
+    return pa.schema(
+        fields,
+        metadata={PROVENANCE_METADATA_KEY: json.dumps(document, sort_keys=True)},
+    )
+
+
+def _arrow_table(frame: pd.DataFrame, schema: Any) -> Any:
+    """Convert a feature frame to an Arrow table with the explicit schema."""
+    pa = _require_pyarrow()
+    columns = {}
+    for field in schema:
+        values = frame[field.name]
+        if pa.types.is_string(field.type):
+            values = values.astype("string")
+        try:
+            columns[field.name] = pa.array(
+                values, type=field.type, from_pandas=True
+            )
+        except (pa.ArrowInvalid, pa.ArrowTypeError) as error:
+            raise ValueError(
+                f"Feature column {field.name!r} cannot be stored as {field.type}: "
+                f"{error}"
+            ) from error
+    return pa.Table.from_pydict(columns, schema=schema)
+
+
+def write_feature_table(
+    frame: pd.DataFrame,
+    path: Path,
+    feature_specs: list[dict[str, Any]],
+    provenance: dict[str, Any],
+) -> None:
+    """Write a feature table in the format selected by the path suffix."""
+    output_format = feature_format(path)
+    if output_format == "csv":
+        frame.to_csv(path, index=False)
+        return
+
+    table = _arrow_table(frame, feature_schema(feature_specs, provenance))
+    if output_format == "parquet":
+        import pyarrow.parquet as pq
+
+        pq.write_table(table, path)
+    else:
+        import pyarrow.feather as feather
+
+        feather.write_feather(table, path)
+
+
+def write_feature_batches(
+    batches: Iterable[pd.DataFrame],
+    path: Path,
+    feature_specs: list[dict[str, Any]],
+    provenance: dict[str, Any],
+) -> tuple[int, pd.Series]:
+    """Stream feature batches to one table and return rows and missing counts.
+
+    Each batch is written as it arrives: appended to a CSV, as one Parquet row
+    group, or as one record batch of a Feather (Arrow IPC) file. No file is
+    created when there are no rows.
+    """
+    output_format = feature_format(path)
+    schema = None if output_format == "csv" else feature_schema(
+        feature_specs, provenance
+    )
+    writer = None
+    rows = 0
+    missing = pd.Series(dtype="int64")
+    try:
+        for frame in batches:
+            if frame.empty:
+                continue
+            if output_format == "csv":
+                frame.to_csv(
+                    path, index=False, mode="a" if rows else "w", header=not rows
+                )
+            else:
+                if writer is None:
+                    if output_format == "parquet":
+                        import pyarrow.parquet as pq
+
+                        writer = pq.ParquetWriter(path, schema)
+                    else:
+                        # Same default compression as pyarrow.feather.write_feather.
+                        pa = _require_pyarrow()
+                        compression = "lz4" if pa.Codec.is_available("lz4") else None
+                        writer = pa.ipc.new_file(
+                            path,
+                            schema,
+                            options=pa.ipc.IpcWriteOptions(compression=compression),
+                        )
+                writer.write_table(_arrow_table(frame, schema))
+            rows += len(frame)
+            missing = missing.add(frame.isna().sum(), fill_value=0)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows, missing.astype("int64")
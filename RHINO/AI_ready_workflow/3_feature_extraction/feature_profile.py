@@ -0,0 +1,124 @@
+"""Per-feature timing and I/O accounting for RHINO feature-table builds."""
+
+from __future__ import annotations
+
+import json
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+import numpy as np
+
+
+PROFILE_FIELDS = (
+    "seconds",
+    "rows",
+    "sqlite_vm_steps",
+    "archives_opened",
+    "bytes_read",
+    "cache_hits",
+)
+# Costs of one query or archive pass are divided among the features it serves;
+# counts describe each feature in full.
+SHARED_FIELDS = {"seconds", "sqlite_vm_steps", "bytes_read"}
+
+
+def charge(
+    profile: dict[str, dict[str, float]], keys: list[str], **amounts: float
+) -> None:
+    """Add measured amounts to the profile entries of the given feature keys."""
+    if not keys:
+        return
+    for key in keys:
+        entry = profile.setdefault(key, dict.fromkeys(PROFILE_FIELDS, 0))
+        for field, amount in amounts.items():
+            entry[field] += amount / len(keys) if field in SHARED_FIELDS else amount
+
+
+def merge_profile(
+    target: dict[str, dict[str, float]], source: dict[str, dict[str, float]]
+) -> None:
+    """Add every entry of `source`, such as a worker's profile, to `target`."""
+    for key, amounts in source.items():
+        entry = target.setdefault(key, dict.fromkeys(PROFILE_FIELDS, 0))
+        for field, amount in amounts.items():
+            entry[field] += amount
+
+
+class CountingReader:
+    """Wrap an ADIOS reader and count the bytes returned by ``read``."""
+
+    def __init__(self, reader: Any) -> None:
+        self.reader = reader
+        self.bytes_read = 0
+
+    def read(self, name: str, **selection: Any) -> Any:
+        value = self.reader.read(name, **selection)
+        self.bytes_read += np.asarray(value).nbytes
+        return value
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.reader, name)
+
+
+@contextmanager
+def measure(
+    profile: dict[str, dict[str, float]],
+    keys: list[str],
+    reader: CountingReader | None = None,
+) -> Iterator[None]:
+    """Charge the wall time and bytes read inside the block to `keys`."""
+    started = time.perf_counter()
+    bytes_before = 0 if reader is None else reader.bytes_read
+    try:
+        yield
+    finally:
+        charge(
+            profile,
+            keys,
+            seconds=time.perf_counter() - started,
+            bytes_read=0 if reader is None else reader.bytes_read - bytes_before,
+        )
+
+
+def profile_records(
+    profile: dict[str, dict[str, float]], feature_specs: Iterable[dict[str, Any]]
+) -> list[dict[str, Any]]:
+    """Return one record per feature spec, most expensive first."""
+    records = [
+        {
+            "key": spec["key"],
+            "source": spec["source"],
+            **profile.get(spec["key"], dict.fromkeys(PROFILE_FIELDS, 0)),
+        }
+        for spec in feature_specs
+    ]
+    return sorted(records, key=lambda record: record["seconds"], reverse=True)
+
+
+def format_profile(records: list[dict[str, Any]], total_seconds: float) -> str:
+    """Format profile records as a fixed-width text table."""
+    width = max([len("Feature"), *(len(record["key"]) for record in records)])
+    lines = [
+        f"{'Feature':<{width}}  {'Source':<25}  {'Seconds':>9}  {'Rows':>8}  "
+        f"{'SQLite steps':>12}  {'Archives':>8}  {'ADIOS MiB':>9}  {'Cache hits':>10}"
+    ]
+    for record in records:
+        lines.append(
+            f"{record['key']:<{width}}  {record['source']:<25}  "
+            f"{record['seconds']:>9.3f}  {record['rows']:>8}  "
+            f"{round(record['sqlite_vm_steps']):>12}  "
+            f"{record['archives_opened']:>8}  "
+            f"{record['bytes_read'] / 2**20:>9.2f}  {record['cache_hits']:>10}"
+        )
+    lines.append(f"Total build time: {total_seconds:.3f} s")
+    return "\n".join(lines)
+
+
+def write_profile(
+    path: Path, records: list[dict[str, Any]], total_seconds: float
+) -> None:
+    """Write the profile records and total build time as JSON."""
+    document = {"total_seconds": total_seconds, "features": records}
+    path.write_text(json.dumps(document, indent=2), encoding="utf-8")
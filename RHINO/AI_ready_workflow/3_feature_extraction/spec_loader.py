@@ -8,7 +8,19 @@ from typing import Any
 
 
 SUPPORTED_SCHEMA_VERSION = 1
-SUPPORTED_SOURCES = {"campaign_sql", "campaign_adios"}
+SUPPORTED_SOURCES = {"campaign_sql", "campaign_adios", "campaign_adios_timeseries"}
+SUPPORTED_VALUE_TYPES = {"real", "text"}
+SUPPORTED_REDUCTIONS = {
+    "value_at",
+    "max",
+    "min",
+    "mean",
+    "time_above",
+    "integral",
+    "steady_state_time",
+}
+WINDOWED_REDUCTIONS = {"max", "min", "mean", "time_above", "integral"}
+DEFAULT_STEADY_STATE_TOLERANCE = 0.01
 
 
 def _require(spec: dict[str, Any], fields: set[str], *, context: str) -> None:
@@ -17,6 +29,48 @@ def _require(spec: dict[str, Any], fields: set[str], *, context: str) -> None:
         raise ValueError(f"{context} is missing required field(s): {', '.join(missing)}")
 
 
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _validate_timeseries(spec: dict[str, Any], *, context: str) -> None:
+    _require(spec, {"reduction"}, context=context)
+    reduction = spec["reduction"]
+    if reduction not in SUPPORTED_REDUCTIONS:
+        allowed = ", ".join(sorted(SUPPORTED_REDUCTIONS))
+        raise ValueError(f"{context} reduction must be one of: {allowed}")
+    if "time_variable" in spec and (
+        not isinstance(spec["time_variable"], str) or not spec["time_variable"]
+    ):
+        raise TypeError(f"{context} time_variable must be a non-empty string")
+
+    if reduction == "value_at":
+        _require(spec, {"time"}, context=context)
+        if not _is_number(spec["time"]):
+            raise TypeError(f"{context} time must be a number")
+    if reduction == "time_above":
+        _require(spec, {"threshold"}, context=context)
+        if not _is_number(spec["threshold"]):
+            raise TypeError(f"{context} threshold must be a number")
+    if reduction == "steady_state_time":
+        tolerance = spec.setdefault("tolerance", DEFAULT_STEADY_STATE_TOLERANCE)
+        if not _is_number(tolerance) or tolerance < 0:
+            raise TypeError(f"{context} tolerance must be a non-negative number")
+    if "window" in spec:
+        if reduction not in WINDOWED_REDUCTIONS:
+            raise ValueError(f"{context} reduction {reduction!r} does not take a window")
+        window = spec["window"]
+        if (
+            not isinstance(window, list)
+            or len(window) != 2
+            or not all(_is_number(bound) for bound in window)
+            or window[0] > window[1]
+        ):
+            raise TypeError(
+                f"{context} window must be a [start, end] pair with start <= end"
+            )
+
+
 def _validate_feature(spec: Any, *, expected_role: str, position: int) -> None:
     context = f"{expected_role} feature #{position}"
     if not isinstance(spec, dict):
@@ -33,7 +87,18 @@ def _validate_feature(spec: Any, *, expected_role: str, position: int) -> None:
         allowed = ", ".join(sorted(SUPPORTED_SOURCES))
         raise ValueError(f"{context} source must be one of: {allowed}")
 
-    if spec["source"] == "campaign_sql":
+    if spec["source"] == "campaign_sql" and "attribute" in spec:
+        if "query" in spec or "column" in spec:
+            raise ValueError(
+                f"{context} must define either attribute or query/column, not both"
+            )
+        if not isinstance(spec["attribute"], str) or not spec["attribute"]:
+            raise TypeError(f"{context} attribute must be a non-empty string")
+        value_type = spec.setdefault("value_type", "real")
+        if value_type not in SUPPORTED_VALUE_TYPES:
+            allowed = ", ".join(sorted(SUPPORTED_VALUE_TYPES))
+            raise ValueError(f"{context} value_type must be one of: {allowed}")
+    elif spec["source"] == "campaign_sql":
         _require(spec, {"query", "column"}, context=context)
         for field in ("query", "column"):
             if not isinstance(spec[field], str) or not spec[field]:
@@ -48,6 +113,8 @@ def _validate_feature(spec: Any, *, expected_role: str, position: int) -> None:
             or spec["index"] < 0
         ):
             raise TypeError(f"{context} index must be a non-negative integer")
+        if spec["source"] == "campaign_adios_timeseries":
+            _validate_timeseries(spec, context=context)
 
 
 def load_feature_spec(path: str | Path) -> dict[str, Any]:
@@ -0,0 +1,153 @@
+"""Plan and prefetch TAR-replica reads for ADIOS-backed RHINO features."""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+from pathlib import Path
+from typing import Any, Iterable
+
+
+DEFAULT_MAX_GAP_BYTES = 1024 * 1024
+PREFETCH_CHUNK_BYTES = 8 * 1024 * 1024
+
+TAR_MEMBER_QUERY = """
+SELECT
+    ds.name AS run_id,
+    dir.name AS directory,
+    ar.tarname,
+    ai.filename,
+    ai.offset_data,
+    ai.size
+FROM dataset ds
+JOIN replica r
+    ON r.datasetid = ds.rowid
+   AND r.archiveid > 0
+   AND r.deltime = 0
+JOIN archive ar
+    ON ar.rowid = r.archiveid
+JOIN directory dir
+    ON dir.rowid = ar.dirid
+JOIN archiveidx ai
+    ON ai.archiveid = r.archiveid
+   AND ai.replicaid = r.rowid
+WHERE ds.name IN ({placeholders})
+  AND ai.size > 0
+ORDER BY dir.name, ar.tarname, ai.offset_data
+"""
+
+
+def load_tar_members(
+    archive_path: str | Path, run_ids: Iterable[str]
+) -> list[dict[str, Any]]:
+    """Return the TAR byte ranges of every file in the requested runs.
+
+    Ranges come from the ``archiveidx`` table that HPC Campaign fills when a
+    TAR is registered with an archive. Runs without a TAR replica are omitted.
+    """
+    run_ids = list(run_ids)
+    if not run_ids:
+        return []
+
+    query = TAR_MEMBER_QUERY.format(placeholders=", ".join("?" for _ in run_ids))
+    archive_uri = f"{Path(archive_path).resolve().as_uri()}?mode=ro"
+    connection = sqlite3.connect(archive_uri, uri=True)
+    try:
+        rows = connection.execute(query, run_ids).fetchall()
+    finally:
+        connection.close()
+
+    return [
+        {
+            "run_id": run_id,
+            "tar": Path(directory) / tarname,
+            "filename": filename,
+            "start": offset_data,
+            "end": offset_data + size,
+        }
+        for run_id, directory, tarname, filename, offset_data, size in rows
+    ]
+
+
+def coalesce_extents(
+    members: list[dict[str, Any]], max_gap: int = DEFAULT_MAX_GAP_BYTES
+) -> list[tuple[Path, int, int]]:
+    """Merge member ranges of one TAR that lie within `max_gap` bytes."""
+    extents: list[tuple[Path, int, int]] = []
+    for member in sorted(members, key=lambda item: (str(item["tar"]), item["start"])):
+        if extents:
+            tar, start, end = extents[-1]
+            if tar == member["tar"] and member["start"] - end <= max_gap:
+                extents[-1] = (tar, start, max(end, member["end"]))
+                continue
+        extents.append((member["tar"], member["start"], member["end"]))
+    return extents
+
+
+def plan_tar_reads(
+    archive_path: str | Path,
+    run_ids: Iterable[str],
+    max_gap: int = DEFAULT_MAX_GAP_BYTES,
+) -> dict[str, Any]:
+    """Order runs by TAR offset and return the coalesced extents they touch.
+
+    Runs are sorted by the first byte of their data in the TAR, so reads move
+    forward through each file. Runs without a TAR replica keep their relative
+    order and follow the others.
+    """
+    run_ids = list(run_ids)
+    members = load_tar_members(archive_path, run_ids)
+
+    first_offset: dict[str, tuple[str, int]] = {}
+    for member in members:
+        key = (str(member["tar"]), member["start"])
+        first_offset[member["run_id"]] = min(
+            first_offset.get(member["run_id"], key), key
+        )
+    planned = sorted(first_offset, key=first_offset.__getitem__)
+    unplanned = [run_id for run_id in run_ids if run_id not in first_offset]
+
+    return {
+        "run_ids": [*planned, *unplanned],
+        "extents": coalesce_extents(members, max_gap),
+    }
+
+
+def prefetch_extents(
+    extents: list[tuple[Path, int, int]],
+    chunk_bytes: int = PREFETCH_CHUNK_BYTES,
+) -> int:
+    """Ask the OS to read the extents ahead and return the bytes requested.
+
+    On platforms with ``posix_fadvise`` each extent is advised as sequential
+    and needed in `chunk_bytes` pieces, which starts kernel readahead without
+    blocking. Elsewhere the extents are read in large sequential chunks to
+    populate the page cache. TARs that are not reachable locally are skipped.
+    """
+    requested = 0
+    for tar, start, end in extents:
+        if not tar.is_file():
+            continue
+        with tar.open("rb") as stream:
+            descriptor = stream.fileno()
+            if hasattr(os, "posix_fadvise"):
+                os.posix_fadvise(
+                    descriptor, start, end - start, os.POSIX_FADV_SEQUENTIAL
+                )
+                for offset in range(start, end, chunk_bytes):
+                    os.posix_fadvise(
+                        descriptor,
+                        offset,
+                        min(chunk_bytes, end - offset),
+                        os.POSIX_FADV_WILLNEED,
+                    )
+            else:
+                stream.seek(start)
+                remaining = end - start
+                while remaining > 0:
+                    chunk = stream.read(min(chunk_bytes, remaining))
+                    if not chunk:
+                        break
+                    remaining -= len(chunk)
+        requested += end - start
+    return requested
@@ -0,0 +1,239 @@
+#!/usr/bin/env python
+"""Measure large-batch scoring through the MLflow serving wrapper."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import urllib.request
+from pathlib import Path
+from typing import Any, Callable
+
+import numpy as np
+import pandas as pd
+import torch
+
+from benchmark_timing import time_calls
+from trainSurrogate import BASE_DIR, SurrogateMLP, ensemble_forward
+
+DEFAULT_MODEL = BASE_DIR / "artifacts" / "rhino_surrogate.pt"
+DEFAULT_BATCH_SIZES = [1000, 10000, 100000, 1000000]
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse serving benchmark options."""
+    parser = argparse.ArgumentParser(
+        description=(
+            "Measure rows per second of RhinoSurrogatePyFunc.predict for each "
+            "input layout, and optionally of a logged or served MLflow model."
+        )
+    )
+    parser.add_argument("--model", type=Path, default=DEFAULT_MODEL)
+    parser.add_argument(
+        "--batch-sizes", type=int, nargs="+", default=DEFAULT_BATCH_SIZES
+    )
+    parser.add_argument("--min-calls", type=int, default=3)
+    parser.add_argument(
+        "--min-seconds",
+        type=float,
+        default=1.0,
+        help="Keep calling each configuration for at least this long.",
+    )
+    parser.add_argument(
+        "--model-uri",
+        default=None,
+        help=(
+            "Also score through mlflow.pyfunc.load_model(URI), including its "
+            "signature enforcement, e.g. 'models:/rhino-surrogate@candidate'."
+        ),
+    )
+    parser.add_argument(
+        "--serving-url",
+        default=None,
+        help=(
+            "Also POST dataframe_split JSON batches to a running "
+            "'mlflow models serve' endpoint, e.g. http://127.0.0.1:8080/invocations."
+        ),
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--json",
+        type=Path,
+        default=None,
+        help="Optional path for the benchmark results as JSON.",
+    )
+    return parser.parse_args()
+
+
+def load_serving_model(model_path: Path) -> Any:
+    """Build the serving wrapper from a native trainSurrogate.py checkpoint."""
+    try:
+        from mlflow_model import RhinoSurrogatePyFunc
+    except ImportError as error:
+        raise RuntimeError(
+            "Serving benchmark requested but mlflow is not installed"
+        ) from error
+
+    artifact = torch.load(model_path.expanduser(), map_location="cpu")
+    config = artifact["model_config"]
+    model = SurrogateMLP(
+        input_dim=config["input_dim"],
+        output_dim=config["output_dim"],
+        hidden_dim=config["hidden_dim"],
+        num_hidden_layers=config["num_hidden_layers"],
+    )
+    model.load_state_dict(artifact["model_state_dict"])
+    return RhinoSurrogatePyFunc(
+        model=model,
+        input_columns=artifact["input_columns"],
+        output_columns=artifact["output_columns"],
+        x_mean=artifact["x_mean"].numpy(),
+        x_std=artifact["x_std"].numpy(),
+        y_mean=artifact["y_mean"].numpy(),
+        y_std=artifact["y_std"].numpy(),
+        ensemble_state=artifact.get("ensemble_state_dict"),
+    )
+
+
+def input_layouts(x: np.ndarray, columns: list[str]) -> dict[str, Any]:
+    """Return the same batch in each input layout the wrapper accepts."""
+    frame = pd.DataFrame(x, columns=columns)
+    layouts = {
+        "dataframe": frame,
+        "dict": {column: x[:, position] for position, column in enumerate(columns)},
+        "ndarray": np.ascontiguousarray(x),
+        # String columns, as JSON clients sometimes send, take pd.to_numeric.
+        "dataframe_text": frame.astype(str),
+    }
+    try:
+        import pyarrow as pa
+    except ImportError:
+        pass
+    else:
+        layouts["arrow"] = pa.Table.from_pandas(frame, preserve_index=False)
+    return layouts
+
+
+def reference_predict(serving_model: Any, frame: pd.DataFrame) -> pd.DataFrame:
+    """Score with the per-column conversion predict() used before the fast path.
+
+    Ensembles return only the mean columns.
+    """
+    values = frame[serving_model.input_columns].apply(pd.to_numeric, errors="raise")
+    x = values.to_numpy(dtype=np.float32)
+    if not np.isfinite(x).all():
+        raise ValueError("Inference inputs must not contain NaN or infinity")
+    x_tensor = torch.tensor(
+        (x - serving_model.x_mean) / serving_model.x_std, dtype=torch.float32
+    )
+    with torch.no_grad():
+        if serving_model.ensemble_state is None:
+            y = serving_model.model(x_tensor).numpy()
+        else:
+            y = ensemble_forward(
+                serving_model.model, serving_model.ensemble_state, x_tensor
+            ).mean(dim=0).numpy()
+    return pd.DataFrame(
+        y * serving_model.y_std + serving_model.y_mean,
+        columns=serving_model.output_columns,
+        index=frame.index,
+    )
+
+
+def post_json(url: str) -> Callable[[bytes], Any]:
+    """Return a call that posts one serialized batch to a serving endpoint."""
+
+    def call(body: bytes) -> Any:
+        request = urllib.request.Request(
+            url, data=body, headers={"Content-Type": "application/json"}
+        )
+        with urllib.request.urlopen(request) as response:
+            return json.loads(response.read())
+
+    return call
+
+
+def main() -> None:
+    """Score each batch size in each layout and report throughput and parity."""
+    args = parse_args()
+    if min(args.batch_sizes) <= 0 or args.min_calls <= 0:
+        raise ValueError("Batch sizes and minimum calls must be positive")
+    serving_model = load_serving_model(args.model)
+    columns = serving_model.input_columns
+
+    loaded_model = None
+    if args.model_uri is not None:
+        import mlflow.pyfunc
+
+        loaded_model = mlflow.pyfunc.load_model(args.model_uri)
+
+    rng = np.random.default_rng(args.seed)
+    x_all = rng.normal(
+        serving_model.x_mean,
+        serving_model.x_std,
+        size=(max(args.batch_sizes), len(columns)),
+    )
+
+    results = []
+    for size in args.batch_sizes:
+        layouts = input_layouts(x_all[:size], columns)
+        expected = reference_predict(serving_model, layouts["dataframe"]).to_numpy()
+        calls = [
+            (
+                "reference",
+                lambda frame: reference_predict(serving_model, frame),
+                layouts["dataframe"],
+            )
+        ]
+        calls += [
+            (layout, lambda batch: serving_model.predict(None, batch), batch)
+            for layout, batch in layouts.items()
+        ]
+        if loaded_model is not None:
+            calls.append(("mlflow_pyfunc", loaded_model.predict, layouts["dataframe"]))
+        if args.serving_url is not None:
+            body = json.dumps(
+                {
+                    "dataframe_split": {
+                        "columns": columns,
+                        "data": x_all[:size].tolist(),
+                    }
+                }
+            ).encode()
+            calls.append(("mlflow_serving", post_json(args.serving_url), body))
+
+        for layout, call, argument in calls:
+            latencies = time_calls(call, argument, args.min_calls, args.min_seconds)
+            row = {
+                "layout": layout,
+                "batch_size": size,
+                "calls": len(latencies),
+                "p50_ms": statistics.median(latencies) * 1e3,
+                "rows_per_second": size * len(latencies) / sum(latencies),
+            }
+            if layout != "mlflow_serving":
+                prediction = np.asarray(pd.DataFrame(call(argument)))
+                row["max_abs_difference"] = float(
+                    np.max(np.abs(prediction[:, : expected.shape[1]] - expected))
+                )
+            results.append(row)
+            print(
+                f"{layout:<15} {size:>8} rows  p50 {row['p50_ms']:10.3f} ms  "
+                f"{row['rows_per_second']:14.0f} rows/s"
+            )
+
+    if args.json is not None:
+        document = {
+            "model": str(args.model.expanduser().resolve()),
+            "model_uri": args.model_uri,
+            "serving_url": args.serving_url,
+            "torch_threads": torch.get_num_threads(),
+            "results": results,
+        }
+        args.json.write_text(json.dumps(document, indent=2), encoding="utf-8")
+        print(args.json)
+
+
+if __name__ == "__main__":
+    main()
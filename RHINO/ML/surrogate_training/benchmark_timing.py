@@ -0,0 +1,27 @@
+"""Wall-clock timing shared by the surrogate benchmarks."""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Callable
+
+
+def time_calls(
+    call: Callable[[Any], Any],
+    argument: Any,
+    min_calls: int,
+    min_seconds: float = 0.0,
+) -> list[float]:
+    """Time repeated calls after one untimed warm-up call.
+
+    Calls continue until at least `min_calls` are timed and at least
+    `min_seconds` have passed.
+    """
+    call(argument)
+    latencies = []
+    started = time.perf_counter()
+    while len(latencies) < min_calls or time.perf_counter() - started < min_seconds:
+        call_started = time.perf_counter()
+        call(argument)
+        latencies.append(time.perf_counter() - call_started)
+    return latencies
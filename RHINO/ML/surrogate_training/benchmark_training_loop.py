@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+"""Compare the resident-tensor and DataLoader surrogate training loops."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+import torch
+
+from trainSurrogate import (
+    DEFAULT_FEATURE_SPEC,
+    TRAINING_LOOPS,
+    SurrogateMLP,
+    fit_model,
+    load_feature_arrays,
+    load_feature_roles,
+    normalize,
+    split_dataset,
+)
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse training-loop benchmark options."""
+    parser = argparse.ArgumentParser(
+        description=(
+            "Measure epochs per second of each surrogate training loop on the "
+            "same data, seed, and model."
+        )
+    )
+    parser.add_argument(
+        "--features",
+        type=Path,
+        default=None,
+        help=(
+            "Feature-layer table to train on. Without it, a synthetic table of "
+            "--rows rows is generated."
+        ),
+    )
+    parser.add_argument(
+        "--feature-spec",
+        type=Path,
+        default=DEFAULT_FEATURE_SPEC,
+        help="Feature JSON used for the model columns of --features.",
+    )
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--inputs", type=int, default=2)
+    parser.add_argument("--outputs", type=int, default=3)
+    parser.add_argument("--epochs", type=int, default=20)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--hidden-dim", type=int, default=100)
+    parser.add_argument("--hidden-layers", type=int, default=3)
+    parser.add_argument("--lr", type=float, default=1e-4)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--json",
+        type=Path,
+        default=None,
+        help="Optional path for the benchmark results as JSON.",
+    )
+    return parser.parse_args()
+
+
+def benchmark_arrays(args: argparse.Namespace) -> tuple[np.ndarray, np.ndarray]:
+    """Return the benchmark inputs and outputs, from a table or synthetic."""
+    if args.features is not None:
+        input_columns, output_columns = load_feature_roles(args.feature_spec)
+        _, x, y = load_feature_arrays(
+            args.features.expanduser().resolve(), input_columns, output_columns
+        )
+        return x, y
+
+    rng = np.random.default_rng(args.seed)
+    x = rng.uniform(-1.0, 1.0, size=(args.rows, args.inputs)).astype(np.float32)
+    weights = rng.normal(size=(args.inputs, args.outputs)).astype(np.float32)
+    y = np.tanh(x @ weights) + 0.01 * rng.normal(size=(args.rows, args.outputs))
+    return x, y.astype(np.float32)
+
+
+def main() -> None:
+    """Train once with each loop and report throughput and parity."""
+    args = parse_args()
+    if min(args.rows, args.inputs, args.outputs, args.epochs, args.batch_size) <= 0:
+        raise ValueError("Rows, columns, epochs, and batch size must be positive")
+    x, y = benchmark_arrays(args)
+    x_train, y_train, x_val, y_val, x_test, y_test, *_ = split_dataset(
+        x, y, seed=args.seed
+    )
+    x_train, x_val, *_ = normalize(x_train, x_val, x_test)
+    y_train, y_val, *_ = normalize(y_train, y_val, y_test)
+    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+
+    def train(training_loop: str, epochs: int) -> tuple[SurrogateMLP, float]:
+        torch.manual_seed(args.seed)
+        model = SurrogateMLP(
+            input_dim=x.shape[1],
+            output_dim=y.shape[1],
+            hidden_dim=args.hidden_dim,
+            num_hidden_layers=args.hidden_layers,
+        ).to(device)
+        best_val_loss, _, _ = fit_model(
+            model,
+            x_train,
+            y_train,
+            x_val,
+            y_val,
+            epochs=epochs,
+            batch_size=args.batch_size,
+            lr=args.lr,
+            device=device,
+            training_loop=training_loop,
+            log_every=None,
+        )
+        if device.type == "cuda":
+            torch.cuda.synchronize()
+        return model, best_val_loss
+
+    # One untimed epoch per loop keeps library warm-up out of the comparison.
+    for training_loop in TRAINING_LOOPS:
+        train(training_loop, epochs=1)
+
+    results = {}
+    states = {}
+    for training_loop in TRAINING_LOOPS:
+        started = time.perf_counter()
+        model, best_val_loss = train(training_loop, args.epochs)
+        seconds = time.perf_counter() - started
+        states[training_loop] = model.state_dict()
+        results[training_loop] = {
+            "seconds": seconds,
+            "epochs_per_second": args.epochs / seconds,
+            "best_val_loss": best_val_loss,
+        }
+        print(
+            f"{training_loop:<10}  {args.epochs / seconds:8.2f} epochs/s  "
+            f"best_val_loss={best_val_loss:.6e}"
+        )
+
+    identical = all(
+        torch.equal(tensor, states["dataloader"][name])
+        for name, tensor in states["resident"].items()
+    )
+    speedup = (
+        results["resident"]["epochs_per_second"]
+        / results["dataloader"]["epochs_per_second"]
+    )
+    print(f"Speedup: {speedup:.2f}x; identical best weights: {identical}")
+
+    if args.json is not None:
+        document = {
+            "train_rows": len(x_train),
+            "validation_rows": len(x_val),
+            "epochs": args.epochs,
+            "batch_size": args.batch_size,
+            "device": str(device),
+            "loops": results,
+            "speedup": speedup,
+            "identical_weights": identical,
+        }
+        args.json.write_text(json.dumps(document, indent=2), encoding="utf-8")
+        print(args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,462 @@
+#!/usr/bin/env python
+"""Estimate RHINO surrogate accuracy with parallel K-fold cross-validation."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Sequence
+
+import numpy as np
+import pandas as pd
+import torch
+from scipy import stats
+
+from testSurrogate import compute_metrics
+from trainSurrogate import (
+    DEFAULT_FEATURE_SPEC,
+    DEFAULT_FEATURES,
+    DEFAULT_OUTDIR,
+    KNOWN_METADATA_COLUMNS,
+    SurrogateMLP,
+    add_convergence_arguments,
+    convergence_controls,
+    fit_model,
+    load_feature_arrays,
+    load_feature_roles,
+    normalize,
+    sha256_file,
+)
+
+
+CV_METRICS_NAME = "cv_metrics.json"
+CV_FOLDS_NAME = "cv_folds.csv"
+CV_PREDICTIONS_NAME = "cv_predictions.csv"
+
+# Raw input and output arrays shared by every fold of a worker.
+_worker_data: tuple[np.ndarray, np.ndarray] | None = None
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse cross-validation command-line options."""
+    parser = argparse.ArgumentParser(
+        description=(
+            "Cross-validate the RHINO surrogate with K folds trained in parallel "
+            "and report per-output metrics with confidence intervals."
+        )
+    )
+    parser.add_argument(
+        "--features",
+        type=Path,
+        default=DEFAULT_FEATURES,
+        help=(
+            "Feature-layer table: CSV, Parquet, or Feather "
+            f"(default: {DEFAULT_FEATURES})."
+        ),
+    )
+    parser.add_argument(
+        "--feature-spec",
+        type=Path,
+        default=DEFAULT_FEATURE_SPEC,
+        help=(
+            "Feature JSON used for default model columns "
+            f"(default: {DEFAULT_FEATURE_SPEC})."
+        ),
+    )
+    parser.add_argument(
+        "--inputs",
+        nargs="+",
+        help="Input columns; defaults to the input keys in --feature-spec.",
+    )
+    parser.add_argument(
+        "--outputs",
+        nargs="+",
+        help="Output columns; defaults to the output keys in --feature-spec.",
+    )
+    parser.add_argument(
+        "--outdir",
+        type=Path,
+        default=DEFAULT_OUTDIR,
+        help=f"Directory for the cross-validation report (default: {DEFAULT_OUTDIR}).",
+    )
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument(
+        "--val-frac",
+        type=float,
+        default=0.15,
+        help=(
+            "Fraction of each fold's training rows held out to select the best "
+            "epoch; the fold itself is only used for testing."
+        ),
+    )
+    parser.add_argument(
+        "--confidence",
+        type=float,
+        default=0.95,
+        help="Confidence level of the Student-t intervals over folds.",
+    )
+    parser.add_argument("--epochs", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--hidden-dim", type=int, default=100)
+    parser.add_argument("--hidden-layers", type=int, default=3)
+    parser.add_argument("--lr", type=float, default=1e-4)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes that train folds in parallel.",
+    )
+    add_convergence_arguments(parser)
+    parser.add_argument(
+        "--mlflow",
+        action="store_true",
+        help="Log the folds and the aggregated metrics to MLflow.",
+    )
+    parser.add_argument(
+        "--mlflow-tracking-uri",
+        help="MLflow server URI; otherwise use MLFLOW_TRACKING_URI/default.",
+    )
+    parser.add_argument(
+        "--mlflow-experiment",
+        default="rhino-surrogate",
+        help="MLflow experiment name (default: rhino-surrogate).",
+    )
+    parser.add_argument(
+        "--mlflow-run-name",
+        help="Optional human-readable MLflow run name.",
+    )
+    return parser.parse_args()
+
+
+def fold_indexes(
+    row_count: int, folds: int, val_frac: float, seed: int
+) -> list[tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """Return (train, validation, test) row indexes for every fold.
+
+    Rows are shuffled once and dealt into `folds` test folds of near-equal
+    size, so every row is tested exactly once. The remaining rows of each
+    fold are shuffled again and `val_frac` of them validate.
+    """
+    if not 2 <= folds <= row_count:
+        raise ValueError("Folds must be at least 2 and at most the row count")
+    if not 0 < val_frac < 1:
+        raise ValueError("Validation fraction must be between 0 and 1")
+    rng = np.random.default_rng(seed)
+    test_folds = np.array_split(rng.permutation(row_count), folds)
+    splits = []
+    for fold, test_idx in enumerate(test_folds):
+        rest = np.concatenate(test_folds[:fold] + test_folds[fold + 1 :])
+        rng.shuffle(rest)
+        n_val = max(1, int(val_frac * len(rest)))
+        if n_val >= len(rest):
+            raise ValueError("Dataset is too small to split every fold")
+        splits.append((rest[n_val:], rest[:n_val], test_idx))
+    return splits
+
+
+def init_worker(data: tuple[np.ndarray, np.ndarray], threads: int) -> None:
+    """Store the shared arrays and limit the intra-op threads of one worker."""
+    global _worker_data
+    _worker_data = data
+    torch.set_num_threads(threads)
+
+
+def evaluate_fold(
+    split: tuple[np.ndarray, np.ndarray, np.ndarray],
+    config: dict[str, Any],
+    seed: int,
+    controls: dict[str, Any],
+) -> dict[str, Any]:
+    """Train on one fold's training rows and predict its test rows."""
+    if _worker_data is None:
+        raise RuntimeError("Cross-validation worker was started without data")
+    x, y = _worker_data
+    train_idx, val_idx, test_idx = split
+    x_train_n, x_val_n, x_test_n, *_ = normalize(x[train_idx], x[val_idx], x[test_idx])
+    y_train_n, y_val_n, _, y_mean, y_std = normalize(
+        y[train_idx], y[val_idx], y[test_idx]
+    )
+    torch.manual_seed(seed)
+    model = SurrogateMLP(
+        input_dim=x.shape[1],
+        output_dim=y.shape[1],
+        hidden_dim=config["hidden_dim"],
+        num_hidden_layers=config["hidden_layers"],
+    )
+    started = time.perf_counter()
+    best_val_loss, _, stopping = fit_model(
+        model,
+        x_train_n,
+        y_train_n,
+        x_val_n,
+        y_val_n,
+        epochs=config["epochs"],
+        batch_size=config["batch_size"],
+        lr=config["lr"],
+        log_every=None,
+        **controls,
+    )
+    model.eval()
+    with torch.no_grad():
+        prediction = model(torch.as_tensor(x_test_n, dtype=torch.float32)).numpy()
+    return {
+        "prediction": prediction * y_std + y_mean,
+        "val_loss": best_val_loss,
+        "stopped_epoch": stopping["stopped_epoch"],
+        "seconds": time.perf_counter() - started,
+    }
+
+
+def confidence_interval(values: Sequence[float], confidence: float) -> dict[str, float]:
+    """Return the mean, standard deviation, and Student-t interval of fold values."""
+    values = np.asarray(values, dtype=float)
+    mean = float(values.mean())
+    std = float(values.std(ddof=1))
+    half_width = float(
+        stats.t.ppf((1 + confidence) / 2, len(values) - 1) * std / np.sqrt(len(values))
+    )
+    return {
+        "mean": mean,
+        "std": std,
+        "ci_low": mean - half_width,
+        "ci_high": mean + half_width,
+    }
+
+
+def aggregate_metrics(
+    fold_metrics: Sequence[dict[str, Any]],
+    output_columns: Sequence[str],
+    confidence: float,
+) -> dict[str, Any]:
+    """Summarize overall and per-output fold metrics across folds."""
+    names = [name for name in fold_metrics[0] if name != "per_output"]
+    return {
+        **{
+            name: confidence_interval(
+                [metrics[name] for metrics in fold_metrics], confidence
+            )
+            for name in names
+        },
+        "per_output": {
+            column: {
+                name: confidence_interval(
+                    [metrics["per_output"][column][name] for metrics in fold_metrics],
+                    confidence,
+                )
+                for name in names
+            }
+            for column in output_columns
+        },
+    }
+
+
+def mlflow_summary(summary: dict[str, Any]) -> dict[str, float]:
+    """Flatten aggregated metrics into MLflow-safe ``cv_*`` names."""
+    flattened = {}
+    groups = {"": {k: v for k, v in summary.items() if k != "per_output"}}
+    for output, metrics in summary["per_output"].items():
+        groups[re.sub(r"[^A-Za-z0-9_.-]+", "_", output) + "_"] = metrics
+    for prefix, metrics in groups.items():
+        for name, interval in metrics.items():
+            for statistic, value in interval.items():
+                flattened[f"cv_{prefix}{name}_{statistic}"] = value
+    return flattened
+
+
+def main() -> None:
+    """Train every fold in parallel and write the aggregated report."""
+    args = parse_args()
+    default_inputs: list[str] = []
+    default_outputs: list[str] = []
+    if args.inputs is None or args.outputs is None:
+        default_inputs, default_outputs = load_feature_roles(args.feature_spec)
+    input_columns = args.inputs if args.inputs is not None else default_inputs
+    output_columns = args.outputs if args.outputs is not None else default_outputs
+    features_path = args.features.expanduser().resolve()
+    outdir = args.outdir.expanduser().resolve()
+
+    sizes = (
+        args.epochs,
+        args.batch_size,
+        args.hidden_dim,
+        args.hidden_layers,
+        args.jobs,
+    )
+    if min(sizes) <= 0:
+        raise ValueError(
+            "Epochs, batch size, hidden dimension, hidden layers, and jobs must "
+            "be positive"
+        )
+    if args.lr <= 0:
+        raise ValueError("Learning rate must be greater than zero")
+    if not 0 < args.confidence < 1:
+        raise ValueError("Confidence must be between 0 and 1")
+    controls = convergence_controls(args)
+    frame, x, y = load_feature_arrays(features_path, input_columns, output_columns)
+    splits = fold_indexes(len(frame), args.folds, args.val_frac, args.seed)
+
+    config = {
+        "epochs": args.epochs,
+        "batch_size": args.batch_size,
+        "hidden_dim": args.hidden_dim,
+        "hidden_layers": args.hidden_layers,
+        "lr": args.lr,
+    }
+    jobs = max(1, min(args.jobs, args.folds))
+    threads = max(1, (os.cpu_count() or 1) // jobs)
+    started = time.perf_counter()
+    with ProcessPoolExecutor(
+        max_workers=jobs, initializer=init_worker, initargs=((x, y), threads)
+    ) as pool:
+        results = list(
+            pool.map(
+                evaluate_fold,
+                splits,
+                [config] * args.folds,
+                [args.seed] * args.folds,
+                [controls] * args.folds,
+            )
+        )
+    wall_seconds = time.perf_counter() - started
+
+    fold_metrics = []
+    fold_records = []
+    prediction = np.empty_like(y)
+    fold_of_row = np.empty(len(frame), dtype=int)
+    for fold, ((train_idx, val_idx, test_idx), result) in enumerate(
+        zip(splits, results)
+    ):
+        metrics = compute_metrics(y[test_idx], result["prediction"], output_columns)
+        fold_metrics.append(metrics)
+        prediction[test_idx] = result["prediction"]
+        fold_of_row[test_idx] = fold
+        fold_records.append(
+            {
+                "fold": fold,
+                "train_rows": len(train_idx),
+                "validation_rows": len(val_idx),
+                "test_rows": len(test_idx),
+                "val_loss": result["val_loss"],
+                "stopped_epoch": result["stopped_epoch"],
+                "seconds": result["seconds"],
+                **{
+                    f"test_{name}": value
+                    for name, value in metrics.items()
+                    if name != "per_output"
+                },
+                **{
+                    f"test_{column}_{name}": value
+                    for column, column_metrics in metrics["per_output"].items()
+                    for name, value in column_metrics.items()
+                },
+            }
+        )
+
+    summary = aggregate_metrics(fold_metrics, output_columns, args.confidence)
+    report = {
+        "features_file": str(features_path),
+        "features_sha256": sha256_file(features_path),
+        "row_count": len(frame),
+        "input_columns": list(input_columns),
+        "output_columns": list(output_columns),
+        "folds": args.folds,
+        "confidence": args.confidence,
+        "seed": args.seed,
+        **config,
+        **controls,
+        "jobs": jobs,
+        "threads_per_job": threads,
+        "wall_seconds": wall_seconds,
+        "fold_seconds": sum(record["seconds"] for record in fold_records),
+        "metrics": summary,
+    }
+
+    context_columns = [
+        column for column in KNOWN_METADATA_COLUMNS if column in frame.columns
+    ]
+    predictions = frame[context_columns + list(input_columns)].reset_index(drop=True)
+    predictions.insert(len(predictions.columns), "source_row", np.arange(len(frame)))
+    predictions.insert(len(predictions.columns), "fold", fold_of_row)
+    for index, column in enumerate(output_columns):
+        predictions[f"true_{column}"] = y[:, index]
+        predictions[f"pred_{column}"] = prediction[:, index]
+        predictions[f"abs_error_{column}"] = np.abs(prediction[:, index] - y[:, index])
+
+    outdir.mkdir(parents=True, exist_ok=True)
+    metrics_path = outdir / CV_METRICS_NAME
+    folds_path = outdir / CV_FOLDS_NAME
+    predictions_path = outdir / CV_PREDICTIONS_NAME
+    metrics_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    pd.DataFrame.from_records(fold_records).to_csv(folds_path, index=False)
+    predictions.to_csv(predictions_path, index=False)
+
+    if args.mlflow:
+        try:
+            import mlflow
+        except ImportError as error:
+            raise RuntimeError(
+                "MLflow logging was requested but mlflow is not installed"
+            ) from error
+
+        if args.mlflow_tracking_uri:
+            mlflow.set_tracking_uri(args.mlflow_tracking_uri)
+        mlflow.set_experiment(args.mlflow_experiment)
+        with mlflow.start_run(run_name=args.mlflow_run_name):
+            mlflow.log_params(
+                {
+                    "folds": args.folds,
+                    "val_frac": args.val_frac,
+                    "confidence": args.confidence,
+                    "seed": args.seed,
+                    **config,
+                    **controls,
+                    "input_columns": json.dumps(list(input_columns)),
+                    "output_columns": json.dumps(list(output_columns)),
+                }
+            )
+            mlflow.set_tags(
+                {
+                    "features_sha256": report["features_sha256"],
+                    "evaluation": "cross_validation",
+                }
+            )
+            for record in fold_records:
+                with mlflow.start_run(run_name=f"fold{record['fold']}", nested=True):
+                    mlflow.log_metrics(
+                        {
+                            re.sub(r"[^A-Za-z0-9_.-]+", "_", name): float(value)
+                            for name, value in record.items()
+                            if name != "fold"
+                        }
+                    )
+            mlflow.log_metrics(
+                {**mlflow_summary(summary), "cv_wall_seconds": wall_seconds}
+            )
+            for path in (metrics_path, folds_path, predictions_path):
+                mlflow.log_artifact(path, artifact_path="cross_validation")
+
+    interval = f"{args.confidence:.0%} CI"
+    print(
+        f"{args.folds} folds on {jobs} worker(s): {wall_seconds:.1f} s wall, "
+        f"{report['fold_seconds']:.1f} s of fold training"
+    )
+    for column in output_columns:
+        rmse = summary["per_output"][column]["rmse"]
+        print(
+            f"{column}: RMSE {rmse['mean']:.6g} "
+            f"({interval} {rmse['ci_low']:.6g} to {rmse['ci_high']:.6g})"
+        )
+    print("\nSaved:")
+    print(metrics_path)
+    print(folds_path)
+    print(predictions_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+#!/usr/bin/env python
+"""Export a RHINO surrogate as a fused TorchScript or ONNX inference graph."""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+from typing import Any
+
+import torch
+import torch.nn as nn
+
+from trainSurrogate import SurrogateMLP, ensemble_forward, sha256_file
+
+
+BASE_DIR = Path(__file__).resolve().parent
+DEFAULT_ARTIFACT_DIR = BASE_DIR / "artifacts"
+EXPORT_FORMATS = ("torchscript", "onnx")
+EXPORT_SUFFIXES = {"torchscript": ".ts", "onnx": ".onnx"}
+METADATA_SUFFIX = ".json"
+
+
+class FusedSurrogate(nn.Module):
+    """Map raw physical inputs to physical outputs with no separate scaling.
+
+    An ensemble returns the member mean followed by the member standard
+    deviation of every output.
+    """
+
+    def __init__(self, members: list[nn.Sequential]) -> None:
+        super().__init__()
+        self.members = nn.ModuleList(members)
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        if len(self.members) == 1:
+            return self.members[0](x)
+        predictions = torch.stack([member(x) for member in self.members])
+        return torch.cat(
+            [predictions.mean(dim=0), predictions.std(dim=0, unbiased=False)],
+            dim=1,
+        )
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse surrogate-export command-line options."""
+    parser = argparse.ArgumentParser(
+        description=(
+            "Fold input and output normalization into a trained RHINO surrogate "
+            "and export it as TorchScript and ONNX."
+        )
+    )
+    parser.add_argument(
+        "--model",
+        type=Path,
+        default=DEFAULT_ARTIFACT_DIR / "rhino_surrogate.pt",
+        help="Path to the trained surrogate artifact.",
+    )
+    parser.add_argument(
+        "--outdir",
+        type=Path,
+        default=DEFAULT_ARTIFACT_DIR,
+        help="Directory for the exported graphs and their metadata.",
+    )
+    parser.add_argument(
+        "--name",
+        default="rhino_surrogate_fused",
+        help="File stem of the exported graphs (default: rhino_surrogate_fused).",
+    )
+    parser.add_argument(
+        "--formats",
+        nargs="+",
+        choices=EXPORT_FORMATS,
+        default=list(EXPORT_FORMATS),
+        help="Graph formats to write (default: torchscript onnx).",
+    )
+    parser.add_argument(
+        "--check-rows",
+        type=int,
+        default=256,
+        help="Random rows used to compare the fused graph with the original.",
+    )
+    return parser.parse_args()
+
+
+def artifact_columns(artifact: dict[str, Any], role: str) -> list[str]:
+    """Return the input or output column names of a training or demo artifact."""
+    if f"{role}_columns" in artifact:
+        return list(artifact[f"{role}_columns"])
+    return [spec["key"] for spec in artifact[f"{role}_specs"]]
+
+
+def fold_normalization(
+    model: SurrogateMLP,
+    x_mean: torch.Tensor,
+    x_std: torch.Tensor,
+    y_mean: torch.Tensor,
+    y_std: torch.Tensor,
+) -> nn.Sequential:
+    """Return a copy of `model.net` whose end layers absorb the normalization.
+
+    ``(x - mean) / std`` becomes part of the first layer's weight and bias,
+    and ``y * std + mean`` part of the last layer's.
+    """
+    layers = [
+        nn.Linear(layer.in_features, layer.out_features)
+        if isinstance(layer, nn.Linear)
+        else layer
+        for layer in model.net
+    ]
+    fused = nn.Sequential(*layers)
+    fused.load_state_dict(model.net.state_dict())
+    first, last = fused[0], fused[-1]
+    x_mean, x_std = x_mean.reshape(-1), x_std.reshape(-1)
+    y_mean, y_std = y_mean.reshape(-1), y_std.reshape(-1)
+    with torch.no_grad():
+        first.bias -= first.weight @ (x_mean / x_std)
+        first.weight /= x_std
+        last.weight *= y_std.unsqueeze(1)
+        last.bias.mul_(y_std).add_(y_mean)
+    return fused.eval()
+
+
+def build_fused_surrogate(
+    artifact: dict[str, Any],
+) -> tuple[FusedSurrogate, SurrogateMLP, dict[str, torch.Tensor] | None]:
+    """Return the fused module, the original network, and any ensemble states."""
+    config = artifact["model_config"]
+    model = SurrogateMLP(
+        input_dim=config["input_dim"],
+        output_dim=config["output_dim"],
+        hidden_dim=config["hidden_dim"],
+        num_hidden_layers=config["num_hidden_layers"],
+    )
+    model.load_state_dict(artifact["model_state_dict"])
+    model.eval()
+    statistics = [
+        artifact[name].float() for name in ("x_mean", "x_std", "y_mean", "y_std")
+    ]
+
+    ensemble_state = artifact.get("ensemble_state_dict")
+    if ensemble_state is None:
+        members = [fold_normalization(model, *statistics)]
+    else:
+        members = []
+        for index in range(artifact["ensemble_size"]):
+            member = SurrogateMLP(
+                input_dim=config["input_dim"],
+                output_dim=config["output_dim"],
+                hidden_dim=config["hidden_dim"],
+                num_hidden_layers=config["num_hidden_layers"],
+            )
+            member.load_state_dict(
+                {name: tensor[index] for name, tensor in ensemble_state.items()}
+            )
+            members.append(fold_normalization(member, *statistics))
+    return FusedSurrogate(members).eval(), model, ensemble_state
+
+
+def reference_prediction(
+    artifact: dict[str, Any],
+    model: SurrogateMLP,
+    ensemble_state: dict[str, torch.Tensor] | None,
+    x: torch.Tensor,
+) -> torch.Tensor:
+    """Predict as the unfused runtimes do: scale, evaluate, and unscale."""
+    x_mean, x_std = artifact["x_mean"].reshape(1, -1), artifact["x_std"].reshape(1, -1)
+    y_mean, y_std = artifact["y_mean"].reshape(1, -1), artifact["y_std"].reshape(1, -1)
+    x_normalized = (x - x_mean) / x_std
+    with torch.no_grad():
+        if ensemble_state is None:
+            return model(x_normalized) * y_std + y_mean
+        members = ensemble_forward(model, ensemble_state, x_normalized)
+    return torch.cat(
+        [
+            members.mean(dim=0) * y_std + y_mean,
+            members.std(dim=0, unbiased=False) * y_std,
+        ],
+        dim=1,
+    )
+
+
+def export_torchscript(module: FusedSurrogate, path: Path) -> None:
+    """Script the fused module and save it."""
+    torch.jit.save(torch.jit.script(module), str(path))
+
+
+def export_onnx(module: FusedSurrogate, example: torch.Tensor, path: Path) -> None:
+    """Write the fused module as an ONNX graph with a dynamic row axis."""
+    torch.onnx.export(
+        module,
+        (example,),
+        str(path),
+        input_names=["inputs"],
+        output_names=["outputs"],
+        dynamic_axes={"inputs": {0: "rows"}, "outputs": {0: "rows"}},
+        dynamo=False,
+    )
+
+
+def main() -> None:
+    """Fuse, check, and export one surrogate artifact."""
+    args = parse_args()
+    if args.check_rows <= 0:
+        raise ValueError("Check rows must be positive")
+    if "onnx" in args.formats:
+        try:
+            import onnx  # noqa: F401
+        except ImportError as error:
+            raise RuntimeError(
+                "ONNX export was requested but onnx is not installed"
+            ) from error
+    model_path = args.model.expanduser().resolve()
+    outdir = args.outdir.expanduser().resolve()
+    artifact = torch.load(model_path, map_location="cpu")
+    fused, model, ensemble_state = build_fused_surrogate(artifact)
+
+    input_columns = artifact_columns(artifact, "input")
+    output_columns = artifact_columns(artifact, "output")
+    generator = torch.Generator().manual_seed(0)
+    x_check = artifact["x_mean"].reshape(1, -1) + artifact["x_std"].reshape(
+        1, -1
+    ) * torch.randn(args.check_rows, len(input_columns), generator=generator)
+    with torch.no_grad():
+        fused_prediction = fused(x_check)
+    reference = reference_prediction(artifact, model, ensemble_state, x_check)
+    scale = reference.abs().amax(dim=0).clamp_min(1.0)
+    max_relative_error = float(((fused_prediction - reference).abs() / scale).max())
+    if max_relative_error > 1e-4:
+        raise ValueError(
+            f"Fused graph differs from the original model by {max_relative_error:.2e}"
+        )
+
+    metadata = {
+        "input_columns": input_columns,
+        "output_columns": output_columns,
+        "ensemble_size": artifact.get("ensemble_size", 1),
+        "source_model": str(model_path),
+        "source_model_sha256": sha256_file(model_path),
+        "max_relative_error": max_relative_error,
+        "formats": {},
+    }
+    for role in ("input", "output"):
+        if f"{role}_specs" in artifact:
+            metadata[f"{role}_specs"] = artifact[f"{role}_specs"]
+
+    outdir.mkdir(parents=True, exist_ok=True)
+    for export_format in args.formats:
+        path = outdir / f"{args.name}{EXPORT_SUFFIXES[export_format]}"
+        if export_format == "torchscript":
+            export_torchscript(fused, path)
+        else:
+            export_onnx(fused, x_check[:1], path)
+        metadata["formats"][export_format] = path.name
+    metadata_path = outdir / f"{args.name}{METADATA_SUFFIX}"
+    metadata_path.write_text(json.dumps(metadata, indent=2), encoding="utf-8")
+
+    print(f"Fused graph matches the original model within {max_relative_error:.2e}")
+    print("\nSaved:")
+    for file_name in metadata["formats"].values():
+        print(outdir / file_name)
+    print(metadata_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,16 +2,31 @@
 
 from __future__ import annotations
 
-from typing import Any, Sequence
+from typing import Any, Iterable, Mapping, Sequence
 
 import mlflow.pyfunc
 import numpy as np
 import pandas as pd
 import torch
+from pandas.api.types import is_bool_dtype, is_complex_dtype, is_numeric_dtype
+
+
+def is_real_dtype(dtype: Any) -> bool:
+    """Return whether values of `dtype` are real numbers, not booleans."""
+    return (
+        is_numeric_dtype(dtype)
+        and not is_bool_dtype(dtype)
+        and not is_complex_dtype(dtype)
+    )
 
 
 class RhinoSurrogatePyFunc(mlflow.pyfunc.PythonModel):
-    """Serve raw named RHINO inputs and return denormalized named outputs."""
+    """Serve raw named RHINO inputs and return denormalized named outputs.
+
+    With `ensemble_state`, every member is evaluated in one vectorized pass;
+    each output column holds the ensemble mean and a ``<output>_std`` column
+    holds the member standard deviation in physical units.
+    """
 
     def __init__(
         self,
@@ -22,9 +37,15 @@ class RhinoSurrogatePyFunc(mlflow.pyfunc.PythonModel):
         x_std: np.ndarray,
         y_mean: np.ndarray,
         y_std: np.ndarray,
+        ensemble_state: dict[str, torch.Tensor] | None = None,
     ) -> None:
         """Store the trained network and its complete inference contract."""
         self.model = model.to("cpu").eval()
+        self.ensemble_state = (
+            None
+            if ensemble_state is None
+            else {name: tensor.to("cpu") for name, tensor in ensemble_state.items()}
+        )
         self.input_columns = list(input_columns)
         self.output_columns = list(output_columns)
         self.x_mean = np.asarray(x_mean, dtype=np.float32).reshape(-1)
@@ -32,19 +53,86 @@ class RhinoSurrogatePyFunc(mlflow.pyfunc.PythonModel):
         self.y_mean = np.asarray(y_mean, dtype=np.float32).reshape(-1)
         self.y_std = np.asarray(y_std, dtype=np.float32).reshape(-1)
 
-    def predict(
-        self,
-        context: Any,
-        model_input: pd.DataFrame,
-        params: dict[str, Any] | None = None,
-    ) -> pd.DataFrame:
-        """Normalize raw inputs, run inference, and restore physical outputs."""
-        del context, params
-        if not isinstance(model_input, pd.DataFrame):
-            model_input = pd.DataFrame(model_input)
+    def input_matrix(self, model_input: Any) -> tuple[np.ndarray, pd.Index | None]:
+        """Return the inputs as one float32 matrix in input-column order.
+
+        Numeric DataFrames, mappings of arrays, 2-D or structured NumPy arrays,
+        and Arrow tables or record batches are read column by column without
+        per-value conversion. Columns holding strings or objects, as from JSON,
+        fall back to ``pd.to_numeric``. Boolean and complex columns are
+        rejected in every layout. The index is that of a DataFrame input.
+        """
+        if isinstance(model_input, pd.DataFrame):
+            self.check_columns(model_input.columns)
+            values = model_input[self.input_columns]
+            if not all(is_real_dtype(dtype) for dtype in values.dtypes):
+                try:
+                    values = values.apply(pd.to_numeric, errors="raise")
+                except (TypeError, ValueError) as error:
+                    raise ValueError(
+                        "Inference input columns must be numeric"
+                    ) from error
+                if not all(is_real_dtype(dtype) for dtype in values.dtypes):
+                    raise ValueError(
+                        "Inference input columns must be real numbers, not "
+                        "booleans or complex values"
+                    )
+            return values.to_numpy(dtype=np.float32), model_input.index
+
+        if isinstance(model_input, np.ndarray) and model_input.dtype.names is None:
+            width = len(self.input_columns)
+            if model_input.ndim != 2 or model_input.shape[1] != width:
+                raise ValueError(
+                    f"Inference array must have shape (rows, {width}) with "
+                    "columns in input-column order"
+                )
+            if not is_numeric_dtype(model_input.dtype):
+                raise ValueError("Inference input columns must be numeric")
+            if not is_real_dtype(model_input.dtype):
+                raise ValueError(
+                    "Inference input columns must be real numbers, not "
+                    "booleans or complex values"
+                )
+            return np.asfortranarray(model_input, dtype=np.float32), None
+
+        if isinstance(model_input, np.ndarray):
+            self.check_columns(model_input.dtype.names)
+            columns = [model_input[column] for column in self.input_columns]
+        elif hasattr(model_input, "column_names") and hasattr(model_input, "column"):
+            # pyarrow.Table and pyarrow.RecordBatch.
+            self.check_columns(model_input.column_names)
+            columns = [
+                model_input.column(column).to_numpy(zero_copy_only=False)
+                for column in self.input_columns
+            ]
+        elif isinstance(model_input, Mapping):
+            self.check_columns(model_input)
+            columns = [
+                np.atleast_1d(np.asarray(model_input[column]))
+                for column in self.input_columns
+            ]
+        else:
+            return self.input_matrix(pd.DataFrame(model_input))
 
+        rows = len(columns[0]) if columns else 0
+        if not all(
+            column.ndim == 1 and len(column) == rows and is_real_dtype(column.dtype)
+            for column in columns
+        ):
+            return self.input_matrix(
+                pd.DataFrame(dict(zip(self.input_columns, columns)))
+            )
+        # Column-major, so filling and normalizing run along whole columns.
+        x = np.empty((len(self.input_columns), rows), dtype=np.float32).T
+        for position, column in enumerate(columns):
+            x[:, position] = column
+        return x, None
+
+    def check_columns(self, available: Iterable[str]) -> None:
+        """Raise when a required input column is not available."""
+        available = set(available)
         missing = [
-            column for column in self.input_columns if column not in model_input
+            column for column in self.input_columns if column not in available
         ]
         if missing:
             raise ValueError(
@@ -52,22 +140,44 @@ class RhinoSurrogatePyFunc(mlflow.pyfunc.PythonModel):
                 + ", ".join(missing)
             )
 
-        try:
-            values = model_input[self.input_columns].apply(
-                pd.to_numeric,
-                errors="raise",
-            )
-        except (TypeError, ValueError) as error:
-            raise ValueError("Inference input columns must be numeric") from error
+    def predict(
+        self,
+        context: Any,
+        model_input: pd.DataFrame,
+        params: dict[str, Any] | None = None,
+    ) -> pd.DataFrame:
+        """Normalize raw inputs, run inference, and restore physical outputs.
 
-        x = values.to_numpy(dtype=np.float32)
+        MLflow serving passes a DataFrame; direct callers may also pass any
+        input accepted by `input_matrix`.
+        """
+        del context, params
+        x, index = self.input_matrix(model_input)
         if not np.isfinite(x).all():
             raise ValueError("Inference inputs must not contain NaN or infinity")
-        normalized_x = (x - self.x_mean) / self.x_std
+        normalized_x = np.subtract(x, self.x_mean)
+        normalized_x /= self.x_std
+
+        x_tensor = torch.from_numpy(normalized_x)
+        if self.ensemble_state is None:
+            with torch.no_grad():
+                normalized_y = self.model(x_tensor).numpy()
+            y = normalized_y * self.y_std + self.y_mean
+            return pd.DataFrame(
+                y, columns=self.output_columns, index=index
+            )
+
+        from trainSurrogate import ensemble_forward
 
         with torch.no_grad():
-            normalized_y = self.model(
-                torch.tensor(normalized_x, dtype=torch.float32)
-            ).numpy()
-        y = normalized_y * self.y_std + self.y_mean
-        return pd.DataFrame(y, columns=self.output_columns, index=model_input.index)
+            members = ensemble_forward(self.model, self.ensemble_state, x_tensor)
+        y = members.mean(dim=0).numpy() * self.y_std + self.y_mean
+        y_spread = members.std(dim=0, unbiased=False).numpy() * self.y_std
+        return pd.DataFrame(
+            np.concatenate([y, y_spread], axis=1),
+            columns=[
+                *self.output_columns,
+                *(f"{column}_std" for column in self.output_columns),
+            ],
+            index=index,
+        )
@@ -0,0 +1,442 @@
+#!/usr/bin/env python
+"""Search RHINO surrogate hyperparameters with parallel successive halving."""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+import torch
+
+from trainSurrogate import (
+    DEFAULT_FEATURE_SPEC,
+    DEFAULT_FEATURES,
+    DEFAULT_OUTDIR,
+    SurrogateMLP,
+    add_convergence_arguments,
+    add_mlflow_arguments,
+    convergence_controls,
+    fit_model,
+    load_feature_arrays,
+    load_feature_roles,
+    normalize,
+    split_dataset,
+    train_and_save,
+)
+
+
+SEARCH_STRATEGIES = ("grid", "random")
+SEARCH_RESULTS_NAME = "search_results.csv"
+
+# Normalized training and validation splits shared by every task of a worker.
+_worker_data: tuple[np.ndarray, ...] | None = None
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse surrogate-search command-line options."""
+    parser = argparse.ArgumentParser(
+        description=(
+            "Search RHINO surrogate hyperparameters with successive halving and "
+            "train the winning configuration."
+        )
+    )
+    parser.add_argument(
+        "--features",
+        type=Path,
+        default=DEFAULT_FEATURES,
+        help=(
+            "Feature-layer table: CSV, Parquet, or Feather "
+            f"(default: {DEFAULT_FEATURES})."
+        ),
+    )
+    parser.add_argument(
+        "--feature-spec",
+        type=Path,
+        default=DEFAULT_FEATURE_SPEC,
+        help=(
+            "Feature JSON used for default model columns "
+            f"(default: {DEFAULT_FEATURE_SPEC})."
+        ),
+    )
+    parser.add_argument(
+        "--inputs",
+        nargs="+",
+        help="Input columns; defaults to the input keys in --feature-spec.",
+    )
+    parser.add_argument(
+        "--outputs",
+        nargs="+",
+        help="Output columns; defaults to the output keys in --feature-spec.",
+    )
+    parser.add_argument(
+        "--outdir",
+        type=Path,
+        default=DEFAULT_OUTDIR,
+        help=(
+            "Directory for the search table and winning model artifact "
+            f"(default: {DEFAULT_OUTDIR})."
+        ),
+    )
+    parser.add_argument(
+        "--hidden-dims",
+        nargs="+",
+        type=int,
+        default=[50, 100, 200],
+        help="Hidden-layer widths to search.",
+    )
+    parser.add_argument(
+        "--hidden-layer-counts",
+        nargs="+",
+        type=int,
+        default=[2, 3, 4],
+        help="Numbers of hidden layers to search.",
+    )
+    parser.add_argument(
+        "--lrs",
+        nargs="+",
+        type=float,
+        default=[1e-4, 3e-4, 1e-3],
+        help=(
+            "Learning rates for a grid search; a random search samples "
+            "log-uniformly between the smallest and largest."
+        ),
+    )
+    parser.add_argument(
+        "--strategy",
+        choices=SEARCH_STRATEGIES,
+        default="grid",
+        help="Evaluate every combination, or --samples random configurations.",
+    )
+    parser.add_argument(
+        "--samples",
+        type=int,
+        default=12,
+        help="Number of configurations drawn by a random search.",
+    )
+    parser.add_argument(
+        "--min-epochs",
+        type=int,
+        default=10,
+        help="Training epochs of every configuration in the first round.",
+    )
+    parser.add_argument(
+        "--eta",
+        type=int,
+        default=3,
+        help=(
+            "Halving rate: each round keeps the best 1/eta configurations and "
+            "multiplies their epochs by eta."
+        ),
+    )
+    parser.add_argument(
+        "--epochs",
+        type=int,
+        default=200,
+        help="Training epochs of the winning configuration.",
+    )
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes that train configurations in parallel.",
+    )
+    add_convergence_arguments(parser)
+    add_mlflow_arguments(parser)
+    return parser.parse_args()
+
+
+def search_candidates(args: argparse.Namespace) -> list[dict[str, Any]]:
+    """Return the hyperparameter configurations of a grid or random search."""
+    if args.strategy == "grid":
+        return [
+            {"hidden_dim": hidden_dim, "hidden_layers": hidden_layers, "lr": lr}
+            for hidden_dim, hidden_layers, lr in itertools.product(
+                args.hidden_dims, args.hidden_layer_counts, args.lrs
+            )
+        ]
+
+    rng = np.random.default_rng(args.seed)
+    low, high = math.log(min(args.lrs)), math.log(max(args.lrs))
+    return [
+        {
+            "hidden_dim": int(rng.choice(args.hidden_dims)),
+            "hidden_layers": int(rng.choice(args.hidden_layer_counts)),
+            "lr": float(math.exp(rng.uniform(low, high))),
+        }
+        for _ in range(args.samples)
+    ]
+
+
+def init_worker(data: tuple[np.ndarray, ...], threads: int) -> None:
+    """Store the shared splits and limit the intra-op threads of one worker."""
+    global _worker_data
+    _worker_data = data
+    torch.set_num_threads(threads)
+
+
+def evaluate_candidate(
+    config: dict[str, Any],
+    epochs: int,
+    batch_size: int,
+    seed: int,
+    controls: dict[str, Any],
+    state: dict[str, torch.Tensor] | None = None,
+) -> tuple[dict[str, float], dict[str, torch.Tensor]]:
+    """Train one configuration and return its validation loss and best weights.
+
+    The model is initialized from `seed`, or resumed from the `state` returned
+    by a previous round, and trained for `epochs` more epochs.
+    """
+    if _worker_data is None:
+        raise RuntimeError("Search worker was started without training data")
+    x_train, y_train, x_val, y_val = _worker_data
+    torch.manual_seed(seed)
+    model = SurrogateMLP(
+        input_dim=x_train.shape[1],
+        output_dim=y_train.shape[1],
+        hidden_dim=config["hidden_dim"],
+        num_hidden_layers=config["hidden_layers"],
+    )
+    if state is not None:
+        model.load_state_dict(state)
+    started = time.perf_counter()
+    best_val_loss, _, stopping = fit_model(
+        model,
+        x_train,
+        y_train,
+        x_val,
+        y_val,
+        epochs=epochs,
+        batch_size=batch_size,
+        lr=config["lr"],
+        log_every=None,
+        **controls,
+    )
+    result = {
+        "val_loss": best_val_loss,
+        "stopped_epoch": stopping["stopped_epoch"],
+        "seconds": time.perf_counter() - started,
+    }
+    return result, model.state_dict()
+
+
+def successive_halving(
+    candidates: list[dict[str, Any]],
+    data: tuple[np.ndarray, ...],
+    args: argparse.Namespace,
+) -> tuple[dict[str, Any], pd.DataFrame]:
+    """Prune candidates by validation loss and return the winner and all results.
+
+    Every round trains the surviving configurations in parallel up to the
+    round's epoch budget and keeps the best ``ceil(n / eta)``. Survivors resume
+    from the best weights of their previous round, so each round trains only
+    the epochs its budget adds. Rounds stop when one configuration remains or
+    the next round would reach the winner's full ``--epochs``.
+    """
+    # The wall-clock budget applies to the winner's training, not to each round.
+    controls = {**convergence_controls(args), "time_budget": None}
+    jobs = max(1, min(args.jobs, len(candidates)))
+    threads = max(1, (os.cpu_count() or 1) // jobs)
+    survivors = list(range(len(candidates)))
+    states: dict[int, dict[str, torch.Tensor]] = {}
+    records = []
+    trained_epochs = 0
+    epochs = args.min_epochs
+    round_number = 0
+    with ProcessPoolExecutor(
+        max_workers=jobs, initializer=init_worker, initargs=(data, threads)
+    ) as pool:
+        while len(survivors) > 1 and epochs < args.epochs:
+            round_epochs = epochs - trained_epochs
+            evaluations = list(
+                pool.map(
+                    evaluate_candidate,
+                    [candidates[index] for index in survivors],
+                    itertools.repeat(round_epochs),
+                    itertools.repeat(args.batch_size),
+                    itertools.repeat(args.seed),
+                    itertools.repeat(controls),
+                    [states.get(index) for index in survivors],
+                )
+            )
+            ranked = sorted(
+                zip(survivors, evaluations), key=lambda item: item[1][0]["val_loss"]
+            )
+            keep = math.ceil(len(ranked) / args.eta)
+            for rank, (index, (result, _)) in enumerate(ranked):
+                records.append(
+                    {
+                        "round": round_number,
+                        "candidate": index,
+                        **candidates[index],
+                        "epochs": epochs,
+                        "round_epochs": round_epochs,
+                        **result,
+                        "promoted": rank < keep,
+                    }
+                )
+            print(
+                f"Round {round_number}: {len(ranked)} configuration(s) x "
+                f"{round_epochs} epochs, best val_loss="
+                f"{ranked[0][1][0]['val_loss']:.6e}"
+            )
+            survivors = [index for index, _ in ranked[:keep]]
+            states = {index: state for index, (_, state) in ranked[:keep]}
+            trained_epochs = epochs
+            epochs *= args.eta
+            round_number += 1
+
+    results = pd.DataFrame.from_records(records)
+    print(
+        f"Search trained {int(results['stopped_epoch'].sum())} epochs over "
+        f"{round_number} round(s)"
+    )
+    return candidates[survivors[0]], results
+
+
+def log_search_runs(mlflow_module: Any, results: pd.DataFrame) -> None:
+    """Log every evaluated configuration as a nested MLflow run."""
+    for record in results.to_dict("records"):
+        with mlflow_module.start_run(
+            run_name=f"round{record['round']}-candidate{record['candidate']}",
+            nested=True,
+        ):
+            mlflow_module.log_params(
+                {
+                    key: record[key]
+                    for key in ("hidden_dim", "hidden_layers", "lr", "epochs")
+                }
+            )
+            mlflow_module.log_metrics(
+                {"val_loss": record["val_loss"], "seconds": record["seconds"]}
+            )
+            mlflow_module.set_tags(
+                {"search_round": record["round"], "promoted": record["promoted"]}
+            )
+
+
+def main() -> None:
+    """Run the search, write its table, and train and save the winner."""
+    args = parse_args()
+    default_inputs: list[str] = []
+    default_outputs: list[str] = []
+    if args.inputs is None or args.outputs is None:
+        default_inputs, default_outputs = load_feature_roles(args.feature_spec)
+    input_columns = args.inputs if args.inputs is not None else default_inputs
+    output_columns = args.outputs if args.outputs is not None else default_outputs
+    features_path = args.features.expanduser().resolve()
+    outdir = args.outdir.expanduser().resolve()
+
+    sizes = [
+        *args.hidden_dims,
+        *args.hidden_layer_counts,
+        args.samples,
+        args.min_epochs,
+        args.epochs,
+        args.batch_size,
+        args.jobs,
+    ]
+    if min(sizes) <= 0:
+        raise ValueError(
+            "Hidden sizes, samples, epochs, batch size, and jobs must be positive"
+        )
+    if min(args.lrs) <= 0:
+        raise ValueError("Learning rates must be greater than zero")
+    if args.eta < 2:
+        raise ValueError("Halving rate must be at least 2")
+    # Without a halving round there is nothing to compare or record.
+    if args.min_epochs >= args.epochs:
+        raise ValueError(
+            "--min-epochs must be smaller than --epochs for any halving round to run"
+        )
+    candidates = search_candidates(args)
+    if len(candidates) < 2:
+        raise ValueError(
+            "The search needs at least two configurations; train a single one "
+            "with trainSurrogate.py"
+        )
+    convergence_controls(args)
+    if args.mlflow and not args.skip_model_registration:
+        if not args.registered_model_name.strip():
+            raise ValueError("Registered model name must not be empty")
+    frame, x, y = load_feature_arrays(features_path, input_columns, output_columns)
+
+    x_train, y_train, x_val, y_val, x_test, y_test, *_ = split_dataset(
+        x, y, seed=args.seed
+    )
+    x_train_n, x_val_n, *_ = normalize(x_train, x_val, x_test)
+    y_train_n, y_val_n, *_ = normalize(y_train, y_val, y_test)
+    winner, results = successive_halving(
+        candidates, (x_train_n, y_train_n, x_val_n, y_val_n), args
+    )
+    outdir.mkdir(parents=True, exist_ok=True)
+    results_path = outdir / SEARCH_RESULTS_NAME
+    results.to_csv(results_path, index=False)
+    print(f"Winning configuration: {json.dumps(winner)}")
+
+    # The winner is retrained as trainSurrogate.py would train it.
+    winner_args = argparse.Namespace(
+        **{**vars(args), **winner, "training_loop": "resident", "ensemble_size": 1}
+    )
+    torch.manual_seed(args.seed)
+    np.random.seed(args.seed)
+    train_arguments = {
+        "args": winner_args,
+        "frame": frame,
+        "x": x,
+        "y": y,
+        "input_columns": input_columns,
+        "output_columns": output_columns,
+        "features_path": features_path,
+        "outdir": outdir,
+    }
+    if not args.mlflow:
+        train_and_save(**train_arguments)
+        print(results_path)
+        return
+
+    try:
+        import mlflow
+    except ImportError as error:
+        raise RuntimeError(
+            "MLflow logging was requested but mlflow is not installed"
+        ) from error
+
+    if args.mlflow_tracking_uri:
+        mlflow.set_tracking_uri(args.mlflow_tracking_uri)
+    mlflow.set_experiment(args.mlflow_experiment)
+    with mlflow.start_run(run_name=args.mlflow_run_name):
+        mlflow.log_params(
+            {
+                "strategy": args.strategy,
+                "candidates": len(candidates),
+                "min_epochs": args.min_epochs,
+                "eta": args.eta,
+                "epochs": args.epochs,
+                "seed": args.seed,
+            }
+        )
+        log_search_runs(mlflow, results)
+        mlflow.log_artifact(results_path, artifact_path="search")
+        with mlflow.start_run(run_name="winner", nested=True) as active_run:
+            train_and_save(
+                **train_arguments,
+                mlflow_module=mlflow,
+                active_run=active_run,
+            )
+    print(results_path)
+
+
+if __name__ == "__main__":
+    main()
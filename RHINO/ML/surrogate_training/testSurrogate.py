@@ -13,7 +13,12 @@ import matplotlib.pyplot as plt
 import numpy as np
 import torch
 
-from trainSurrogate import SurrogateMLP, load_feature_arrays, sha256_file
+from trainSurrogate import (
+    SurrogateMLP,
+    ensemble_forward,
+    load_feature_arrays,
+    sha256_file,
+)
 
 
 BASE_DIR = Path(__file__).resolve().parent
@@ -40,7 +45,7 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--features",
         type=Path,
-        help="Optional replacement path for the exact CSV used during training.",
+        help="Optional replacement path for the exact table used during training.",
     )
     parser.add_argument(
         "--outdir",
@@ -146,7 +151,7 @@ def resolve_features_path(
     configured_path: str,
     override: Path | None,
 ) -> Path:
-    """Resolve the training CSV path, allowing an explicit moved-file override."""
+    """Resolve the training table path, allowing an explicit moved-file override."""
     path = override if override is not None else Path(configured_path)
     return path.expanduser().resolve()
 
@@ -177,7 +182,7 @@ def main() -> None:
     expected_digest = split_indices.get("features_sha256")
     if expected_digest and sha256_file(features_path) != expected_digest:
         raise ValueError(
-            "Feature CSV differs from the file used during training; refusing "
+            "Feature table differs from the file used during training; refusing "
             "to apply saved row indexes"
         )
 
@@ -189,7 +194,7 @@ def main() -> None:
     expected_rows = split_indices.get("row_count")
     if expected_rows is not None and len(frame) != expected_rows:
         raise ValueError(
-            f"Feature CSV has {len(frame)} rows; training metadata expects "
+            f"Feature table has {len(frame)} rows; training metadata expects "
             f"{expected_rows}"
         )
 
@@ -219,10 +224,17 @@ def main() -> None:
     model.load_state_dict(artifact["model_state_dict"])
     model.eval()
 
+    x_test_tensor = torch.tensor(x_test_n, dtype=torch.float32)
+    y_spread = None
     with torch.no_grad():
-        normalized_prediction = model(
-            torch.tensor(x_test_n, dtype=torch.float32)
-        ).numpy()
+        if "ensemble_state_dict" in artifact:
+            members = ensemble_forward(
+                model, artifact["ensemble_state_dict"], x_test_tensor
+            )
+            normalized_prediction = members.mean(dim=0).numpy()
+            y_spread = members.std(dim=0, unbiased=False).numpy() * y_std
+        else:
+            normalized_prediction = model(x_test_tensor).numpy()
     y_prediction = normalized_prediction * y_std + y_mean
     metrics = compute_metrics(y_test, y_prediction, output_columns)
 
@@ -243,6 +255,8 @@ def main() -> None:
         predictions[f"abs_error_{column}"] = np.abs(
             y_prediction[:, index] - y_test[:, index]
         )
+        if y_spread is not None:
+            predictions[f"std_{column}"] = y_spread[:, index]
     predictions.to_csv(outdir / "test_predictions.csv", index=False)
     save_parity_plots(y_test, y_prediction, output_columns, outdir)
 
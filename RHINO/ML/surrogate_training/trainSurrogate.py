@@ -1,12 +1,13 @@
 #!/usr/bin/env python
-"""Train and save a RHINO neural-network surrogate from a feature-layer CSV."""
+"""Train and save a RHINO neural-network surrogate from a feature-layer table."""
 
 from __future__ import annotations
 
 import argparse
-import copy
 import hashlib
 import json
+import math
+import time
 from pathlib import Path
 from typing import Any, Sequence
 
@@ -33,6 +34,11 @@ DEFAULT_FEATURE_SPEC = (
     / "feature_spec.json"
 )
 DEFAULT_OUTDIR = BASE_DIR / "artifacts"
+TRAINING_LOOPS = ("resident", "dataloader")
+LR_SCHEDULES = ("constant", "plateau", "cosine")
+PLATEAU_FACTOR = 0.5
+WARM_START_NORMALIZATIONS = ("refit", "reuse")
+ARROW_FEATURE_SUFFIXES = {".parquet", ".feather", ".arrow"}
 KNOWN_METADATA_COLUMNS = [
     "archive",
     "datasetid",
@@ -41,6 +47,8 @@ KNOWN_METADATA_COLUMNS = [
     "simulation_time",
     "simulation_datetime",
 ]
+# Columns that identify a run across rebuilds of the feature table.
+RUN_IDENTITY_COLUMNS = ["archive", "datasetid", "run_id"]
 
 
 class SurrogateMLP(nn.Module):
@@ -89,14 +97,103 @@ def load_feature_roles(spec_path: Path) -> tuple[list[str], list[str]]:
     return inputs, outputs
 
 
+def feature_display_specs(
+    spec_path: Path, columns: Sequence[str]
+) -> list[dict[str, str]]:
+    """Return the key and feature-spec display name of each model column.
+
+    Columns the specification does not declare are displayed by their key.
+    """
+    display_names: dict[str, str] = {}
+    if spec_path.is_file():
+        with spec_path.open(encoding="utf-8") as stream:
+            specification = json.load(stream)
+        for role in ("metadata", "inputs", "outputs"):
+            for entry in specification.get(role, []):
+                display_names[entry["key"]] = entry.get("display_name", entry["key"])
+    return [
+        {"key": column, "display_name": display_names.get(column, column)}
+        for column in columns
+    ]
+
+
+def read_arrow_feature_table(
+    features_path: Path,
+    required: Sequence[str],
+) -> tuple[pd.DataFrame, np.ndarray]:
+    """Read only the needed columns of a Parquet or Feather feature table.
+
+    Model columns are converted straight from Arrow into one float32 matrix;
+    the returned frame holds the known metadata columns and the model columns.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.feather as feather
+        import pyarrow.parquet as pq
+    except ImportError as error:
+        raise RuntimeError(
+            "Reading a Parquet/Feather feature table requires pyarrow"
+        ) from error
+
+    if features_path.suffix.lower() == ".parquet":
+        schema = pq.read_schema(features_path)
+    else:
+        with pa.memory_map(str(features_path)) as source:
+            schema = pa.ipc.open_file(source).schema
+    missing = [column for column in required if column not in schema.names]
+    if missing:
+        raise ValueError(
+            "Feature table is missing required column(s): " + ", ".join(missing)
+        )
+    non_numeric = [
+        column
+        for column in required
+        if not (
+            pa.types.is_floating(schema.field(column).type)
+            or pa.types.is_integer(schema.field(column).type)
+        )
+    ]
+    if non_numeric:
+        raise ValueError(
+            "Model input and output columns must be numeric: "
+            + ", ".join(non_numeric)
+        )
+
+    columns = [
+        *(
+            column
+            for column in KNOWN_METADATA_COLUMNS
+            if column in schema.names and column not in required
+        ),
+        *required,
+    ]
+    if features_path.suffix.lower() == ".parquet":
+        table = pq.read_table(features_path, columns=columns)
+    else:
+        table = feather.read_table(features_path, columns=columns, memory_map=True)
+
+    matrix = np.empty((table.num_rows, len(required)), dtype=np.float32)
+    for position, column in enumerate(required):
+        matrix[:, position] = (
+            table.column(column)
+            .cast(pa.float32())
+            .to_numpy(zero_copy_only=False)
+        )
+    return table.to_pandas(), matrix
+
+
 def load_feature_arrays(
     features_path: Path,
     input_columns: Sequence[str],
     output_columns: Sequence[str],
 ) -> tuple[pd.DataFrame, np.ndarray, np.ndarray]:
-    """Load the CSV and return validated finite input and output arrays."""
+    """Load the feature table and return validated finite model arrays.
+
+    CSV files are parsed with pandas. Parquet and Feather files written by the
+    feature layer are read column by column into float32 without a text pass.
+    """
     if not features_path.is_file():
-        raise FileNotFoundError(f"Feature CSV does not exist: {features_path}")
+        raise FileNotFoundError(f"Feature table does not exist: {features_path}")
     if len(set(input_columns)) != len(input_columns):
         raise ValueError("Input column names must be unique")
     if len(set(output_columns)) != len(output_columns):
@@ -105,22 +202,31 @@ def load_feature_arrays(
     if overlap:
         raise ValueError(f"Columns cannot be both inputs and outputs: {overlap}")
 
-    frame = pd.read_csv(features_path)
     required = [*input_columns, *output_columns]
-    missing = [column for column in required if column not in frame.columns]
-    if missing:
-        raise ValueError(
-            "Feature CSV is missing required column(s): " + ", ".join(missing)
-        )
-    if frame.empty:
-        raise ValueError("Feature CSV contains no rows")
+    if features_path.suffix.lower() in ARROW_FEATURE_SUFFIXES:
+        frame, matrix = read_arrow_feature_table(features_path, required)
+        if frame.empty:
+            raise ValueError("Feature table contains no rows")
+        invalid = ~np.isfinite(matrix)
+    else:
+        frame = pd.read_csv(features_path)
+        missing = [column for column in required if column not in frame.columns]
+        if missing:
+            raise ValueError(
+                "Feature CSV is missing required column(s): " + ", ".join(missing)
+            )
+        if frame.empty:
+            raise ValueError("Feature CSV contains no rows")
 
-    try:
-        values = frame[required].apply(pd.to_numeric, errors="raise")
-    except (TypeError, ValueError) as error:
-        raise ValueError("Model input and output columns must be numeric") from error
+        try:
+            values = frame[required].apply(pd.to_numeric, errors="raise")
+        except (TypeError, ValueError) as error:
+            raise ValueError(
+                "Model input and output columns must be numeric"
+            ) from error
+        invalid = ~np.isfinite(values.to_numpy(dtype=np.float64))
+        matrix = values.to_numpy(dtype=np.float32)
 
-    invalid = ~np.isfinite(values.to_numpy(dtype=np.float64))
     if invalid.any():
         bad_columns = [
             column
@@ -129,12 +235,11 @@ def load_feature_arrays(
         ]
         bad_rows = int(invalid.any(axis=1).sum())
         raise ValueError(
-            f"Feature CSV has missing or non-finite model values in {bad_rows} "
+            f"Feature table has missing or non-finite model values in {bad_rows} "
             f"row(s), in column(s): {', '.join(bad_columns)}"
         )
 
     input_count = len(input_columns)
-    matrix = values.to_numpy(dtype=np.float32)
     return frame, matrix[:, :input_count], matrix[:, input_count:]
 
 
@@ -251,16 +356,622 @@ def run_epoch(
     return total_loss / total_samples
 
 
+def resident_permutation(row_count: int) -> torch.Tensor:
+    """Return a shuffled row order drawn as a shuffling `DataLoader` draws it.
+
+    The loader takes a base seed and then a sampler seed from the global
+    generator, so with the same ``torch.manual_seed`` the resident loop visits
+    the same batches as the `DataLoader` loop.
+    """
+    torch.empty((), dtype=torch.int64).random_()
+    seed = int(torch.empty((), dtype=torch.int64).random_().item())
+    generator = torch.Generator()
+    generator.manual_seed(seed)
+    return torch.randperm(row_count, generator=generator)
+
+
+def run_resident_epoch(
+    model: nn.Module,
+    x: torch.Tensor,
+    y: torch.Tensor,
+    criterion: nn.Module,
+    optimizer: torch.optim.Optimizer | None = None,
+    batch_size: int = 64,
+) -> float:
+    """Run one epoch over tensors already resident on the model's device.
+
+    Training epochs shuffle with an index permutation instead of a
+    `DataLoader`; the loss is accumulated on the device and read once.
+    """
+    is_training = optimizer is not None
+    model.train(is_training)
+    if is_training:
+        order = resident_permutation(x.shape[0]).to(x.device)
+        batches = [
+            (x.index_select(0, index), y.index_select(0, index))
+            for index in order.split(batch_size)
+        ]
+    else:
+        # Keep the global generator in step with a non-shuffling DataLoader.
+        torch.empty((), dtype=torch.int64).random_()
+        batches = list(zip(x.split(batch_size), y.split(batch_size)))
+
+    total_loss = torch.zeros((), dtype=torch.float64, device=x.device)
+    with torch.set_grad_enabled(is_training):
+        for xb, yb in batches:
+            if optimizer is not None:
+                optimizer.zero_grad()
+            loss = criterion(model(xb), yb)
+            if optimizer is not None:
+                loss.backward()
+                optimizer.step()
+            total_loss += loss.detach().double() * xb.shape[0]
+
+    return total_loss.item() / x.shape[0]
+
+
+class TrainingController:
+    """Step the learning-rate schedule and decide when training should stop.
+
+    ``plateau`` halves the learning rate after `lr_patience` epochs without a
+    validation improvement; ``cosine`` anneals it to zero over `epochs`.
+    Training stops early after `patience` epochs without an improvement larger
+    than `min_delta`, or once `time_budget` seconds have elapsed.
+    """
+
+    def __init__(
+        self,
+        optimizer: torch.optim.Optimizer,
+        epochs: int,
+        lr_schedule: str = "constant",
+        lr_patience: int = 10,
+        patience: int | None = None,
+        min_delta: float = 0.0,
+        time_budget: float | None = None,
+    ) -> None:
+        if lr_schedule not in LR_SCHEDULES:
+            raise ValueError(
+                f"Learning-rate schedule must be one of: {', '.join(LR_SCHEDULES)}"
+            )
+        self.optimizer = optimizer
+        self.epochs = epochs
+        self.patience = patience
+        self.min_delta = min_delta
+        self.time_budget = time_budget
+        self.scheduler: Any = None
+        if lr_schedule == "plateau":
+            self.scheduler = torch.optim.lr_scheduler.ReduceLROnPlateau(
+                optimizer, factor=PLATEAU_FACTOR, patience=lr_patience
+            )
+        elif lr_schedule == "cosine":
+            self.scheduler = torch.optim.lr_scheduler.CosineAnnealingLR(
+                optimizer, T_max=epochs
+            )
+        self.started = time.perf_counter()
+        self.best_loss = math.inf
+        self.best_epoch = 0
+        self.stopped_epoch = 0
+        self.stop_reason = "completed"
+
+    @property
+    def lr(self) -> float:
+        """Return the learning rate of the next epoch."""
+        return float(self.optimizer.param_groups[0]["lr"])
+
+    def step(self, epoch: int, val_loss: float) -> bool:
+        """Record one epoch's validation loss and return whether to stop."""
+        self.stopped_epoch = epoch
+        if val_loss < self.best_loss - self.min_delta:
+            self.best_loss = val_loss
+            self.best_epoch = epoch
+        if isinstance(self.scheduler, torch.optim.lr_scheduler.ReduceLROnPlateau):
+            self.scheduler.step(val_loss)
+        elif self.scheduler is not None:
+            self.scheduler.step()
+
+        if epoch >= self.epochs:
+            return True
+        if self.patience is not None and epoch - self.best_epoch >= self.patience:
+            self.stop_reason = "early_stopping"
+            return True
+        if (
+            self.time_budget is not None
+            and time.perf_counter() - self.started >= self.time_budget
+        ):
+            self.stop_reason = "time_budget"
+            return True
+        return False
+
+    def summary(self) -> dict[str, Any]:
+        """Return the stopping epoch, reason, and elapsed training time."""
+        return {
+            "stopped_epoch": self.stopped_epoch,
+            "best_epoch": self.best_epoch,
+            "stop_reason": self.stop_reason,
+            "training_seconds": time.perf_counter() - self.started,
+        }
+
+
+def fit_model(
+    model: nn.Module,
+    x_train: np.ndarray,
+    y_train: np.ndarray,
+    x_val: np.ndarray,
+    y_val: np.ndarray,
+    *,
+    epochs: int,
+    batch_size: int,
+    lr: float,
+    device: str | torch.device = "cpu",
+    training_loop: str = "resident",
+    mlflow_module: Any | None = None,
+    log_every: int | None = 20,
+    **controls: Any,
+) -> tuple[float, dict[str, list[float]], dict[str, Any]]:
+    """Train on normalized splits and load the best validation state.
+
+    The ``resident`` loop keeps both splits on the device as tensors; the
+    ``dataloader`` loop batches through `DataLoader`. The best weights are
+    copied into buffers allocated once, rather than deep-copied per
+    improvement. `controls` are passed to `TrainingController`. Returns the
+    best validation loss, the loss history, and the controller summary.
+    """
+    if training_loop not in TRAINING_LOOPS:
+        raise ValueError(f"Training loop must be one of: {', '.join(TRAINING_LOOPS)}")
+
+    if training_loop == "resident":
+        train_x = torch.as_tensor(x_train, dtype=torch.float32, device=device)
+        train_y = torch.as_tensor(y_train, dtype=torch.float32, device=device)
+        val_x = torch.as_tensor(x_val, dtype=torch.float32, device=device)
+        val_y = torch.as_tensor(y_val, dtype=torch.float32, device=device)
+    else:
+        train_loader = make_loader(x_train, y_train, batch_size, shuffle=True)
+        val_loader = make_loader(x_val, y_val, batch_size)
+
+    criterion = nn.MSELoss()
+    optimizer = torch.optim.Adam(model.parameters(), lr=lr)
+    controller = TrainingController(optimizer, epochs, **controls)
+    best_val_loss = float("inf")
+    best_state = {
+        name: tensor.detach().clone() for name, tensor in model.state_dict().items()
+    }
+    history: dict[str, list[float]] = {"train_loss": [], "val_loss": [], "lr": []}
+
+    for epoch in range(1, epochs + 1):
+        history["lr"].append(controller.lr)
+        if training_loop == "resident":
+            train_loss = run_resident_epoch(
+                model, train_x, train_y, criterion, optimizer, batch_size
+            )
+            val_loss = run_resident_epoch(
+                model, val_x, val_y, criterion, batch_size=batch_size
+            )
+        else:
+            train_loss = run_epoch(model, train_loader, criterion, optimizer, device)
+            val_loss = run_epoch(model, val_loader, criterion, device=device)
+        history["train_loss"].append(train_loss)
+        history["val_loss"].append(val_loss)
+        if mlflow_module is not None:
+            mlflow_module.log_metrics(
+                {"train_loss": train_loss, "val_loss": val_loss},
+                step=epoch,
+            )
+
+        if val_loss < best_val_loss:
+            best_val_loss = val_loss
+            with torch.no_grad():
+                for name, tensor in model.state_dict().items():
+                    best_state[name].copy_(tensor)
+        if log_every and epoch % log_every == 0:
+            print(
+                f"Epoch {epoch:4d} | train_loss={train_loss:.6e} | "
+                f"val_loss={val_loss:.6e}"
+            )
+        if controller.step(epoch, val_loss):
+            break
+
+    model.load_state_dict(best_state)
+    return best_val_loss, history, controller.summary()
+
+
+def stack_ensemble(models: Sequence[nn.Module]) -> dict[str, torch.Tensor]:
+    """Stack the parameters of identically shaped models along a new first axis."""
+    member_params = [dict(model.named_parameters()) for model in models]
+    return {
+        name: torch.stack([params[name].detach() for params in member_params])
+        for name in member_params[0]
+    }
+
+
+def ensemble_forward(
+    model: nn.Module, ensemble_state: dict[str, torch.Tensor], x: torch.Tensor
+) -> torch.Tensor:
+    """Evaluate every ensemble member in one vectorized call.
+
+    `model` supplies only the architecture. `x` is either one ``(rows,
+    inputs)`` batch shared by all members or a ``(members, rows, inputs)``
+    stack; the result has shape ``(members, rows, outputs)``.
+    """
+
+    def member(params: dict[str, torch.Tensor], inputs: torch.Tensor) -> torch.Tensor:
+        return torch.func.functional_call(model, params, (inputs,))
+
+    return torch.func.vmap(member, in_dims=(0, 0 if x.dim() == 3 else None))(
+        ensemble_state, x
+    )
+
+
+def fit_ensemble(
+    models: Sequence[nn.Module],
+    x_train: np.ndarray,
+    y_train: np.ndarray,
+    x_val: np.ndarray,
+    y_val: np.ndarray,
+    *,
+    epochs: int,
+    batch_size: int,
+    lr: float,
+    device: str | torch.device = "cpu",
+    mlflow_module: Any | None = None,
+    log_every: int | None = 20,
+    **controls: Any,
+) -> tuple[float, dict[str, list[float]], dict[str, torch.Tensor], dict[str, Any]]:
+    """Train independently initialized models together as one stacked ensemble.
+
+    Member parameters are stacked and trained with one vectorized forward and
+    backward pass per batch; each member draws its own shuffle and keeps its
+    own best validation state. Adam updates elementwise, so every member
+    trains as it would alone. `controls` are passed to `TrainingController`,
+    which watches the validation loss of the ensemble mean. Returns that loss
+    for the best states, the loss history, the stacked best states, and the
+    controller summary.
+    """
+    model = models[0]
+    train_x = torch.as_tensor(x_train, dtype=torch.float32, device=device)
+    train_y = torch.as_tensor(y_train, dtype=torch.float32, device=device)
+    val_x = torch.as_tensor(x_val, dtype=torch.float32, device=device)
+    val_y = torch.as_tensor(y_val, dtype=torch.float32, device=device)
+    params = {
+        name: tensor.to(device).requires_grad_()
+        for name, tensor in stack_ensemble(models).items()
+    }
+    members = len(models)
+    optimizer = torch.optim.Adam(params.values(), lr=lr)
+    controller = TrainingController(optimizer, epochs, **controls)
+    best_state = {name: tensor.detach().clone() for name, tensor in params.items()}
+    best_losses = torch.full((members,), float("inf"), device=device)
+    history: dict[str, list[float]] = {
+        "train_loss": [],
+        "val_loss": [],
+        "ensemble_val_loss": [],
+        "lr": [],
+    }
+
+    for epoch in range(1, epochs + 1):
+        history["lr"].append(controller.lr)
+        model.train()
+        order = torch.stack(
+            [torch.randperm(train_x.shape[0], device=device) for _ in range(members)]
+        )
+        total_loss = torch.zeros(members, dtype=torch.float64, device=device)
+        for index in order.split(batch_size, dim=1):
+            optimizer.zero_grad()
+            error = ensemble_forward(model, params, train_x[index]) - train_y[index]
+            losses = error.pow(2).mean(dim=(1, 2))
+            losses.sum().backward()
+            optimizer.step()
+            total_loss += losses.detach().double() * index.shape[1]
+        train_losses = total_loss / train_x.shape[0]
+
+        model.eval()
+        with torch.no_grad():
+            prediction = ensemble_forward(model, params, val_x)
+            val_losses = (prediction - val_y).pow(2).mean(dim=(1, 2))
+            ensemble_val_loss = (prediction.mean(dim=0) - val_y).pow(2).mean()
+            improved = val_losses < best_losses
+            best_losses = torch.where(improved, val_losses, best_losses)
+            for name, tensor in params.items():
+                mask = improved.view(-1, *([1] * (tensor.dim() - 1)))
+                best_state[name].copy_(torch.where(mask, tensor, best_state[name]))
+
+        train_loss = train_losses.mean().item()
+        val_loss = val_losses.mean().item()
+        history["train_loss"].append(train_loss)
+        history["val_loss"].append(val_loss)
+        history["ensemble_val_loss"].append(ensemble_val_loss.item())
+        if mlflow_module is not None:
+            mlflow_module.log_metrics(
+                {
+                    "train_loss": train_loss,
+                    "val_loss": val_loss,
+                    "ensemble_val_loss": history["ensemble_val_loss"][-1],
+                },
+                step=epoch,
+            )
+        if log_every and epoch % log_every == 0:
+            print(
+                f"Epoch {epoch:4d} | train_loss={train_loss:.6e} | "
+                f"val_loss={val_loss:.6e} | "
+                f"ensemble_val_loss={history['ensemble_val_loss'][-1]:.6e}"
+            )
+        if controller.step(epoch, history["ensemble_val_loss"][-1]):
+            break
+
+    model.eval()
+    with torch.no_grad():
+        prediction = ensemble_forward(model, best_state, val_x).mean(dim=0)
+        best_val_loss = (prediction - val_y).pow(2).mean().item()
+    return best_val_loss, history, best_state, controller.summary()
+
+
+def fit_surrogate(
+    models: Sequence[nn.Module],
+    x_train: np.ndarray,
+    y_train: np.ndarray,
+    x_val: np.ndarray,
+    y_val: np.ndarray,
+    *,
+    args: argparse.Namespace,
+    epochs: int,
+    device: str | torch.device,
+    mlflow_module: Any | None = None,
+) -> tuple[
+    float, dict[str, list[float]], dict[str, torch.Tensor] | None, dict[str, Any]
+]:
+    """Train one network, or several as an ensemble, with the CLI options.
+
+    The first model holds the best weights afterwards (member 0 of an
+    ensemble). Returns the best validation loss, the loss history, the
+    stacked ensemble states on the CPU (None for one network), and the
+    controller summary.
+    """
+    if len(models) == 1:
+        best_val_loss, history, stopping = fit_model(
+            models[0],
+            x_train,
+            y_train,
+            x_val,
+            y_val,
+            epochs=epochs,
+            batch_size=args.batch_size,
+            lr=args.lr,
+            device=device,
+            training_loop=args.training_loop,
+            mlflow_module=mlflow_module,
+            **convergence_controls(args),
+        )
+        return best_val_loss, history, None, stopping
+
+    best_val_loss, history, ensemble_state, stopping = fit_ensemble(
+        models,
+        x_train,
+        y_train,
+        x_val,
+        y_val,
+        epochs=epochs,
+        batch_size=args.batch_size,
+        lr=args.lr,
+        device=device,
+        mlflow_module=mlflow_module,
+        **convergence_controls(args),
+    )
+    ensemble_state = {name: tensor.cpu() for name, tensor in ensemble_state.items()}
+    models[0].load_state_dict(
+        {name: tensor[0] for name, tensor in ensemble_state.items()}
+    )
+    return best_val_loss, history, ensemble_state, stopping
+
+
+def normalized_loss(
+    model: nn.Module,
+    ensemble_state: dict[str, torch.Tensor] | None,
+    x: np.ndarray,
+    y: np.ndarray,
+) -> float:
+    """Return the normalized MSE of one network or of the ensemble mean."""
+    device = next(model.parameters()).device
+    x_tensor = torch.as_tensor(x, dtype=torch.float32, device=device)
+    y_tensor = torch.as_tensor(y, dtype=torch.float32, device=device)
+    model.eval()
+    with torch.no_grad():
+        if ensemble_state is None:
+            prediction = model(x_tensor)
+        else:
+            state = {name: tensor.to(device) for name, tensor in ensemble_state.items()}
+            prediction = ensemble_forward(model, state, x_tensor).mean(dim=0)
+    return float((prediction - y_tensor).pow(2).mean())
+
+
+def load_warm_start(
+    path: Path,
+    input_columns: Sequence[str],
+    output_columns: Sequence[str],
+) -> tuple[dict[str, Any], dict[str, Any]]:
+    """Load a previous artifact and the split record saved beside it."""
+    artifact = torch.load(path, map_location="cpu")
+    if "input_columns" not in artifact:
+        raise ValueError(f"{path} is not an artifact written by trainSurrogate.py")
+    if artifact["input_columns"] != list(input_columns):
+        raise ValueError(
+            f"Warm-start inputs {artifact['input_columns']} differ from "
+            f"{list(input_columns)}"
+        )
+    if artifact["output_columns"] != list(output_columns):
+        raise ValueError(
+            f"Warm-start outputs {artifact['output_columns']} differ from "
+            f"{list(output_columns)}"
+        )
+    split_path = path.parent / "split_indices.json"
+    if not split_path.is_file():
+        raise ValueError(
+            f"Warm start needs {split_path} to keep earlier rows in their split"
+        )
+    with split_path.open(encoding="utf-8") as stream:
+        previous_split = json.load(stream)
+    return artifact, previous_split
+
+
+def run_identities(frame: pd.DataFrame) -> list[tuple[str, ...]] | None:
+    """Return the (archive, datasetid, run_id) of every feature row.
+
+    Returns None when the table lacks any of the identity columns.
+    """
+    if not set(RUN_IDENTITY_COLUMNS) <= set(frame.columns):
+        return None
+    return list(
+        frame[RUN_IDENTITY_COLUMNS]
+        .astype(str)
+        .itertuples(index=False, name=None)
+    )
+
+
+def extend_split(
+    previous_split: dict[str, Any],
+    identities: Sequence[tuple[str, ...]] | None,
+    seed: int,
+    train_frac: float = 0.80,
+    val_frac: float = 0.15,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Keep earlier runs in their split and divide the new runs.
+
+    Runs are matched by identity, so the rebuilt table may order its rows
+    differently. Runs the previous model validated or tested on never become
+    training rows, and every run it saw must still be in the table.
+    """
+    previous_identities = previous_split.get("run_identities")
+    if previous_identities is None:
+        raise ValueError(
+            "The warm-start split_indices.json records no run identities; "
+            "train once without --warm-start"
+        )
+    if identities is None:
+        raise ValueError(
+            "Warm start needs the feature table's run identity column(s): "
+            + ", ".join(RUN_IDENTITY_COLUMNS)
+        )
+    row_of = {identity: row for row, identity in enumerate(identities)}
+    if len(row_of) != len(identities):
+        raise ValueError("Feature table has duplicate run identities")
+    previous_identities = [tuple(identity) for identity in previous_identities]
+    missing = [identity for identity in previous_identities if identity not in row_of]
+    if missing:
+        raise ValueError(
+            f"{len(missing)} run(s) the warm-start model was trained on are not "
+            f"in the feature table, e.g. {missing[0]}"
+        )
+
+    previous_set = set(previous_identities)
+    new_rows = np.array(
+        [
+            row
+            for row, identity in enumerate(identities)
+            if identity not in previous_set
+        ],
+        dtype=int,
+    )
+    np.random.default_rng(seed).shuffle(new_rows)
+    n_train = int(round(train_frac * len(new_rows)))
+    n_val = int(round(val_frac * len(new_rows)))
+    appended = {
+        "train_idx": new_rows[:n_train],
+        "val_idx": new_rows[n_train : n_train + n_val],
+        "test_idx": new_rows[n_train + n_val :],
+    }
+    train_idx, val_idx, test_idx = (
+        np.concatenate(
+            [
+                np.array(
+                    [
+                        row_of[previous_identities[previous_row]]
+                        for previous_row in previous_split[key]
+                    ],
+                    dtype=int,
+                ),
+                rows,
+            ]
+        )
+        for key, rows in appended.items()
+    )
+    return train_idx, val_idx, test_idx
+
+
+def rebase_normalization(
+    model: SurrogateMLP,
+    old_statistics: Sequence[np.ndarray],
+    new_statistics: Sequence[np.ndarray],
+) -> None:
+    """Adjust the end layers so the model keeps its physical-unit mapping.
+
+    Both arguments are ``(x_mean, x_std, y_mean, y_std)``. A network trained
+    on the old normalization gives the same physical predictions when fed
+    inputs normalized with the new statistics and unscaled with them.
+    """
+    x_mean0, x_std0, y_mean0, y_std0 = (
+        torch.as_tensor(value, dtype=torch.float64).reshape(-1)
+        for value in old_statistics
+    )
+    x_mean1, x_std1, y_mean1, y_std1 = (
+        torch.as_tensor(value, dtype=torch.float64).reshape(-1)
+        for value in new_statistics
+    )
+    first, last = model.net[0], model.net[-1]
+    with torch.no_grad():
+        weight = first.weight.double()
+        first.bias.copy_(first.bias.double() + weight @ ((x_mean1 - x_mean0) / x_std0))
+        first.weight.copy_(weight * (x_std1 / x_std0))
+        last.weight.copy_(last.weight.double() * (y_std0 / y_std1).unsqueeze(1))
+        last.bias.copy_((last.bias.double() * y_std0 + y_mean0 - y_mean1) / y_std1)
+
+
+def warm_start_models(
+    artifact: dict[str, Any],
+    statistics: Sequence[np.ndarray] | None,
+    device: str | torch.device,
+) -> list[SurrogateMLP]:
+    """Rebuild the network or ensemble members stored in `artifact`.
+
+    With new normalization `statistics`, every member is rebased onto them.
+    """
+    config = artifact["model_config"]
+    ensemble_state = artifact.get("ensemble_state_dict")
+    if ensemble_state is None:
+        states = [artifact["model_state_dict"]]
+    else:
+        states = [
+            {name: tensor[index] for name, tensor in ensemble_state.items()}
+            for index in range(artifact["ensemble_size"])
+        ]
+    old_statistics = [
+        artifact[name].numpy() for name in ("x_mean", "x_std", "y_mean", "y_std")
+    ]
+    models = []
+    for state in states:
+        model = SurrogateMLP(
+            input_dim=config["input_dim"],
+            output_dim=config["output_dim"],
+            hidden_dim=config["hidden_dim"],
+            num_hidden_layers=config["num_hidden_layers"],
+        )
+        model.load_state_dict(state)
+        if statistics is not None:
+            rebase_normalization(model, old_statistics, statistics)
+        models.append(model.to(device))
+    return models
+
+
 def parse_args() -> argparse.Namespace:
     """Parse surrogate-training command-line options."""
     parser = argparse.ArgumentParser(
-        description="Train RHINO surrogate model from feature-layer CSV."
+        description="Train RHINO surrogate model from a feature-layer table."
     )
     parser.add_argument(
         "--features",
         type=Path,
         default=DEFAULT_FEATURES,
-        help=f"Feature-layer CSV (default: {DEFAULT_FEATURES}).",
+        help=(
+            "Feature-layer table: CSV, Parquet, or Feather "
+            f"(default: {DEFAULT_FEATURES})."
+        ),
     )
     parser.add_argument(
         "--feature-spec",
@@ -293,6 +1004,117 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--hidden-layers", type=int, default=3)
     parser.add_argument("--lr", type=float, default=1e-4)
     parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--ensemble-size",
+        type=int,
+        default=1,
+        help=(
+            "Train this many independently initialized networks together with "
+            "torch.func and serve their mean and standard deviation."
+        ),
+    )
+    parser.add_argument(
+        "--training-loop",
+        choices=TRAINING_LOOPS,
+        default="resident",
+        help=(
+            "Keep normalized tensors resident on the device (default), or batch "
+            "through a PyTorch DataLoader. Both visit the same batches."
+        ),
+    )
+    parser.add_argument(
+        "--warm-start",
+        type=Path,
+        help=(
+            "Fine-tune this rhino_surrogate.pt on the enlarged feature table "
+            "instead of training from random weights. Its architecture and "
+            "ensemble size replace the corresponding options."
+        ),
+    )
+    parser.add_argument(
+        "--warm-start-normalization",
+        choices=WARM_START_NORMALIZATIONS,
+        default="refit",
+        help=(
+            "Refit the normalization statistics on the new training split and "
+            "rebase the loaded network onto them (default), or reuse the "
+            "previous statistics unchanged."
+        ),
+    )
+    parser.add_argument(
+        "--fine-tune-epochs",
+        type=int,
+        help="Epoch budget of a warm start (default: a quarter of --epochs).",
+    )
+    parser.add_argument(
+        "--compare-full-retrain",
+        action="store_true",
+        help=(
+            "After a warm start, also train from random weights for --epochs "
+            "and report the compute saved and the test-loss ratio."
+        ),
+    )
+    add_convergence_arguments(parser)
+    add_mlflow_arguments(parser)
+    return parser.parse_args()
+
+
+def add_convergence_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the early-stopping, learning-rate schedule, and budget options."""
+    parser.add_argument(
+        "--patience",
+        type=int,
+        help="Stop after this many epochs without a validation improvement.",
+    )
+    parser.add_argument(
+        "--min-delta",
+        type=float,
+        default=0.0,
+        help="Smallest validation-loss decrease counted as an improvement.",
+    )
+    parser.add_argument(
+        "--lr-schedule",
+        choices=LR_SCHEDULES,
+        default="constant",
+        help=(
+            "Keep the learning rate fixed, halve it when validation loss "
+            "plateaus, or anneal it with a cosine schedule."
+        ),
+    )
+    parser.add_argument(
+        "--lr-patience",
+        type=int,
+        default=10,
+        help="Epochs without improvement before a plateau schedule halves the rate.",
+    )
+    parser.add_argument(
+        "--time-budget",
+        type=float,
+        help="Stop after the first epoch that ends past this many seconds.",
+    )
+
+
+def convergence_controls(args: argparse.Namespace) -> dict[str, Any]:
+    """Validate and return the `TrainingController` command-line options."""
+    if args.patience is not None and args.patience <= 0:
+        raise ValueError("Patience must be positive")
+    if args.lr_patience < 0 or args.min_delta < 0:
+        raise ValueError(
+            "Learning-rate patience and minimum delta must not be negative"
+        )
+    if args.time_budget is not None and args.time_budget <= 0:
+        raise ValueError("Time budget must be greater than zero")
+    return {
+        "lr_schedule": args.lr_schedule,
+        "lr_patience": args.lr_patience,
+        "patience": args.patience,
+        "min_delta": args.min_delta,
+        "time_budget": args.time_budget,
+    }
+
+
+def add_mlflow_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the MLflow tracking and registry options to a parser."""
     parser.add_argument(
         "--mlflow",
         action="store_true",
@@ -321,7 +1143,6 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Log the MLflow model without creating a registry version.",
     )
-    return parser.parse_args()
 
 
 def train_and_save(
@@ -336,32 +1157,64 @@ def train_and_save(
     outdir: Path,
     mlflow_module: Any | None = None,
     active_run: Any | None = None,
+    warm_start: dict[str, Any] | None = None,
 ) -> None:
-    """Train, persist, and optionally log one surrogate experiment."""
-    (
-        x_train,
-        y_train,
-        x_val,
-        y_val,
-        x_test,
-        y_test,
-        train_idx,
-        val_idx,
-        test_idx,
-    ) = split_dataset(x, y, seed=args.seed)
+    """Train, persist, and optionally log one surrogate experiment.
 
-    x_train_n, x_val_n, _, x_mean, x_std = normalize(x_train, x_val, x_test)
-    y_train_n, y_val_n, _, y_mean, y_std = normalize(y_train, y_val, y_test)
-    train_loader = make_loader(x_train_n, y_train_n, args.batch_size, shuffle=True)
-    val_loader = make_loader(x_val_n, y_val_n, args.batch_size)
+    `warm_start`, built by `main`, fine-tunes a previous artifact instead of
+    training from random weights.
+    """
+    identities = run_identities(frame)
+    if warm_start is None:
+        *_, train_idx, val_idx, test_idx = split_dataset(x, y, seed=args.seed)
+    else:
+        train_idx, val_idx, test_idx = extend_split(
+            warm_start["split"], identities, args.seed
+        )
+    x_train, x_val, x_test = x[train_idx], x[val_idx], x[test_idx]
+    y_train, y_val, y_test = y[train_idx], y[val_idx], y[test_idx]
+
+    x_train_n, x_val_n, x_test_n, x_mean, x_std = normalize(x_train, x_val, x_test)
+    y_train_n, y_val_n, y_test_n, y_mean, y_std = normalize(y_train, y_val, y_test)
+    if warm_start is not None and warm_start["normalization"] == "reuse":
+        x_mean, x_std, y_mean, y_std = (
+            warm_start["artifact"][name].numpy().astype(np.float64)
+            for name in ("x_mean", "x_std", "y_mean", "y_std")
+        )
+        x_train_n, x_val_n, x_test_n = (
+            (part - x_mean) / x_std for part in (x_train, x_val, x_test)
+        )
+        y_train_n, y_val_n, y_test_n = (
+            (part - y_mean) / y_std for part in (y_train, y_val, y_test)
+        )
 
     device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-    model = SurrogateMLP(
-        input_dim=x.shape[1],
-        output_dim=y.shape[1],
-        hidden_dim=args.hidden_dim,
-        num_hidden_layers=args.hidden_layers,
-    ).to(device)
+    ensemble_size = args.ensemble_size
+
+    def fresh_models() -> list[SurrogateMLP]:
+        return [
+            SurrogateMLP(
+                input_dim=x.shape[1],
+                output_dim=y.shape[1],
+                hidden_dim=args.hidden_dim,
+                num_hidden_layers=args.hidden_layers,
+            ).to(device)
+            for _ in range(ensemble_size)
+        ]
+
+    if warm_start is None:
+        models = fresh_models()
+    else:
+        models = warm_start_models(
+            warm_start["artifact"],
+            (
+                None
+                if warm_start["normalization"] == "reuse"
+                else (x_mean, x_std, y_mean, y_std)
+            ),
+            device,
+        )
+    model = models[0]
 
     metadata_columns = [
         column for column in KNOWN_METADATA_COLUMNS if column in frame.columns
@@ -376,6 +1229,9 @@ def train_and_save(
         "features_file": str(features_path),
         "features_sha256": features_digest,
         "row_count": len(frame),
+        "run_identities": (
+            None if identities is None else [list(run) for run in identities]
+        ),
         "feature_spec": str(feature_spec_path) if feature_spec_exists else None,
         "feature_spec_sha256": (
             sha256_file(feature_spec_path) if feature_spec_exists else None
@@ -396,6 +1252,18 @@ def train_and_save(
                 "hidden_layers": args.hidden_layers,
                 "learning_rate": args.lr,
                 "seed": args.seed,
+                "ensemble_size": ensemble_size,
+                "training_loop": args.training_loop,
+                **convergence_controls(args),
+                **(
+                    {
+                        "warm_start": str(warm_start["path"]),
+                        "warm_start_normalization": warm_start["normalization"],
+                        "fine_tune_epochs": warm_start["epochs"],
+                    }
+                    if warm_start is not None
+                    else {}
+                ),
                 "train_rows": len(train_idx),
                 "validation_rows": len(val_idx),
                 "test_rows": len(test_idx),
@@ -412,33 +1280,72 @@ def train_and_save(
             tags["feature_spec_sha256"] = split_indices["feature_spec_sha256"]
         mlflow_module.set_tags(tags)
 
-    criterion = nn.MSELoss()
-    optimizer = torch.optim.Adam(model.parameters(), lr=args.lr)
-    best_val_loss = float("inf")
-    best_state = copy.deepcopy(model.state_dict())
-    history = {"train_loss": [], "val_loss": []}
+    warm_start_report = None
+    if warm_start is not None:
+        initial_state = stack_ensemble(models) if ensemble_size > 1 else None
+        warm_start_report = {
+            "source": str(warm_start["path"]),
+            "source_sha256": sha256_file(warm_start["path"]),
+            "previous_rows": warm_start["split"]["row_count"],
+            "rows": len(frame),
+            "normalization": warm_start["normalization"],
+            "initial_val_loss": normalized_loss(
+                model, initial_state, x_val_n, y_val_n
+            ),
+        }
 
-    for epoch in range(1, args.epochs + 1):
-        train_loss = run_epoch(model, train_loader, criterion, optimizer, device)
-        val_loss = run_epoch(model, val_loader, criterion, device=device)
-        history["train_loss"].append(train_loss)
-        history["val_loss"].append(val_loss)
-        if mlflow_module is not None:
-            mlflow_module.log_metrics(
-                {"train_loss": train_loss, "val_loss": val_loss},
-                step=epoch,
-            )
+    best_val_loss, history, ensemble_state, stopping = fit_surrogate(
+        models,
+        x_train_n,
+        y_train_n,
+        x_val_n,
+        y_val_n,
+        args=args,
+        epochs=args.epochs if warm_start is None else warm_start["epochs"],
+        device=device,
+        mlflow_module=mlflow_module,
+    )
 
-        if val_loss < best_val_loss:
-            best_val_loss = val_loss
-            best_state = copy.deepcopy(model.state_dict())
-        if epoch % 20 == 0:
-            print(
-                f"Epoch {epoch:4d} | train_loss={train_loss:.6e} | "
-                f"val_loss={val_loss:.6e}"
+    if warm_start_report is not None:
+        warm_start_report.update(
+            {
+                "fine_tune_epochs": stopping["stopped_epoch"],
+                "fine_tune_seconds": stopping["training_seconds"],
+                "test_loss": normalized_loss(
+                    model, ensemble_state, x_test_n, y_test_n
+                ),
+            }
+        )
+        if warm_start["compare_full_retrain"]:
+            # Same split, normalization, seed, and options, from random weights.
+            torch.manual_seed(args.seed)
+            full_models = fresh_models()
+            _, _, full_state, full_stopping = fit_surrogate(
+                full_models,
+                x_train_n,
+                y_train_n,
+                x_val_n,
+                y_val_n,
+                args=args,
+                epochs=args.epochs,
+                device=device,
+            )
+            full_test_loss = normalized_loss(
+                full_models[0], full_state, x_test_n, y_test_n
+            )
+            warm_start_report.update(
+                {
+                    "full_retrain_epochs": full_stopping["stopped_epoch"],
+                    "full_retrain_seconds": full_stopping["training_seconds"],
+                    "full_retrain_test_loss": full_test_loss,
+                    "compute_saved": 1.0
+                    - stopping["training_seconds"]
+                    / full_stopping["training_seconds"],
+                    "test_loss_ratio": warm_start_report["test_loss"]
+                    / max(full_test_loss, 1e-12),
+                }
             )
 
-    model.load_state_dict(best_state)
     artifact = {
         "model_state_dict": model.state_dict(),
         "model_config": {
@@ -449,12 +1356,22 @@ def train_and_save(
         },
         "input_columns": list(input_columns),
         "output_columns": list(output_columns),
+        # Keys and display names in the layout the demo runtimes read.
+        "input_specs": feature_display_specs(feature_spec_path, input_columns),
+        "output_specs": feature_display_specs(feature_spec_path, output_columns),
         "x_mean": torch.tensor(x_mean, dtype=torch.float32),
         "x_std": torch.tensor(x_std, dtype=torch.float32),
         "y_mean": torch.tensor(y_mean, dtype=torch.float32),
         "y_std": torch.tensor(y_std, dtype=torch.float32),
         "best_val_loss": best_val_loss,
+        **stopping,
     }
+    if ensemble_state is not None:
+        artifact["ensemble_size"] = ensemble_size
+        artifact["ensemble_state_dict"] = ensemble_state
+    if warm_start_report is not None:
+        artifact["warm_start"] = warm_start_report
+        split_indices["warm_start"] = warm_start_report
     checkpoint_path = outdir / "rhino_surrogate.pt"
     history_path = outdir / "training_history.csv"
     split_path = outdir / "split_indices.json"
@@ -474,6 +1391,7 @@ def train_and_save(
             x_std=x_std,
             y_mean=y_mean,
             y_std=y_std,
+            ensemble_state=ensemble_state,
         )
         input_example = frame[list(input_columns)].head(5).astype(np.float32)
         output_example = serving_model.predict(None, input_example)
@@ -509,7 +1427,24 @@ def train_and_save(
         split_indices["mlflow_registered_model_version"] = (
             model_info.registered_model_version
         )
-        mlflow_module.log_metric("best_val_loss", best_val_loss)
+        mlflow_module.log_metrics(
+            {
+                "best_val_loss": best_val_loss,
+                "stopped_epoch": stopping["stopped_epoch"],
+                "best_epoch": stopping["best_epoch"],
+                "training_seconds": stopping["training_seconds"],
+            }
+        )
+        mlflow_module.set_tag("stop_reason", stopping["stop_reason"])
+        if warm_start_report is not None:
+            mlflow_module.log_metrics(
+                {
+                    f"warm_start_{name}": value
+                    for name, value in warm_start_report.items()
+                    if isinstance(value, float)
+                }
+            )
+            mlflow_module.set_tag("warm_start_source", warm_start_report["source"])
         mlflow_module.log_artifact(checkpoint_path, artifact_path="training")
         mlflow_module.log_artifact(history_path, artifact_path="training")
         if feature_spec_exists:
@@ -525,6 +1460,27 @@ def train_and_save(
         f"Rows: {len(frame)}; inputs: {len(input_columns)}; "
         f"outputs: {len(output_columns)}"
     )
+    print(
+        f"Stopped after epoch {stopping['stopped_epoch']} of "
+        f"{args.epochs if warm_start is None else warm_start['epochs']} "
+        f"({stopping['stop_reason']}); best epoch {stopping['best_epoch']}"
+    )
+    if warm_start_report is not None:
+        print(
+            f"Warm start from {warm_start_report['previous_rows']} to "
+            f"{warm_start_report['rows']} rows: validation loss "
+            f"{warm_start_report['initial_val_loss']:.6e} before fine-tuning, "
+            f"test loss {warm_start_report['test_loss']:.6e} after "
+            f"{warm_start_report['fine_tune_seconds']:.2f} s"
+        )
+        if "full_retrain_test_loss" in warm_start_report:
+            print(
+                f"Full retrain: test loss "
+                f"{warm_start_report['full_retrain_test_loss']:.6e} after "
+                f"{warm_start_report['full_retrain_seconds']:.2f} s; warm start "
+                f"saved {warm_start_report['compute_saved']:.1%} of the compute "
+                f"at {warm_start_report['test_loss_ratio']:.3f}x its test loss"
+            )
     print("\nSaved:")
     print(checkpoint_path)
     print(history_path)
@@ -547,12 +1503,51 @@ def main() -> None:
     features_path = args.features.expanduser().resolve()
     outdir = args.outdir.expanduser().resolve()
 
-    if min(args.epochs, args.batch_size, args.hidden_dim, args.hidden_layers) <= 0:
+    warm_start = None
+    if args.warm_start is not None:
+        warm_start_path = args.warm_start.expanduser().resolve()
+        artifact, previous_split = load_warm_start(
+            warm_start_path, input_columns, output_columns
+        )
+        config = artifact["model_config"]
+        args.hidden_dim = config["hidden_dim"]
+        args.hidden_layers = config["num_hidden_layers"]
+        args.ensemble_size = artifact.get("ensemble_size", 1)
+        fine_tune_epochs = (
+            args.fine_tune_epochs
+            if args.fine_tune_epochs is not None
+            else max(1, args.epochs // 4)
+        )
+        if fine_tune_epochs <= 0:
+            raise ValueError("Fine-tune epochs must be positive")
+        warm_start = {
+            "path": warm_start_path,
+            "artifact": artifact,
+            "split": previous_split,
+            "normalization": args.warm_start_normalization,
+            "epochs": fine_tune_epochs,
+            "compare_full_retrain": args.compare_full_retrain,
+        }
+    elif args.compare_full_retrain or args.fine_tune_epochs is not None:
+        raise ValueError(
+            "--fine-tune-epochs and --compare-full-retrain need --warm-start"
+        )
+
+    sizes = (
+        args.epochs,
+        args.batch_size,
+        args.hidden_dim,
+        args.hidden_layers,
+        args.ensemble_size,
+    )
+    if min(sizes) <= 0:
         raise ValueError(
-            "Epochs, batch size, hidden dimension, and hidden layers must be positive"
+            "Epochs, batch size, hidden dimension, hidden layers, and ensemble "
+            "size must be positive"
         )
     if args.lr <= 0:
         raise ValueError("Learning rate must be greater than zero")
+    convergence_controls(args)
     if args.mlflow and not args.skip_model_registration:
         if not args.registered_model_name.strip():
             raise ValueError("Registered model name must not be empty")
@@ -574,6 +1569,7 @@ def main() -> None:
         "output_columns": output_columns,
         "features_path": features_path,
         "outdir": outdir,
+        "warm_start": warm_start,
     }
     if not args.mlflow:
         train_and_save(**train_arguments)
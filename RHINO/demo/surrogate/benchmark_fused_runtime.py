@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import argparse
+import itertools
+import statistics
+from pathlib import Path
+
+import numpy as np
+
+from RHINO.ML.surrogate_training.benchmark_timing import time_calls
+from RHINO.demo.surrogate.rhino_surrogate_fused_runtime import FusedRhinoSurrogate
+from RHINO.demo.surrogate.rhino_surrogate_runtime import RhinoSurrogate
+
+BASE_DIR = Path(__file__).resolve().parent
+DATA_DIR = BASE_DIR / "data"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare single-query latency of the surrogate runtimes."
+    )
+    parser.add_argument("--model", type=Path, default=DATA_DIR / "rhino_surrogate.pt")
+    parser.add_argument(
+        "--fused",
+        type=Path,
+        default=DATA_DIR / "rhino_surrogate_fused.ts",
+        help="Graph written by ML/surrogate_training/exportSurrogate.py.",
+    )
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    runtimes = {
+        "RhinoSurrogate": RhinoSurrogate(str(args.model), device="cpu"),
+        "FusedRhinoSurrogate": FusedRhinoSurrogate(args.fused, device="cpu"),
+    }
+    reference = runtimes["RhinoSurrogate"]
+    rng = np.random.default_rng(0)
+    inputs = [
+        {
+            key: float(mean + std * rng.standard_normal())
+            for key, mean, std in zip(
+                reference.input_keys, reference.x_mean[0], reference.x_std[0]
+            )
+        }
+        for _ in range(args.queries)
+    ]
+
+    expected = np.array([list(reference.predict_from_dict(q).values()) for q in inputs])
+    fused = runtimes["FusedRhinoSurrogate"]
+    actual = np.array([list(fused.predict_from_dict(q).values()) for q in inputs])
+    scale = np.maximum(np.abs(expected).max(axis=0), 1.0)
+    print(f"Max relative difference: {np.max(np.abs(actual - expected) / scale):.2e}")
+
+    medians = {}
+    for name, runtime in runtimes.items():
+        # Each timed call takes the next query, cycling through all of them.
+        queries = itertools.cycle(inputs)
+        latencies = time_calls(
+            lambda _: runtime.predict_from_dict(next(queries)),
+            None,
+            args.repeats * len(inputs),
+        )
+        medians[name] = statistics.median(latencies)
+        print(
+            f"{name:<20} median {medians[name] * 1e6:8.1f} us  "
+            f"p99 {np.percentile(latencies, 99) * 1e6:8.1f} us"
+        )
+    print(f"Speedup: {medians['RhinoSurrogate'] / medians['FusedRhinoSurrogate']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+import numpy as np
+import torch
+
+from RHINO.ML.surrogate_training.benchmark_timing import time_calls
+from RHINO.demo.surrogate.build_response_surface import training_domain
+from RHINO.demo.surrogate.rhino_surrogate_runtime import RhinoSurrogate
+
+BASE_DIR = Path(__file__).resolve().parent
+DATA_DIR = BASE_DIR / "data"
+TRAINING_DIR = BASE_DIR.parents[1] / "ML" / "surrogate_training"
+RUNTIMES = ("network", "fused", "surface", "pyfunc", "mcp")
+DEFAULT_BATCH_SIZES = [1, 10, 100, 1000, 10000, 100000]
+
+
+def git_commit() -> dict[str, Any]:
+    def git(*command: str) -> str:
+        return subprocess.run(
+            ["git", *command], cwd=BASE_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+
+    try:
+        return {"commit": git("rev-parse", "HEAD"), "dirty": bool(git("status", "--porcelain"))}
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": None, "dirty": None}
+
+
+def load_runtimes(args: argparse.Namespace, network: RhinoSurrogate) -> tuple[dict, dict]:
+    # Each runtime maps to (batch callable or None, single-query callable).
+    runtimes: dict[str, tuple[Callable | None, Callable]] = {}
+    skipped: dict[str, str] = {}
+    requested = args.runtimes or list(RUNTIMES)
+
+    for name in requested:
+        try:
+            if name == "network":
+                runtimes[name] = (network.predict_batch, network.predict_from_dict)
+            elif name == "fused":
+                from RHINO.demo.surrogate.rhino_surrogate_fused_runtime import FusedRhinoSurrogate
+
+                fused = FusedRhinoSurrogate(args.fused, device="cpu")
+                runtimes[name] = (fused.predict_batch, fused.predict_from_dict)
+            elif name == "surface":
+                from RHINO.demo.surrogate.rhino_response_surface import ResponseSurfaceSurrogate
+
+                surface = ResponseSurfaceSurrogate(args.surface, network, model_path=args.model)
+                runtimes[name] = (surface.predict_batch, surface.predict_from_dict)
+            elif name == "pyfunc":
+                try:
+                    # The MLflow wrapper imports its training-script siblings by name.
+                    sys.path.insert(0, str(TRAINING_DIR))
+                    from mlflow_model import RhinoSurrogatePyFunc
+                except ImportError as error:
+                    raise RuntimeError(
+                        "The pyfunc runtime was requested but mlflow is not installed"
+                    ) from error
+                import pandas as pd
+
+                pyfunc = RhinoSurrogatePyFunc(
+                    model=network.model,
+                    input_columns=network.input_keys,
+                    output_columns=network.output_keys,
+                    x_mean=network.x_mean,
+                    x_std=network.x_std,
+                    y_mean=network.y_mean,
+                    y_std=network.y_std,
+                    ensemble_state=network.ensemble_state,
+                )
+                runtimes[name] = (
+                    lambda x: pyfunc.predict(None, pd.DataFrame(x, columns=network.input_keys)),
+                    lambda inputs: pyfunc.predict(None, pd.DataFrame([inputs])),
+                )
+            elif name == "mcp":
+                runtimes[name] = (None, mcp_tool_call())
+        except (RuntimeError, FileNotFoundError, ImportError, ValueError) as error:
+            if args.runtimes:
+                raise
+            skipped[name] = str(error)
+    return runtimes, skipped
+
+
+def mcp_tool_call() -> Callable:
+    try:
+        from fastmcp import Client
+    except ImportError as error:
+        raise RuntimeError("The mcp runtime was requested but fastmcp is not installed") from error
+    from RHINO.demo.surrogate.mcp_server_rhino import mcp
+
+    # One in-process client and event loop, reused for every timed call.
+    loop = asyncio.new_event_loop()
+    client = Client(mcp)
+    loop.run_until_complete(client.__aenter__())
+
+    def call(inputs: dict[str, float]) -> Any:
+        return loop.run_until_complete(client.call_tool("predict_rhino_surrogate", inputs))
+
+    return call
+
+
+def summarize(latencies: list[float], rows: int) -> dict[str, float]:
+    return {
+        "calls": len(latencies),
+        "p50_ms": statistics.median(latencies) * 1e3,
+        "p99_ms": float(np.percentile(latencies, 99)) * 1e3,
+        "rows_per_second": rows * len(latencies) / sum(latencies),
+    }
+
+
+def compare(results: list[dict], baseline_path: Path) -> None:
+    baseline = json.loads(baseline_path.read_text())
+    key = lambda row: (row["runtime"], row["mode"], row["batch_size"], row["threads"])
+    before = {key(row): row for row in baseline["results"]}
+    print(f"\nAgainst {baseline_path} (commit {baseline['commit']}):")
+    for row in results:
+        if key(row) in before:
+            old = before[key(row)]
+            print(
+                f"{row['runtime']:<8} {row['mode']:<6} {row['batch_size']:>6} rows "
+                f"threads {row['threads']:>2}: p50 {old['p50_ms']:.4g} -> {row['p50_ms']:.4g} ms "
+                f"({old['p50_ms'] / row['p50_ms']:.2f}x)"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Measure p50/p99 latency and rows/s of the surrogate runtimes across "
+            "batch sizes and torch thread counts."
+        )
+    )
+    parser.add_argument("--model", type=Path, default=DATA_DIR / "rhino_surrogate.pt")
+    parser.add_argument("--index", type=Path, default=DATA_DIR / "simulation_index.json")
+    parser.add_argument("--fused", type=Path, default=DATA_DIR / "rhino_surrogate_fused.ts")
+    parser.add_argument(
+        "--surface", type=Path, default=DATA_DIR / "rhino_response_surface.npz"
+    )
+    parser.add_argument(
+        "--runtimes",
+        nargs="+",
+        choices=RUNTIMES,
+        help="Runtimes to measure; by default every runtime that can be loaded.",
+    )
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=DEFAULT_BATCH_SIZES)
+    parser.add_argument(
+        "--threads",
+        type=int,
+        nargs="+",
+        default=sorted({1, os.cpu_count() or 1}),
+        help="torch intra-op thread counts to sweep.",
+    )
+    parser.add_argument("--min-calls", type=int, default=5)
+    parser.add_argument(
+        "--min-seconds",
+        type=float,
+        default=0.5,
+        help="Keep calling each configuration for at least this long.",
+    )
+    parser.add_argument("--json", type=Path, help="Write the results to this file.")
+    parser.add_argument(
+        "--compare", type=Path, help="Earlier --json output to compare p50 latency against."
+    )
+    args = parser.parse_args()
+    if min(args.batch_sizes) < 1 or min(args.threads) < 1 or args.min_calls < 1:
+        raise ValueError("Batch sizes, thread counts, and minimum calls must be positive")
+
+    network = RhinoSurrogate(str(args.model), device="cpu")
+    runtimes, skipped = load_runtimes(args, network)
+    for name, reason in skipped.items():
+        print(f"Skipping {name}: {reason}")
+
+    # Inputs inside the indexed domain, so the response surface never falls back.
+    domain = training_domain(args.index, network.input_keys)
+    rng = np.random.default_rng(0)
+    x_all = np.column_stack(
+        [rng.uniform(low, high, max(args.batch_sizes)) for low, high in domain]
+    ).astype(np.float32)
+    single_query = dict(zip(network.input_keys, map(float, x_all[0])))
+
+    results = []
+    default_threads = torch.get_num_threads()
+    try:
+        for threads in args.threads:
+            torch.set_num_threads(threads)
+            for name, (batch_call, single_call) in runtimes.items():
+                measured = [("single", 1, single_call, single_query)]
+                if batch_call is not None:
+                    measured += [
+                        ("batch", size, batch_call, x_all[:size]) for size in args.batch_sizes
+                    ]
+                for mode, size, call, argument in measured:
+                    row = {
+                        "runtime": name,
+                        "mode": mode,
+                        "batch_size": size,
+                        "threads": threads,
+                        **summarize(
+                            time_calls(call, argument, args.min_calls, args.min_seconds), size
+                        ),
+                    }
+                    results.append(row)
+                    print(
+                        f"{name:<8} {mode:<6} {size:>6} rows  threads {threads:>2}: "
+                        f"p50 {row['p50_ms']:9.4f} ms  p99 {row['p99_ms']:9.4f} ms  "
+                        f"{row['rows_per_second']:12.0f} rows/s"
+                    )
+    finally:
+        torch.set_num_threads(default_threads)
+
+    report = {
+        **git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "host": {
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+            "cpu_count": os.cpu_count(),
+            "python": platform.python_version(),
+            "torch": torch.__version__,
+            "numpy": np.__version__,
+        },
+        "model": str(args.model.resolve()),
+        "model_sha256": hashlib.sha256(args.model.read_bytes()).hexdigest(),
+        "settings": {
+            "batch_sizes": args.batch_sizes,
+            "threads": args.threads,
+            "min_calls": args.min_calls,
+            "min_seconds": args.min_seconds,
+        },
+        "skipped": skipped,
+        "results": results,
+    }
+    if args.json is not None:
+        args.json.write_text(json.dumps(report, indent=2))
+        print(args.json)
+    if args.compare is not None:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+from pathlib import Path
+
+import numpy as np
+
+from RHINO.demo.surrogate.rhino_response_surface import bilinear_interpolate
+from RHINO.demo.surrogate.rhino_surrogate_runtime import RhinoSurrogate
+
+BASE_DIR = Path(__file__).resolve().parent
+DATA_DIR = BASE_DIR / "data"
+BATCH_ROWS = 65536
+
+
+def predict_rows(surrogate: RhinoSurrogate, x_raw: np.ndarray) -> np.ndarray:
+    # Chunked so an ensemble's per-member activations stay bounded in memory.
+    return np.concatenate(
+        [
+            surrogate.predict_batch(x_raw[start:start + BATCH_ROWS])[0]
+            for start in range(0, len(x_raw), BATCH_ROWS)
+        ]
+    ).astype(np.float32)
+
+
+def training_domain(index_path: Path, input_keys: list[str]) -> list[tuple[float, float]]:
+    payload = json.loads(index_path.read_text())
+    inputs = np.array(
+        [[record["inputs"][key] for key in input_keys] for record in payload["records"]],
+        dtype=np.float64,
+    )
+    return [(float(low), float(high)) for low, high in zip(inputs.min(axis=0), inputs.max(axis=0))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Tabulate the 2-input RHINO surrogate on a dense grid over its "
+            "training domain for bilinear interpolation."
+        )
+    )
+    parser.add_argument("--model", type=Path, default=DATA_DIR / "rhino_surrogate.pt")
+    parser.add_argument(
+        "--index",
+        type=Path,
+        default=DATA_DIR / "simulation_index.json",
+        help="Simulation index whose input range defines the grid domain.",
+    )
+    parser.add_argument(
+        "--output", type=Path, default=DATA_DIR / "rhino_response_surface.npz"
+    )
+    parser.add_argument(
+        "--points",
+        type=int,
+        nargs="+",
+        default=[513],
+        help="Grid points per input; one value applies to every input.",
+    )
+    parser.add_argument(
+        "--check-samples",
+        type=int,
+        default=200000,
+        help="Random points, besides every cell center, used to measure the error.",
+    )
+    args = parser.parse_args()
+
+    surrogate = RhinoSurrogate(str(args.model), device="cpu")
+    if len(surrogate.input_keys) != 2:
+        raise ValueError(
+            f"A response surface needs exactly 2 inputs, not {len(surrogate.input_keys)}"
+        )
+    points = args.points * 2 if len(args.points) == 1 else args.points
+    if len(points) != 2 or min(points) < 2:
+        raise ValueError("Give one or two grid sizes of at least 2 points")
+
+    domain = training_domain(args.index, surrogate.input_keys)
+    axes = [np.linspace(low, high, count) for (low, high), count in zip(domain, points)]
+    mesh = np.stack(np.meshgrid(*axes, indexing="ij"), axis=-1).reshape(-1, 2)
+    values = predict_rows(surrogate, mesh).reshape(points[0], points[1], -1)
+
+    # Bilinear error peaks inside cells, so check every cell center plus random points.
+    centers = [(axis[:-1] + axis[1:]) / 2 for axis in axes]
+    checks = [np.stack(np.meshgrid(*centers, indexing="ij"), axis=-1).reshape(-1, 2)]
+    rng = np.random.default_rng(0)
+    checks.append(
+        np.column_stack(
+            [rng.uniform(low, high, args.check_samples) for low, high in domain]
+        )
+    )
+    check_points = np.concatenate(checks)
+    interpolated = bilinear_interpolate(axes[0], axes[1], values, check_points)
+    deviation = np.abs(interpolated - predict_rows(surrogate, check_points))
+    max_abs_deviation = deviation.max(axis=0)
+    output_range = np.ptp(values.reshape(-1, values.shape[-1]), axis=0)
+    max_relative_deviation = max_abs_deviation / np.maximum(output_range, 1e-12)
+
+    metadata = {
+        "input_keys": surrogate.input_keys,
+        "output_keys": surrogate.output_keys,
+        "domain": domain,
+        "points": points,
+        "check_points": len(check_points),
+        "max_abs_deviation": max_abs_deviation.tolist(),
+        "max_relative_deviation": max_relative_deviation.tolist(),
+        "source_model": str(args.model.resolve()),
+        "source_model_sha256": hashlib.sha256(args.model.read_bytes()).hexdigest(),
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    np.savez_compressed(
+        args.output,
+        axis_0=axes[0],
+        axis_1=axes[1],
+        values=values,
+        metadata=np.array(json.dumps(metadata)),
+    )
+
+    print(f"Grid: {points[0]} x {points[1]} over {domain}")
+    for spec, absolute, relative in zip(
+        surrogate.output_specs, max_abs_deviation, max_relative_deviation
+    ):
+        print(
+            f"{spec['display_name']}: max deviation {absolute:.4g} "
+            f"({relative:.2e} of output range)"
+        )
+    print(args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from RHINO.demo.surrogate.graph_builder import (
+    get_flows_map,
+    get_injectors_map,
+    get_mass_inventory,
+    get_subsystems_dict,
+    get_time_series,
+    open_series,
+)
+from RHINO.demo.surrogate.simulation_lookup import SimulationLookup
+
+BASE_DIR = Path(__file__).resolve().parent
+DATA_DIR = BASE_DIR / "data"
+
+
+def json_value(value: Any) -> Any:
+    # openPMD attributes come back as NumPy scalars or lists of them.
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [json_value(item) for item in value]
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def read_topology(series) -> dict[str, Any]:
+    return {
+        "subsystems": {name: int(index) for name, index in get_subsystems_dict(series).items()},
+        "injectors": {str(index): json_value(value) for index, value in get_injectors_map(series).items()},
+        "flows": {str(index): json_value(value) for index, value in get_flows_map(series).items()},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Collect the Tritium inventory trajectory (subsystems x time) of every "
+            "indexed simulation for trajectory-surrogate training."
+        )
+    )
+    parser.add_argument("--index", type=Path, default=DATA_DIR / "simulation_index.json")
+    parser.add_argument("--model", type=Path, default=DATA_DIR / "rhino_surrogate.pt")
+    parser.add_argument(
+        "--output", type=Path, default=DATA_DIR / "rhino_trajectories.npz"
+    )
+    parser.add_argument(
+        "--downsample-step",
+        type=int,
+        default=1,
+        help="Keep every n-th time sample of each trajectory.",
+    )
+    args = parser.parse_args()
+    if args.downsample_step < 1:
+        raise ValueError("downsample_step must be >= 1")
+
+    lookup = SimulationLookup(index_path=args.index, artifact_path=args.model)
+    times = None
+    topology = None
+    inputs, trajectories, simulation_ids = [], [], []
+
+    for record in lookup.records:
+        path = lookup.resolve_simulation_path(record["path"])
+        try:
+            series = open_series(path)
+        except Exception as exc:
+            print(f"Skipping {path}: {exc}")
+            continue
+
+        try:
+            mass = get_mass_inventory(series)[:, ::args.downsample_step]
+            run_times = get_time_series(series)[::args.downsample_step]
+            run_topology = read_topology(series)
+        finally:
+            series.close()
+
+        if topology is None:
+            times, topology = run_times, run_topology
+        elif run_topology != topology:
+            raise ValueError(
+                f"{record['simulation_id']} has a different plant topology; one "
+                "trajectory surrogate covers one topology"
+            )
+        if trajectories and mass.shape[0] != trajectories[0].shape[0]:
+            raise ValueError(
+                f"{record['simulation_id']} has {mass.shape[0]} subsystems, "
+                f"expected {trajectories[0].shape[0]}"
+            )
+        if len(run_times) != len(times) or not np.allclose(run_times, times):
+            # Put runs saved on another time grid onto the first run's grid.
+            mass = np.stack([np.interp(times, run_times, row) for row in mass])
+
+        inputs.append([record["inputs"][key] for key in lookup.input_keys])
+        trajectories.append(mass)
+        simulation_ids.append(record["simulation_id"])
+
+    if not trajectories:
+        raise ValueError(f"No simulation listed in {args.index} could be read")
+
+    metadata = {
+        "input_specs": lookup.input_specs,
+        "downsample_step": args.downsample_step,
+        "simulation_ids": simulation_ids,
+        **topology,
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    np.savez_compressed(
+        args.output,
+        inputs=np.array(inputs, dtype=np.float64),
+        mass=np.stack(trajectories).astype(np.float32),
+        times=np.asarray(times, dtype=np.float64),
+        metadata=np.array(json.dumps(metadata)),
+    )
+
+    print(
+        f"{len(trajectories)} trajectories of {trajectories[0].shape[0]} subsystems "
+        f"x {len(times)} samples"
+    )
+    print(args.output)
+
+
+if __name__ == "__main__":
+    main()
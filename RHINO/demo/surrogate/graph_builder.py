@@ -432,6 +432,50 @@ def build_edges_rf(
     return edges_rf
 
 
+def build_graph_payload(
+    mass: np.ndarray,
+    time: np.ndarray,
+    names_map: dict[int, str],
+    injectors_map: dict[int, Any],
+    flows_map: dict[int, Any],
+    downsample_step: int = DOWNSAMPLE_STEP,
+    surrogate_predictions: dict[str, Any] | None = None,
+    simulation_path: str | None = None,
+) -> dict[str, Any]:
+    """Build the React payload from in-memory inventories and plant topology."""
+    if downsample_step < 1:
+        raise ValueError("downsample_step must be >= 1")
+
+    if mass.shape[0] != N_COMPONENTS:
+        print(
+            f"Warning: expected {N_COMPONENTS} components, found {mass.shape[0]}"
+        )
+
+    mass_ds = mass[:, ::downsample_step]
+    time_ds = time[::downsample_step]
+
+    nodes_rf = build_nodes_rf(names_map, mass_ds, SAVED_POSITIONS)
+    edges_rf = build_edges_rf(injectors_map, flows_map)
+
+    payload = {
+        "simulation_path": simulation_path,
+        "nodes": nodes_rf,
+        "edges": edges_rf,
+        "time": {
+            "timeSeries": time_ds.tolist(),
+            "timeUnit": "days",
+            "downsampleStep": downsample_step,
+        },
+        "surrogatePredictions": (
+            copy.deepcopy(surrogate_predictions)
+            if surrogate_predictions is not None
+            else copy.deepcopy(SURROGATE_PREDICTION_DEFAULTS)
+        ),
+    }
+
+    return with_payload_defaults(payload)
+
+
 def build_graph_from_simulation(
     sim_path: str | Path,
     downsample_step: int = DOWNSAMPLE_STEP,
@@ -445,47 +489,48 @@ def build_graph_from_simulation(
     series = open_series(sim_path)
 
     try:
-        mass = get_mass_inventory(series)
-        time = get_time_series(series)
-
-        if mass.shape[0] != N_COMPONENTS:
-            print(
-                f"Warning: expected {N_COMPONENTS} components, found {mass.shape[0]}"
-            )
-
-        mass_ds = mass[:, ::downsample_step]
-        time_ds = time[::downsample_step]
-
         subsystems = get_subsystems_dict(series)
-        names_map = {value: key for key, value in subsystems.items()}
-        injectors_map = get_injectors_map(series)
-        flows_map = get_flows_map(series)
-
-        nodes_rf = build_nodes_rf(names_map, mass_ds, SAVED_POSITIONS)
-        edges_rf = build_edges_rf(injectors_map, flows_map)
-
-        payload = {
-            "simulation_path": str(sim_path),
-            "nodes": nodes_rf,
-            "edges": edges_rf,
-            "time": {
-                "timeSeries": time_ds.tolist(),
-                "timeUnit": "days",
-                "downsampleStep": downsample_step,
-            },
-            "surrogatePredictions": (
-                copy.deepcopy(surrogate_predictions)
-                if surrogate_predictions is not None
-                else copy.deepcopy(SURROGATE_PREDICTION_DEFAULTS)
-            ),
-        }
-
-        return with_payload_defaults(payload)
+        return build_graph_payload(
+            get_mass_inventory(series),
+            get_time_series(series),
+            {value: key for key, value in subsystems.items()},
+            get_injectors_map(series),
+            get_flows_map(series),
+            downsample_step=downsample_step,
+            surrogate_predictions=surrogate_predictions,
+            simulation_path=str(sim_path),
+        )
 
     finally:
         series.close()
 
 
+def build_graph_from_trajectory_surrogate(
+    trajectory_surrogate: Any,
+    inputs: dict[str, float],
+    downsample_step: int = DOWNSAMPLE_STEP,
+    surrogate_predictions: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """Build the React payload from a predicted trajectory, without disk reads.
+
+    `trajectory_surrogate` is a `RhinoTrajectorySurrogate`; its trajectories
+    are already downsampled by the step it was trained with.
+    """
+    payload = build_graph_payload(
+        trajectory_surrogate.predict_trajectory(inputs),
+        trajectory_surrogate.times,
+        trajectory_surrogate.names_map,
+        trajectory_surrogate.injectors_map,
+        trajectory_surrogate.flows_map,
+        downsample_step=downsample_step,
+        surrogate_predictions=surrogate_predictions,
+    )
+    payload["time"]["downsampleStep"] = (
+        downsample_step * trajectory_surrogate.downsample_step
+    )
+    return payload
+
+
 def write_graph_payload(
     payload: dict[str, Any],
     payload_out: str | None = None,
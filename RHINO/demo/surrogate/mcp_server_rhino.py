@@ -9,10 +9,13 @@ from urllib.parse import quote
 
 from fastmcp import FastMCP
 from starlette.responses import JSONResponse
+from RHINO.demo.surrogate.rhino_response_surface import ResponseSurfaceSurrogate
 from RHINO.demo.surrogate.rhino_surrogate_runtime import RhinoSurrogate
+from RHINO.demo.surrogate.rhino_trajectory_runtime import RhinoTrajectorySurrogate
 from RHINO.demo.surrogate.simulation_lookup import SimulationLookup 
 from RHINO.demo.surrogate.graph_builder import (
     build_graph_from_simulation,
+    build_graph_from_trajectory_surrogate,
     build_react_prediction_payload,
     write_graph_payload,
 )
@@ -34,6 +37,25 @@ _graph_revision = 0
 # Load once when the server starts
 surrogate = RhinoSurrogate(str(MODEL_PATH), device="cpu")
 
+# Set RHINO_RESPONSE_SURFACE to a grid from build_response_surface.py to serve
+# in-domain predictions by interpolation; other queries still use the network.
+if os.environ.get("RHINO_RESPONSE_SURFACE"):
+    surrogate = ResponseSurfaceSurrogate(
+        Path(os.environ["RHINO_RESPONSE_SURFACE"]).expanduser(),
+        surrogate,
+        model_path=MODEL_PATH,
+    )
+
+# Set RHINO_TRAJECTORY_SURROGATE to a model from train_trajectory_surrogate.py to
+# build graphs for arbitrary inputs without opening archived simulations.
+trajectory_surrogate: RhinoTrajectorySurrogate | None = None
+if os.environ.get("RHINO_TRAJECTORY_SURROGATE"):
+    trajectory_surrogate = RhinoTrajectorySurrogate(
+        Path(os.environ["RHINO_TRAJECTORY_SURROGATE"]).expanduser()
+    )
+    if trajectory_surrogate.input_keys != surrogate.input_keys:
+        raise ValueError("Trajectory surrogate and surrogate disagree about input keys")
+
 lookup = SimulationLookup(
     index_path=INDEX_PATH,
     artifact_path=MODEL_PATH,
@@ -142,6 +164,41 @@ def _start_visualization_server(host: str = "127.0.0.1", port: int = 5173) -> di
     }
 
 
+def _publish_graph(
+    graph: dict,
+    write_visualization_files: bool,
+    start_visualization: bool,
+    visualization_port: int,
+) -> dict:
+    global _latest_graph
+    global _graph_revision
+
+    _latest_graph = graph
+    _graph_revision += 1
+
+    visualization = {
+        "status": "not_requested",
+        "url": None,
+        "port": visualization_port,
+        "data_source": f"{_mcp_base_url()}/graph_payload.json",
+    }
+    if write_visualization_files:
+        _write_visualization_files(graph)
+        visualization["files_written"] = {
+            "payload": str(VIZ_PUBLIC_DIR / "graph_payload.json"),
+            "nodes": str(VIZ_PUBLIC_DIR / "nodes_rf.json"),
+            "edges": str(VIZ_PUBLIC_DIR / "edges_rf.json"),
+            "time": str(VIZ_PUBLIC_DIR / "time_rf.json"),
+        }
+
+    if start_visualization:
+        visualization.update(
+            _start_visualization_server(port=int(visualization_port))
+        )
+
+    return visualization
+
+
 def _add_nearest_simulation_context(
     graph: dict,
     nearest: dict,
@@ -214,6 +271,32 @@ def predict_rhino_surrogate(
         }
     )
 
+@mcp.tool
+def predict_rhino_surrogate_with_uncertainty(
+    Ndotminus: float,
+    beta: float,
+) -> dict[str, dict[str, float]]:
+    """
+    Predict RHINO surrogate outputs with an ensemble uncertainty estimate.
+
+    Inputs:
+    - Ndotminus: tritium burning rate in grams per day [g/d]
+    - beta: burn fraction as a unitless fraction [-]
+
+    The inputs must be physical values, not normalized values.
+
+    Returns:
+    A dictionary mapping human-readable output names to the ensemble mean and
+    standard deviation in physical units. The standard deviation is 0 when the
+    loaded model was not trained as an ensemble.
+    """
+    return surrogate.predict_with_uncertainty(
+        {
+            "Ndotminus": Ndotminus,
+            "beta": beta,
+        }
+    )
+
 @mcp.tool
 def find_nearest_simulation(
     Ndotminus: float,
@@ -343,9 +426,6 @@ def build_graph_for_nearest_simulation(
     HTTP JSON routes, and starts the local Vite visualization server. Existing
     JSON files remain available as fallback data.
     """
-    global _latest_graph
-    global _graph_revision
-
     query_inputs = {
         "Ndotminus": Ndotminus,
         "beta": beta,
@@ -366,33 +446,63 @@ def build_graph_for_nearest_simulation(
         prediction_by_key,
         react_predictions,
     )
-    _latest_graph = graph
-    _graph_revision += 1
-
-    visualization = {
-        "status": "not_requested",
-        "url": None,
-        "port": visualization_port,
-        "data_source": f"{_mcp_base_url()}/graph_payload.json",
+    return {
+        "nearest_simulation": nearest,
+        "graph": graph,
+        "visualization": _publish_graph(
+            graph,
+            write_visualization_files,
+            start_visualization,
+            visualization_port,
+        ),
     }
-    if write_visualization_files:
-        _write_visualization_files(graph)
-        visualization["files_written"] = {
-            "payload": str(VIZ_PUBLIC_DIR / "graph_payload.json"),
-            "nodes": str(VIZ_PUBLIC_DIR / "nodes_rf.json"),
-            "edges": str(VIZ_PUBLIC_DIR / "edges_rf.json"),
-            "time": str(VIZ_PUBLIC_DIR / "time_rf.json"),
-        }
 
-    if start_visualization:
-        visualization.update(
-            _start_visualization_server(port=int(visualization_port))
+
+@mcp.tool
+def build_graph_from_trajectory_prediction(
+    Ndotminus: float,
+    beta: float,
+    write_visualization_files: bool = False,
+    start_visualization: bool = True,
+    visualization_port: int = 5173,
+) -> dict:
+    """
+    Predict the full Tritium inventory trajectory of every subsystem for the
+    given physical inputs and return React Flow graph data for it.
+
+    Unlike build_graph_for_nearest_simulation, no archived simulation is read:
+    the inventories come from the trajectory surrogate, so any input values can
+    be visualized. The server must be started with RHINO_TRAJECTORY_SURROGATE
+    pointing at a model from train_trajectory_surrogate.py.
+
+    The graph is published the same way as build_graph_for_nearest_simulation.
+    """
+    if trajectory_surrogate is None:
+        raise ValueError(
+            "No trajectory surrogate is loaded; set RHINO_TRAJECTORY_SURROGATE "
+            "before starting the server"
         )
 
+    query_inputs = {
+        "Ndotminus": Ndotminus,
+        "beta": beta,
+    }
+
+    prediction_display = surrogate.predict_with_display_names(query_inputs)
+    graph = build_graph_from_trajectory_surrogate(
+        trajectory_surrogate,
+        query_inputs,
+        surrogate_predictions=build_react_prediction_payload(prediction_display),
+    )
+
     return {
-        "nearest_simulation": nearest,
         "graph": graph,
-        "visualization": visualization,
+        "visualization": _publish_graph(
+            graph,
+            write_visualization_files,
+            start_visualization,
+            visualization_port,
+        ),
     }
 
 @mcp.custom_route("/health", methods=["GET"])
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from bisect import bisect_right
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+
+def bilinear_interpolate(
+    axis_0: np.ndarray, axis_1: np.ndarray, values: np.ndarray, points: np.ndarray
+) -> np.ndarray:
+    i = np.clip(np.searchsorted(axis_0, points[:, 0], side="right") - 1, 0, len(axis_0) - 2)
+    j = np.clip(np.searchsorted(axis_1, points[:, 1], side="right") - 1, 0, len(axis_1) - 2)
+    tx = ((points[:, 0] - axis_0[i]) / (axis_0[i + 1] - axis_0[i]))[:, None]
+    ty = ((points[:, 1] - axis_1[j]) / (axis_1[j + 1] - axis_1[j]))[:, None]
+    return (
+        (1 - tx) * (1 - ty) * values[i, j]
+        + tx * (1 - ty) * values[i + 1, j]
+        + (1 - tx) * ty * values[i, j + 1]
+        + tx * ty * values[i + 1, j + 1]
+    )
+
+
+class ResponseSurfaceSurrogate:
+    """Serve the 2-input surrogate from a precomputed grid.
+
+    Queries inside the grid are bilinearly interpolated; the build step records
+    the largest deviation from the network per output. Queries outside the grid,
+    and any method the grid does not provide, go to the `fallback` runtime.
+    With `model_path`, the grid must have been built from that exact model file.
+    """
+
+    def __init__(
+        self,
+        surface_path: str | Path,
+        fallback: Any,
+        model_path: str | Path | None = None,
+    ):
+        with np.load(surface_path) as surface:
+            axis_0 = surface["axis_0"]
+            axis_1 = surface["axis_1"]
+            values = surface["values"].astype(np.float64)
+            metadata = json.loads(str(surface["metadata"]))
+
+        if metadata["input_keys"] != fallback.input_keys:
+            raise ValueError("Response surface and surrogate disagree about input keys")
+        if metadata["output_keys"] != fallback.output_keys:
+            raise ValueError("Response surface and surrogate disagree about output keys")
+        if model_path is not None:
+            digest = hashlib.sha256(Path(model_path).read_bytes()).hexdigest()
+            if digest != metadata["source_model_sha256"]:
+                raise ValueError(
+                    f"Response surface {surface_path} was built from a different "
+                    "model; rerun build_response_surface.py"
+                )
+
+        self.fallback = fallback
+        self.metadata = metadata
+        # Plain Python lists: per-query NumPy calls would dominate the latency.
+        self.grid = (axis_0, axis_1, values)
+        self.axis_0 = axis_0.tolist()
+        self.axis_1 = axis_1.tolist()
+        self.values = values.tolist()
+        self.input_keys = fallback.input_keys
+        self.output_keys = fallback.output_keys
+        self.output_specs = fallback.output_specs
+        self.max_deviation = dict(zip(self.output_keys, metadata["max_abs_deviation"]))
+        self.fallback_calls = 0
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.fallback, name)
+
+    def contains(self, x0: float, x1: float) -> bool:
+        return (
+            self.axis_0[0] <= x0 <= self.axis_0[-1]
+            and self.axis_1[0] <= x1 <= self.axis_1[-1]
+        )
+
+    def interpolate(self, x0: float, x1: float) -> list[float] | None:
+        if not self.contains(x0, x1):
+            return None
+
+        axis_0, axis_1 = self.axis_0, self.axis_1
+        i = min(bisect_right(axis_0, x0) - 1, len(axis_0) - 2)
+        j = min(bisect_right(axis_1, x1) - 1, len(axis_1) - 2)
+        tx = (x0 - axis_0[i]) / (axis_0[i + 1] - axis_0[i])
+        ty = (x1 - axis_1[j]) / (axis_1[j + 1] - axis_1[j])
+        row_0, row_1 = self.values[i], self.values[i + 1]
+        return [
+            (1 - ty) * (v00 + tx * (v10 - v00)) + ty * (v01 + tx * (v11 - v01))
+            for v00, v10, v01, v11 in zip(row_0[j], row_1[j], row_0[j + 1], row_1[j + 1])
+        ]
+
+    def predict_array(self, x_raw: np.ndarray) -> np.ndarray:
+        x0, x1 = (float(value) for value in np.asarray(x_raw).reshape(-1))
+        y_raw = self.interpolate(x0, x1)
+        if y_raw is None:
+            self.fallback_calls += 1
+            return self.fallback.predict_array(x_raw)
+        return np.array(y_raw, dtype=np.float32)
+
+    def predict_batch(self, x_raw: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        # Interpolated rows carry no ensemble spread, so their std is zero.
+        x_raw = np.asarray(x_raw, dtype=np.float64).reshape(-1, 2)
+        axis_0, axis_1, values = self.grid
+        inside = (
+            (x_raw[:, 0] >= axis_0[0]) & (x_raw[:, 0] <= axis_0[-1])
+            & (x_raw[:, 1] >= axis_1[0]) & (x_raw[:, 1] <= axis_1[-1])
+        )
+        y_raw = np.empty((len(x_raw), values.shape[-1]), dtype=np.float32)
+        y_raw_std = np.zeros_like(y_raw)
+        y_raw[inside] = bilinear_interpolate(axis_0, axis_1, values, x_raw[inside])
+        if not inside.all():
+            self.fallback_calls += 1
+            y_raw[~inside], y_raw_std[~inside] = self.fallback.predict_batch(x_raw[~inside])
+        return y_raw, y_raw_std
+
+    def predict_from_dict(self, inputs: dict[str, float]) -> dict[str, float]:
+        missing = [k for k in self.input_keys if k not in inputs]
+        if missing:
+            raise ValueError(f"Missing input keys: {missing}")
+
+        key_0, key_1 = self.input_keys
+        y_raw = self.interpolate(float(inputs[key_0]), float(inputs[key_1]))
+        if y_raw is None:
+            self.fallback_calls += 1
+            return self.fallback.predict_from_dict(inputs)
+        return dict(zip(self.output_keys, y_raw))
+
+    def predict_with_display_names(self, inputs: dict[str, float]) -> dict[str, float]:
+        y_by_key = self.predict_from_dict(inputs)
+
+        return {
+            spec["display_name"]: y_by_key[spec["key"]]
+            for spec in self.output_specs
+        }
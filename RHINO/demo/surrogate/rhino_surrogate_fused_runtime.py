@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import numpy as np
+
+
+class FusedRhinoSurrogate:
+    """Serve an exported surrogate graph that maps physical inputs to outputs.
+
+    Normalization is folded into the graph by exportSurrogate.py, so a
+    prediction is one graph call. TorchScript graphs (.ts) need only torch;
+    ONNX graphs (.onnx) need only onnxruntime.
+    """
+
+    def __init__(self, graph_path: str | Path, device: str = "cpu"):
+        graph_path = Path(graph_path)
+        metadata = json.loads(graph_path.with_suffix(".json").read_text())
+
+        self.input_keys = metadata["input_columns"]
+        self.output_keys = metadata["output_columns"]
+        self.ensemble_size = metadata.get("ensemble_size", 1)
+        self.input_specs = metadata.get(
+            "input_specs", [{"key": key, "display_name": key} for key in self.input_keys]
+        )
+        self.output_specs = metadata.get(
+            "output_specs", [{"key": key, "display_name": key} for key in self.output_keys]
+        )
+        self.input_display_names = [spec["display_name"] for spec in self.input_specs]
+        self.output_display_names = [spec["display_name"] for spec in self.output_specs]
+
+        if graph_path.suffix == ".onnx":
+            try:
+                import onnxruntime
+            except ImportError as error:
+                raise RuntimeError(
+                    "An ONNX surrogate was requested but onnxruntime is not installed"
+                ) from error
+
+            session = onnxruntime.InferenceSession(
+                str(graph_path), providers=["CPUExecutionProvider"]
+            )
+            self._run = lambda x: session.run(None, {"inputs": x})[0]
+        else:
+            import torch
+
+            module = torch.jit.load(str(graph_path), map_location=device).eval()
+            torch_device = torch.device(device)
+
+            def run(x: np.ndarray) -> np.ndarray:
+                with torch.inference_mode():
+                    return module(torch.from_numpy(x).to(torch_device)).cpu().numpy()
+
+            self._run = run
+
+    def predict_batch(self, x_raw: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        x_raw = np.ascontiguousarray(x_raw, dtype=np.float32).reshape(-1, len(self.input_keys))
+        y = self._run(x_raw)
+        outputs = len(self.output_keys)
+        if self.ensemble_size > 1:
+            return y[:, :outputs], y[:, outputs:]
+        return y, np.zeros_like(y)
+
+    def predict_array(self, x_raw: np.ndarray) -> np.ndarray:
+        x_raw = np.asarray(x_raw, dtype=np.float32).reshape(1, -1)
+
+        if x_raw.shape[1] != len(self.input_keys):
+            raise ValueError(
+                f"Expected {len(self.input_keys)} inputs, got {x_raw.shape[1]}"
+            )
+
+        return self.predict_batch(x_raw)[0].reshape(-1)
+
+    def predict_from_dict(self, inputs: dict[str, float]) -> dict[str, float]:
+        missing = [k for k in self.input_keys if k not in inputs]
+        if missing:
+            raise ValueError(f"Missing input keys: {missing}")
+
+        x_raw = np.array([[inputs[k] for k in self.input_keys]], dtype=np.float32)
+        y_raw = self.predict_array(x_raw)
+
+        return {key: float(value) for key, value in zip(self.output_keys, y_raw)}
+
+    def predict_with_display_names(self, inputs: dict[str, float]) -> dict[str, float]:
+        y_by_key = self.predict_from_dict(inputs)
+
+        return {
+            spec["display_name"]: y_by_key[spec["key"]]
+            for spec in self.output_specs
+        }
+
+    def predict_with_uncertainty(self, inputs: dict[str, float]) -> dict[str, dict[str, float]]:
+        missing = [k for k in self.input_keys if k not in inputs]
+        if missing:
+            raise ValueError(f"Missing input keys: {missing}")
+
+        x_raw = np.array([[inputs[k] for k in self.input_keys]], dtype=np.float32)
+        y_mean, y_std = self.predict_batch(x_raw)
+
+        return {
+            spec["display_name"]: {"mean": float(mean), "std": float(std)}
+            for spec, mean, std in zip(self.output_specs, y_mean[0], y_std[0])
+        }
@@ -31,8 +31,13 @@ class RhinoSurrogate:
         artifact = torch.load(artifact_path, map_location=self.device)
 
         self.model_config = artifact["model_config"]
-        self.input_specs = artifact["input_specs"]
-        self.output_specs = artifact["output_specs"]
+        if "input_specs" in artifact:
+            self.input_specs = artifact["input_specs"]
+            self.output_specs = artifact["output_specs"]
+        else:
+            # Older trainSurrogate.py artifacts only name their columns.
+            self.input_specs = [{"key": key, "display_name": key} for key in artifact["input_columns"]]
+            self.output_specs = [{"key": key, "display_name": key} for key in artifact["output_columns"]]
 
         self.model = SurrogateMLP(
             input_dim=self.model_config["input_dim"],
@@ -44,6 +49,13 @@ class RhinoSurrogate:
         self.model.load_state_dict(artifact["model_state_dict"])
         self.model.eval()
 
+        # Ensemble artifacts stack every member's parameters along a first axis.
+        self.ensemble_state = artifact.get("ensemble_state_dict")
+        if self.ensemble_state is not None:
+            self.ensemble_state = {
+                name: tensor.to(self.device) for name, tensor in self.ensemble_state.items()
+            }
+
         self.x_mean = artifact["x_mean"].detach().cpu().numpy().reshape(1, -1).astype(np.float32)
         self.x_std  = artifact["x_std"].detach().cpu().numpy().reshape(1, -1).astype(np.float32)
         self.y_mean = artifact["y_mean"].detach().cpu().numpy().reshape(1, -1).astype(np.float32)
@@ -62,14 +74,36 @@ class RhinoSurrogate:
                 f"Expected {len(self.input_specs)} inputs, got {x_raw.shape[1]}"
             )
 
+        return self.predict_array_with_std(x_raw)[0]
+
+    def predict_array_with_std(self, x_raw: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        x_raw = np.asarray(x_raw, dtype=np.float32).reshape(1, -1)
+
+        if x_raw.shape[1] != len(self.input_specs):
+            raise ValueError(
+                f"Expected {len(self.input_specs)} inputs, got {x_raw.shape[1]}"
+            )
+
+        y_raw, y_raw_std = self.predict_batch(x_raw)
+        return y_raw.reshape(-1), y_raw_std.reshape(-1)
+
+    def predict_batch(self, x_raw: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        x_raw = np.asarray(x_raw, dtype=np.float32).reshape(-1, len(self.input_specs))
         x_norm = (x_raw - self.x_mean) / self.x_std
         x_tensor = torch.tensor(x_norm, dtype=torch.float32, device=self.device)
 
         with torch.no_grad():
-            y_norm = self.model(x_tensor).detach().cpu().numpy()
-
-        y_raw = y_norm * self.y_std + self.y_mean
-        return y_raw.reshape(-1)
+            if self.ensemble_state is None:
+                y_norm = self.model(x_tensor).detach().cpu().numpy()
+                y_norm_std = np.zeros_like(y_norm)
+            else:
+                members = torch.func.vmap(
+                    lambda params: torch.func.functional_call(self.model, params, (x_tensor,))
+                )(self.ensemble_state)
+                y_norm = members.mean(dim=0).cpu().numpy()
+                y_norm_std = members.std(dim=0, unbiased=False).cpu().numpy()
+
+        return y_norm * self.y_std + self.y_mean, y_norm_std * self.y_std
 
     def predict_from_dict(self, inputs: dict[str, float]) -> dict[str, float]:
         missing = [k for k in self.input_keys if k not in inputs]
@@ -84,6 +118,19 @@ class RhinoSurrogate:
             for spec, value in zip(self.output_specs, y_raw)
         }
 
+    def predict_with_uncertainty(self, inputs: dict[str, float]) -> dict[str, dict[str, float]]:
+        missing = [k for k in self.input_keys if k not in inputs]
+        if missing:
+            raise ValueError(f"Missing input keys: {missing}")
+
+        x_raw = np.array([[inputs[k] for k in self.input_keys]], dtype=np.float32)
+        y_mean, y_std = self.predict_array_with_std(x_raw)
+
+        return {
+            spec["display_name"]: {"mean": float(mean), "std": float(std)}
+            for spec, mean, std in zip(self.output_specs, y_mean, y_std)
+        }
+
     def predict_from_named_args(
         self,
         Ndotminus: float,
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import torch
+
+
+class RhinoTrajectorySurrogate:
+    """Predict the Tritium inventory of every subsystem over time.
+
+    The artifact from train_trajectory_surrogate.py maps inputs to coefficients
+    of a PCA basis. Loading folds the network's last layer into that basis, so
+    after the hidden layers a whole (subsystems x time) trajectory is one
+    matrix multiply. The plant topology is stored with the model, so graph
+    payloads need no simulation files.
+    """
+
+    def __init__(self, artifact_path: str | Path):
+        artifact = torch.load(artifact_path, map_location="cpu")
+
+        self.input_specs = artifact["input_specs"]
+        self.input_keys = [spec["key"] for spec in self.input_specs]
+        self.trajectory_shape = tuple(artifact["trajectory_shape"])
+        self.times = artifact["times"].numpy()
+        self.downsample_step = artifact["downsample_step"]
+        self.explained_variance = artifact["explained_variance"]
+        self.metrics = artifact["metrics"]
+        self.names_map = {index: name for name, index in artifact["subsystems"].items()}
+        self.injectors_map = {int(index): value for index, value in artifact["injectors"].items()}
+        self.flows_map = {int(index): value for index, value in artifact["flows"].items()}
+
+        self.x_mean = artifact["x_mean"].numpy().reshape(1, -1).astype(np.float32)
+        self.x_std = artifact["x_std"].numpy().reshape(1, -1).astype(np.float32)
+
+        # state_dict entries alternate weight, bias for net.0, net.2, ...
+        state = [tensor.numpy() for tensor in artifact["model_state_dict"].values()]
+        weights, biases = state[0::2], state[1::2]
+        self.hidden_layers = [(w.T.copy(), b) for w, b in zip(weights[:-1], biases[:-1])]
+        basis = artifact["basis"].numpy()
+        self.reconstruction_weight = weights[-1].T @ basis
+        self.reconstruction_bias = biases[-1] @ basis + artifact["offset"].numpy()
+
+    def predict_trajectories(self, x_raw: np.ndarray) -> np.ndarray:
+        x_raw = np.asarray(x_raw, dtype=np.float32).reshape(-1, len(self.input_keys))
+        hidden = (x_raw - self.x_mean) / self.x_std
+        for weight, bias in self.hidden_layers:
+            hidden = np.maximum(hidden @ weight + bias, 0.0)
+        flat = hidden @ self.reconstruction_weight + self.reconstruction_bias
+        return flat.reshape(-1, *self.trajectory_shape)
+
+    def predict_trajectory(self, inputs: dict[str, float]) -> np.ndarray:
+        missing = [k for k in self.input_keys if k not in inputs]
+        if missing:
+            raise ValueError(f"Missing input keys: {missing}")
+
+        x_raw = np.array([[inputs[k] for k in self.input_keys]], dtype=np.float32)
+        return self.predict_trajectories(x_raw)[0]
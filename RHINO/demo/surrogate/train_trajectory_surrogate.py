@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import argparse
+import copy
+import json
+from pathlib import Path
+
+import numpy as np
+import torch
+import torch.nn as nn
+
+from RHINO.demo.surrogate.rhino_surrogate_runtime import SurrogateMLP
+
+BASE_DIR = Path(__file__).resolve().parent
+DATA_DIR = BASE_DIR / "data"
+
+
+def fit_basis(
+    y_train: np.ndarray, components: int | None, variance: float
+) -> tuple[np.ndarray, np.ndarray]:
+    # Rows of `basis` are the leading right singular vectors of the centered data.
+    _, singular_values, vt = np.linalg.svd(y_train, full_matrices=False)
+    explained = singular_values**2 / np.sum(singular_values**2)
+    if components is None:
+        components = int(np.searchsorted(np.cumsum(explained), variance) + 1)
+    components = min(components, len(explained))
+    return vt[:components], explained[:components]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Train a surrogate for the full Tritium inventory trajectory: an MLP "
+            "maps the inputs to coefficients of a PCA basis fitted on the campaign."
+        )
+    )
+    parser.add_argument("--dataset", type=Path, default=DATA_DIR / "rhino_trajectories.npz")
+    parser.add_argument(
+        "--output", type=Path, default=DATA_DIR / "rhino_trajectory_surrogate.pt"
+    )
+    parser.add_argument(
+        "--components",
+        type=int,
+        default=None,
+        help="Basis size; by default the smallest one reaching --variance.",
+    )
+    parser.add_argument(
+        "--variance",
+        type=float,
+        default=0.99999,
+        help="Fraction of the scaled trajectory variance the basis must keep.",
+    )
+    parser.add_argument("--hidden-dim", type=int, default=100)
+    parser.add_argument("--num-hidden-layers", type=int, default=3)
+    parser.add_argument("--epochs", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--lr", type=float, default=1e-3)
+    parser.add_argument("--val-fraction", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    if args.components is not None and args.components < 1:
+        raise ValueError("components must be >= 1")
+    if not 0.0 < args.variance <= 1.0:
+        raise ValueError("variance must be in (0, 1]")
+    if not 0.0 < args.val_fraction < 1.0:
+        raise ValueError("val_fraction must be between 0 and 1")
+
+    torch.manual_seed(args.seed)
+    with np.load(args.dataset) as dataset:
+        x = dataset["inputs"].astype(np.float32)
+        mass = dataset["mass"].astype(np.float64)
+        times = dataset["times"]
+        metadata = json.loads(str(dataset["metadata"]))
+
+    runs, subsystems, samples = mass.shape
+    order = np.random.default_rng(args.seed).permutation(runs)
+    n_val = max(1, int(round(args.val_fraction * runs)))
+    val_idx, train_idx = order[:n_val], order[n_val:]
+
+    # Scale each subsystem by its spread so small inventories still shape the basis.
+    mass_mean = mass[train_idx].mean(axis=0)
+    mass_scale = mass[train_idx].std(axis=(0, 2))
+    mass_scale[mass_scale < 1e-12] = 1.0
+    y = ((mass - mass_mean) / mass_scale[:, None]).reshape(runs, -1)
+    basis, explained = fit_basis(y[train_idx], args.components, args.variance)
+    coefficients = y @ basis.T
+    coefficient_std = coefficients[train_idx].std(axis=0)
+    coefficient_std[coefficient_std < 1e-12] = 1.0
+
+    x_mean = x[train_idx].mean(axis=0, keepdims=True)
+    x_std = x[train_idx].std(axis=0, keepdims=True)
+    x_std[x_std < 1e-12] = 1.0
+    x_t = torch.tensor((x - x_mean) / x_std, dtype=torch.float32)
+    c_t = torch.tensor(coefficients / coefficient_std, dtype=torch.float32)
+
+    model = SurrogateMLP(
+        input_dim=x.shape[1],
+        output_dim=len(basis),
+        hidden_dim=args.hidden_dim,
+        num_hidden_layers=args.num_hidden_layers,
+    )
+    optimizer = torch.optim.Adam(model.parameters(), lr=args.lr)
+    criterion = nn.MSELoss()
+    train_t = torch.as_tensor(train_idx)
+    best_val_loss = float("inf")
+    best_state = copy.deepcopy(model.state_dict())
+
+    for epoch in range(1, args.epochs + 1):
+        model.train()
+        for batch in train_t[torch.randperm(len(train_t))].split(args.batch_size):
+            optimizer.zero_grad()
+            loss = criterion(model(x_t[batch]), c_t[batch])
+            loss.backward()
+            optimizer.step()
+
+        model.eval()
+        with torch.no_grad():
+            val_loss = criterion(model(x_t[val_idx]), c_t[val_idx]).item()
+        if val_loss < best_val_loss:
+            best_val_loss = val_loss
+            best_state = copy.deepcopy(model.state_dict())
+        if epoch % 200 == 0:
+            print(f"Epoch {epoch:5d} | val_loss = {val_loss:.6f}")
+
+    model.load_state_dict(best_state)
+    model.eval()
+
+    # Fold coefficient and subsystem scaling into the basis: trajectory = c @ basis + offset.
+    scale_flat = np.repeat(mass_scale, samples)
+    physical_basis = coefficient_std[:, None] * basis * scale_flat[None, :]
+    offset = mass_mean.reshape(-1)
+
+    with torch.no_grad():
+        c_pred = model(x_t[val_idx]).numpy().astype(np.float64)
+    predicted = (c_pred @ physical_basis + offset).reshape(-1, subsystems, samples)
+    projected = (
+        (coefficients[val_idx] / coefficient_std) @ physical_basis + offset
+    ).reshape(-1, subsystems, samples)
+    truth = mass[val_idx]
+    metrics = {
+        "val_rmse": float(np.sqrt(np.mean((predicted - truth) ** 2))),
+        "val_max_abs_error": float(np.max(np.abs(predicted - truth))),
+        "val_projection_rmse": float(np.sqrt(np.mean((projected - truth) ** 2))),
+        "val_coefficient_mse": best_val_loss,
+    }
+
+    artifact = {
+        "model_state_dict": model.state_dict(),
+        "model_config": {
+            "input_dim": x.shape[1],
+            "output_dim": len(basis),
+            "hidden_dim": args.hidden_dim,
+            "num_hidden_layers": args.num_hidden_layers,
+        },
+        "input_specs": metadata["input_specs"],
+        "x_mean": torch.tensor(x_mean, dtype=torch.float32),
+        "x_std": torch.tensor(x_std, dtype=torch.float32),
+        "basis": torch.tensor(physical_basis, dtype=torch.float32),
+        "offset": torch.tensor(offset, dtype=torch.float32),
+        "explained_variance": explained.tolist(),
+        "trajectory_shape": [subsystems, samples],
+        "times": torch.tensor(times, dtype=torch.float64),
+        "downsample_step": metadata["downsample_step"],
+        "subsystems": metadata["subsystems"],
+        "injectors": metadata["injectors"],
+        "flows": metadata["flows"],
+        "metrics": metrics,
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    torch.save(artifact, args.output)
+
+    print(
+        f"\nBasis: {len(basis)} components keep "
+        f"{explained.sum():.6%} of the scaled variance"
+    )
+    for name, value in metrics.items():
+        print(f"{name}: {value:.6g}")
+    print(args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,15 @@
 #!/usr/bin/env python3
 
 import argparse
-import re
-import sqlite3
+from functools import partial
 from pathlib import Path
 
-import pandas as pd
+from rhino.campaign.attribute_cache import (
+    attach_attribute_cache,
+    is_attribute_cache_current,
+    parse_attribute_value,
+)
+from rhino.campaign.query_cache import CachedQueryRunner
 
 
 INPUT_SPECS = [
@@ -49,24 +53,18 @@ OUTPUT_SPECS = [
 
 
 def clean_numeric(value):
-    if value is None:
-        return None
-
-    s = str(value).strip()
-
-    # Handles values like:
+    # Same parsing as the typed attribute cache, so a feature does not depend
+    # on whether the cache exists. Handles values like:
     # [26.557]
     # {272.634}
     # 7.8488
     # "7.8488"
-    match = re.search(r"[-+]?\d*\.?\d+(?:[eE][-+]?\d+)?", s)
-    if not match:
-        return None
-
-    return float(match.group(0))
+    # Anything other than exactly one number, e.g. [26.5, 3.1] or 12 g,
+    # is missing.
+    return parse_attribute_value(value)[0]
 
 
-def build_training_dataset(db_path, archive_like):
+def build_training_dataset(db_path, archive_like, query_cache=None):
     specs = INPUT_SPECS + OUTPUT_SPECS
 
     attr_to_key = {
@@ -78,32 +76,42 @@ def build_training_dataset(db_path, archive_like):
     attr_names = list(attr_to_key.keys())
     placeholders = ",".join(["?"] * len(attr_names))
 
+    use_cache = is_attribute_cache_current(db_path)
+    # The typed cache holds values parsed once when the index was built.
+    attribute_table = "typed.attribute_values" if use_cache else "attributes"
+    value_column = "av.value_real" if use_cache else "av.value"
+
     query = f"""
     SELECT
       d.datasetid,
       d.dsid,
       d.name AS dataset,
       a.name AS archive,
-      at.name AS attribute_name,
-      at.value AS raw_value
+      av.name AS attribute_name,
+      {value_column} AS raw_value
     FROM datasets d
     JOIN archives a
       ON d.archiveid = a.archiveid
-    JOIN attributes at
-      ON at.archiveid = d.archiveid
-     AND at.datasetid = d.datasetid
+    JOIN {attribute_table} av
+      ON av.archiveid = d.archiveid
+     AND av.datasetid = d.datasetid
     WHERE a.name LIKE ?
-      AND at.name IN ({placeholders})
-    ORDER BY a.name, d.datasetid, at.name;
+      AND av.name IN ({placeholders})
+    ORDER BY a.name, d.datasetid, av.name;
     """
 
     params = [archive_like] + attr_names
 
-    with sqlite3.connect(db_path) as conn:
-        long_df = pd.read_sql_query(query, conn, params=params)
+    # With a query cache, repeated extractions from the same index skip SQLite.
+    prepare = partial(attach_attribute_cache, index_path=db_path) if use_cache else None
+    with CachedQueryRunner(db_path, query_cache, prepare=prepare) as runner:
+        long_df = runner.read_sql(query, params)
 
     long_df["variable"] = long_df["attribute_name"].map(attr_to_key)
-    long_df["value"] = long_df["raw_value"].apply(clean_numeric)
+    if use_cache:
+        long_df["value"] = long_df["raw_value"]
+    else:
+        long_df["value"] = long_df["raw_value"].apply(clean_numeric)
 
     wide_df = (
         long_df.pivot_table(
@@ -144,6 +152,11 @@ def main():
         default="rhino_surrogate_dataset.csv",
         help="Output CSV path",
     )
+    parser.add_argument(
+        "--query-cache",
+        default=None,
+        help="Directory for cached query results (default: no caching)",
+    )
     parser.add_argument(
         "--drop-missing",
         action="store_true",
@@ -152,7 +165,7 @@ def main():
 
     args = parser.parse_args()
 
-    df = build_training_dataset(args.db, args.archive_like)
+    df = build_training_dataset(args.db, args.archive_like, args.query_cache)
 
     if args.drop_missing:
         model_columns = [spec["key"] for spec in INPUT_SPECS + OUTPUT_SPECS]
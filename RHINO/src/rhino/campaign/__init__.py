@@ -0,0 +1 @@
+"""Campaign-index helpers shared by the RHINO campaign and feature layers."""
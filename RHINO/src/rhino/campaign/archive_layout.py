@@ -0,0 +1,37 @@
+"""Run identities and archive grouping of RHINO BP5 datasets in a campaign.
+
+``create_archives.py`` packages datasets with these rules, and the BP5 feature
+source applies the same ones, so both give every run the same ``archive``,
+``datasetid``, and ``run_id``.
+"""
+
+from __future__ import annotations
+
+import re
+from pathlib import Path
+
+
+RUN_ID_PATTERN = re.compile(r"\d{2}-\d{2}-\d{2}.*")
+
+
+def run_id_from_path(dataset: Path) -> str:
+    """Derive a RHINO run identifier from a BP5 dataset name."""
+    match = RUN_ID_PATTERN.search(dataset.stem)
+    return match.group(0) if match else dataset.stem
+
+
+def locate_dataset(
+    dataset_number: int, archive_prefix: str, archive_size: int
+) -> tuple[int, str, int]:
+    """Return the archive number, archive name, and dataset ID of a dataset.
+
+    `dataset_number` is the zero-based position of the dataset among all
+    datasets sorted by path. Archives hold `archive_size` consecutive datasets
+    and are numbered from one; dataset IDs count from one within an archive.
+    """
+    archive_number = dataset_number // archive_size + 1
+    return (
+        archive_number,
+        f"{archive_prefix}{archive_number}.aca",
+        dataset_number % archive_size + 1,
+    )
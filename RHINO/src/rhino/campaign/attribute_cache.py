@@ -0,0 +1,184 @@
+"""Typed attribute cache stored alongside an HPC Campaign ``.acx`` index.
+
+The campaign index keeps every attribute value as text such as ``[26.557]``,
+so numeric filters have to parse each value and cannot use an index. The cache
+is a sidecar SQLite database with one row per (dataset, attribute) holding the
+parsed REAL and TEXT forms, indexed by attribute name and value. Attach it to
+an index connection as ``typed`` and query ``typed.attribute_values``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sqlite3
+from pathlib import Path
+
+
+CACHE_SCHEMA_VERSION = 1
+CACHE_ALIAS = "typed"
+CACHE_SUFFIX = ".attrs.sqlite"
+
+SCHEMA = """
+CREATE TABLE attribute_values (
+    archiveid INTEGER NOT NULL,
+    datasetid INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    value_real REAL,
+    value_text TEXT,
+    PRIMARY KEY (archiveid, datasetid, name)
+);
+CREATE TABLE cache_metadata (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+INDEXES = """
+CREATE INDEX attribute_values_name_real
+    ON attribute_values (name, value_real);
+CREATE INDEX attribute_values_name_text
+    ON attribute_values (name, value_text);
+"""
+
+
+def attribute_cache_path(index_path: str | Path) -> Path:
+    """Return the default cache path for a campaign index."""
+    index_path = Path(index_path)
+    return index_path.with_name(f"{index_path.name}{CACHE_SUFFIX}")
+
+
+def parse_attribute_value(value: object) -> tuple[float | None, str | None]:
+    """Return the REAL and TEXT forms of one stored attribute value.
+
+    Enclosing list brackets, set braces, and quotes are removed from the text
+    form. The REAL form is ``None`` unless the remaining text is one number.
+    """
+    if value is None:
+        return None, None
+
+    text = str(value).strip().strip("[]{}").strip().strip("\"'")
+    try:
+        return float(text), text
+    except ValueError:
+        return None, text
+
+
+def index_fingerprint(index_path: Path) -> dict[str, str]:
+    """Return metadata identifying the exact index file a cache was built from."""
+    status = index_path.stat()
+    return {
+        "schema_version": str(CACHE_SCHEMA_VERSION),
+        "index_size": str(status.st_size),
+        "index_mtime_ns": str(status.st_mtime_ns),
+    }
+
+
+def build_attribute_cache(
+    index_path: str | Path,
+    cache_path: str | Path | None = None,
+) -> Path:
+    """Build or replace the typed attribute cache for a campaign index."""
+    index_path = Path(index_path)
+    if not index_path.is_file():
+        raise FileNotFoundError(f"Campaign index does not exist: {index_path}")
+    cache_path = (
+        attribute_cache_path(index_path) if cache_path is None else Path(cache_path)
+    )
+    partial_path = cache_path.with_name(f"{cache_path.name}.partial")
+    partial_path.unlink(missing_ok=True)
+
+    fingerprint = index_fingerprint(index_path)
+    source = sqlite3.connect(f"{index_path.resolve().as_uri()}?mode=ro", uri=True)
+    cache = sqlite3.connect(partial_path)
+    try:
+        # The partial file is discarded on failure, so skip the journal.
+        cache.execute("PRAGMA journal_mode = OFF")
+        cache.execute("PRAGMA synchronous = OFF")
+        cache.executescript(SCHEMA)
+        rows = source.execute(
+            "SELECT archiveid, datasetid, name, value FROM attributes"
+        )
+        cache.executemany(
+            "INSERT OR REPLACE INTO attribute_values VALUES (?, ?, ?, ?, ?)",
+            (
+                (archiveid, datasetid, name, *parse_attribute_value(value))
+                for archiveid, datasetid, name, value in rows
+            ),
+        )
+        cache.executescript(INDEXES)
+        cache.executemany(
+            "INSERT INTO cache_metadata VALUES (?, ?)", fingerprint.items()
+        )
+        cache.commit()
+        cache.execute("ANALYZE")
+    finally:
+        cache.close()
+        source.close()
+
+    partial_path.replace(cache_path)
+    return cache_path
+
+
+def is_attribute_cache_current(
+    index_path: str | Path,
+    cache_path: str | Path | None = None,
+) -> bool:
+    """Return whether a cache exists and matches the current index file."""
+    index_path = Path(index_path)
+    cache_path = (
+        attribute_cache_path(index_path) if cache_path is None else Path(cache_path)
+    )
+    if not cache_path.is_file():
+        return False
+
+    cache = sqlite3.connect(f"{cache_path.resolve().as_uri()}?mode=ro", uri=True)
+    try:
+        stored = dict(cache.execute("SELECT key, value FROM cache_metadata"))
+    except sqlite3.DatabaseError:
+        return False
+    finally:
+        cache.close()
+    return stored == index_fingerprint(index_path)
+
+
+def attach_attribute_cache(
+    connection: sqlite3.Connection,
+    index_path: str | Path,
+    cache_path: str | Path | None = None,
+) -> None:
+    """Attach the current typed attribute cache to an index connection."""
+    index_path = Path(index_path)
+    cache_path = (
+        attribute_cache_path(index_path) if cache_path is None else Path(cache_path)
+    )
+    if not cache_path.is_file():
+        raise FileNotFoundError(
+            f"Typed attribute cache does not exist: {cache_path}. "
+            f"Build it with: rhino-attribute-cache {index_path}"
+        )
+    if not is_attribute_cache_current(index_path, cache_path):
+        raise ValueError(
+            f"Typed attribute cache is older than its index: {cache_path}. "
+            f"Rebuild it with: rhino-attribute-cache {index_path}"
+        )
+    connection.execute(f"ATTACH DATABASE ? AS {CACHE_ALIAS}", (str(cache_path),))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Build the typed attribute cache for a campaign index."
+    )
+    parser.add_argument("index", type=Path, help="Campaign index (.acx).")
+    parser.add_argument(
+        "--output",
+        type=Path,
+        help=f"Cache path (default: <index>{CACHE_SUFFIX}).",
+    )
+    args = parser.parse_args()
+
+    cache_path = build_attribute_cache(args.index, args.output)
+    print(f"Typed attribute cache written to: {cache_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""On-disk cache of SQL query results against an HPC Campaign ``.acx`` index.
+
+Results are stored as pickled DataFrames in a cache directory, one file per
+(index fingerprint, SQL text, bound parameters). Any change to the index file
+changes its fingerprint, so stale results are never returned; they age out
+through least-recently-used eviction once the directory exceeds its size bound.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+from pathlib import Path
+from typing import Any, Callable
+
+import pandas as pd
+
+
+QUERY_CACHE_SUFFIX = ".query-cache"
+RESULT_SUFFIX = ".pkl"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+PROGRESS_STEPS = 1000
+
+
+def query_cache_dir(index_path: str | Path) -> Path:
+    """Return the default result cache directory for a campaign index."""
+    index_path = Path(index_path)
+    return index_path.with_name(f"{index_path.name}{QUERY_CACHE_SUFFIX}")
+
+
+def query_cache_key(index_path: str | Path, sql: str, params: Any = None) -> str:
+    """Return the cache key of one query against the current index file."""
+    index_path = Path(index_path).resolve()
+    status = index_path.stat()
+    if isinstance(params, dict):
+        params = sorted(params.items())
+    elif params is not None:
+        params = list(params)
+    document = {
+        "index": str(index_path),
+        "index_size": status.st_size,
+        "index_mtime_ns": status.st_mtime_ns,
+        "sql": sql,
+        "params": params,
+    }
+    encoded = json.dumps(document, default=str, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def load_cached_result(cache_dir: str | Path, key: str) -> pd.DataFrame | None:
+    """Return a cached result and mark it as recently used, or ``None``.
+
+    A result that cannot be unpickled, for example one truncated by a crash or
+    written by an incompatible pandas, is deleted and treated as a miss.
+    """
+    path = Path(cache_dir) / f"{key}{RESULT_SUFFIX}"
+    try:
+        frame = pd.read_pickle(path)
+    except FileNotFoundError:
+        return None
+    except (EOFError, pickle.UnpicklingError, ValueError, AttributeError):
+        path.unlink(missing_ok=True)
+        return None
+    os.utime(path)
+    return frame
+
+
+def evict_query_cache(cache_dir: str | Path, max_bytes: int) -> int:
+    """Delete least-recently-used results until the cache fits in `max_bytes`.
+
+    Returns the number of results removed.
+    """
+    entries = []
+    for path in Path(cache_dir).glob(f"*{RESULT_SUFFIX}"):
+        try:
+            status = path.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((status.st_mtime_ns, status.st_size, path))
+
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+        removed += 1
+    return removed
+
+
+def store_cached_result(
+    cache_dir: str | Path,
+    key: str,
+    frame: pd.DataFrame,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+) -> None:
+    """Store one result atomically, then evict old results over `max_bytes`."""
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    path = cache_dir / f"{key}{RESULT_SUFFIX}"
+    partial_path = path.with_name(f"{path.name}.{os.getpid()}.partial")
+    frame.to_pickle(partial_path)
+    partial_path.replace(path)
+    evict_query_cache(cache_dir, max_bytes)
+
+
+class CachedQueryRunner:
+    """Run read-only SQL against a campaign index through the result cache.
+
+    The index is opened on the first cache miss, so fully cached workloads do
+    not touch SQLite. `prepare` is called with the new connection, for example
+    to attach the typed attribute cache. Without `cache_dir`, every query runs
+    against the index. `vm_steps` approximates the SQLite virtual-machine
+    instructions executed, in units of ``PROGRESS_STEPS``, as a measure of the
+    rows scanned.
+    """
+
+    def __init__(
+        self,
+        index_path: str | Path,
+        cache_dir: str | Path | None = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        prepare: Callable[[sqlite3.Connection], None] | None = None,
+    ) -> None:
+        self.index_path = Path(index_path)
+        self.cache_dir = None if cache_dir is None else Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.prepare = prepare
+        self.connection: sqlite3.Connection | None = None
+        self.hits = 0
+        self.misses = 0
+        self.vm_steps = 0
+
+    def read_sql(self, sql: str, params: Any = None) -> pd.DataFrame:
+        """Return the result of one query, from the cache when possible."""
+        key = None
+        if self.cache_dir is not None:
+            key = query_cache_key(self.index_path, sql, params)
+            frame = load_cached_result(self.cache_dir, key)
+            if frame is not None:
+                self.hits += 1
+                return frame
+
+        if self.connection is None:
+            self.connection = sqlite3.connect(self.index_path)
+            self.connection.set_progress_handler(
+                self._count_progress, PROGRESS_STEPS
+            )
+            if self.prepare is not None:
+                self.prepare(self.connection)
+        frame = pd.read_sql_query(sql, self.connection, params=params)
+        self.misses += 1
+        if key is not None:
+            store_cached_result(self.cache_dir, key, frame, self.max_bytes)
+        return frame
+
+    def _count_progress(self) -> int:
+        self.vm_steps += PROGRESS_STEPS
+        return 0
+
+    def close(self) -> None:
+        """Close the index connection if a query opened it."""
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def __enter__(self) -> CachedQueryRunner:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
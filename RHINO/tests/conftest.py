@@ -0,0 +1,142 @@
+import json
+import shutil
+import sqlite3
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+RHINO_ROOT = Path(__file__).resolve().parents[1]
+
+# The demo is imported as RHINO.demo.surrogate from the repository root.
+sys.path.insert(0, str(RHINO_ROOT.parent))
+
+# The workflow scripts import their siblings by name rather than as packages.
+for script_dir in (
+    RHINO_ROOT / "AI_ready_workflow" / "2_campaign",
+    RHINO_ROOT / "AI_ready_workflow" / "3_feature_extraction",
+    RHINO_ROOT / "ML" / "surrogate_training",
+    RHINO_ROOT / "scripts",
+):
+    sys.path.insert(0, str(script_dir))
+
+
+RUN_IDS = ["11-00-38", "11-00-39", "11-00-40", "11-00-41", "11-00-42"]
+SMALL_CAMPAIGN_SPECS = [
+    {
+        "key": "burn_fraction",
+        "role": "input",
+        "source": "campaign_sql",
+        "attribute": "/input:beta:Burn fraction",
+        "value_type": "real",
+    },
+    {
+        "key": "minimum_startup_inventory_g",
+        "role": "output",
+        "source": "campaign_sql",
+        "attribute": "/output:I_startup (g)",
+        "value_type": "real",
+    },
+    {
+        "key": "tritium_in_isotope_separation",
+        "role": "output",
+        "source": "campaign_adios",
+        "variable": "/data/inventory/Tritium/mass_steady",
+        "index": 1,
+    },
+    {
+        "key": "blanket_peak_inventory",
+        "role": "output",
+        "source": "campaign_adios_timeseries",
+        "variable": "/data/inventory/Tritium/mass",
+        "index": 0,
+        "reduction": "max",
+    },
+]
+
+
+@pytest.fixture(scope="session")
+def small_campaign(tmp_path_factory):
+    """Five BP5 runs, their campaign archives of two runs each, and an index.
+
+    The archives are made with ``hpc_campaign manager`` as create_archives.py
+    does. The index holds the tables ``hpc_campaign index`` would write for
+    the attributes of every run.
+    """
+    adios2 = pytest.importorskip("adios2")
+    if shutil.which("hpc_campaign") is None:
+        pytest.skip("hpc_campaign is not installed")
+    from create_archives import create_campaign_archives
+    from rhino.campaign.archive_layout import run_id_from_path
+
+    tmp_path = tmp_path_factory.mktemp("small_campaign")
+    data_root = tmp_path / "data"
+    run_directory = data_root / "2026-04-29"
+    run_directory.mkdir(parents=True)
+    times = np.linspace(0.0, 10.0, 21)
+    attributes = {}
+    for number, run_id in enumerate(RUN_IDS):
+        mass = np.stack([times * (number + 1), 5.0 - times / (number + 2)])
+        attributes[run_id] = {
+            "/input:beta:Burn fraction": [0.01 * (number + 1)],
+            "/output:I_startup (g)": [1000.0 + 10.0 * number],
+        }
+        with adios2.Stream(str(run_directory / f"rhino_{run_id}.bp5"), "w") as stream:
+            for name, value in attributes[run_id].items():
+                stream.write_attribute(name, value)
+            for name, data in (
+                ("/data/inventory/Times/data", times),
+                ("/data/inventory/Tritium/mass", mass),
+                ("/data/inventory/Tritium/mass_steady", mass[:, -1].copy()),
+            ):
+                stream.write(
+                    name, data, list(data.shape), [0] * data.ndim, list(data.shape)
+                )
+
+    campaign_store = tmp_path / "store"
+    campaign_store.mkdir()
+    datasets = sorted(run_directory.glob("*.bp5"), key=str)
+    archive_datasets = create_campaign_archives(
+        datasets=datasets,
+        data_root=data_root,
+        campaign_store=campaign_store,
+        archive_prefix="rhino",
+        archive_size=2,
+        dry_run=False,
+    )
+
+    index_path = tmp_path / "rhino.acx"
+    with sqlite3.connect(index_path) as connection:
+        connection.execute("CREATE TABLE archives (archiveid, name)")
+        connection.execute("CREATE TABLE datasets (archiveid, datasetid, dsid, name)")
+        connection.execute(
+            "CREATE TABLE attributes (archiveid, datasetid, name, value)"
+        )
+        for archiveid, (archive, paths) in enumerate(
+            sorted(archive_datasets.items()), start=1
+        ):
+            connection.execute(
+                "INSERT INTO archives VALUES (?, ?)", (archiveid, archive)
+            )
+            for datasetid, path in enumerate(paths, start=1):
+                run_id = run_id_from_path(path)
+                connection.execute(
+                    "INSERT INTO datasets VALUES (?, ?, ?, ?)",
+                    (archiveid, datasetid, f"uuid-{run_id}", run_id),
+                )
+                connection.executemany(
+                    "INSERT INTO attributes VALUES (?, ?, ?, ?)",
+                    (
+                        (archiveid, datasetid, name, json.dumps(value))
+                        for name, value in attributes[run_id].items()
+                    ),
+                )
+    connection.close()
+    return {
+        "data_root": data_root,
+        "campaign_store": campaign_store,
+        "index": index_path,
+        "query_dir": tmp_path,
+        "specs": [dict(spec) for spec in SMALL_CAMPAIGN_SPECS],
+    }
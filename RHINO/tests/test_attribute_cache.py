@@ -0,0 +1,56 @@
+import sqlite3
+
+import pytest
+
+from rhino.campaign.attribute_cache import (
+    attach_attribute_cache,
+    build_attribute_cache,
+    is_attribute_cache_current,
+)
+
+
+def test_typed_cache_parses_values_and_tracks_index(tmp_path):
+    index_path = tmp_path / "rhino.acx"
+    with sqlite3.connect(index_path) as connection:
+        connection.execute(
+            "CREATE TABLE attributes (archiveid, datasetid, name, value)"
+        )
+        connection.executemany(
+            "INSERT INTO attributes VALUES (?, ?, ?, ?)",
+            [
+                (1, 1, "/output:I_startup (g)", "[2500.5]"),
+                (1, 2, "/output:I_startup (g)", "{1200}"),
+                (1, 1, "/date", '["2026-04-29 10:00:00"]'),
+            ],
+        )
+    connection.close()
+
+    cache_path = build_attribute_cache(index_path)
+    assert is_attribute_cache_current(index_path)
+
+    connection = sqlite3.connect(index_path)
+    attach_attribute_cache(connection, index_path)
+    rows = connection.execute(
+        "SELECT datasetid, value_real, value_text FROM typed.attribute_values "
+        "WHERE name = ? AND value_real > ? ORDER BY datasetid",
+        ("/output:I_startup (g)", 1000),
+    ).fetchall()
+    date = connection.execute(
+        "SELECT value_real, value_text FROM typed.attribute_values "
+        "WHERE name = '/date'"
+    ).fetchone()
+    connection.close()
+
+    assert rows == [(1, 2500.5, "2500.5"), (2, 1200.0, "1200")]
+    assert date == (None, "2026-04-29 10:00:00")
+
+    with sqlite3.connect(index_path) as connection:
+        connection.execute(
+            "INSERT INTO attributes VALUES (1, 3, '/output:I_startup (g)', '[9]')"
+        )
+    connection.close()
+
+    assert cache_path.is_file()
+    assert not is_attribute_cache_current(index_path)
+    with pytest.raises(ValueError, match="older than its index"):
+        attach_attribute_cache(sqlite3.connect(index_path), index_path)
@@ -0,0 +1,47 @@
+import pandas as pd
+import pytest
+
+from bp5_source import build_bp5_feature_table, discover_bp5_runs
+from campaign_reader import build_feature_table
+
+
+def small_layout(campaign):
+    return {
+        "RHINO_DATA_ROOT": str(campaign["data_root"]),
+        "INPUT_DIRS": ["2026-04-29"],
+        "ARCHIVE_PREFIX": "rhino",
+        "DATASETS_PER_ARCHIVE": 2,
+    }
+
+
+def test_bp5_runs_are_grouped_as_the_campaign_archives(small_campaign):
+    runs = discover_bp5_runs(small_layout(small_campaign))
+    assert [(run["archive"], run["datasetid"], run["run_id"]) for run in runs] == [
+        ("rhino1.aca", 1, "11-00-38"),
+        ("rhino1.aca", 2, "11-00-39"),
+        ("rhino2.aca", 1, "11-00-40"),
+        ("rhino2.aca", 2, "11-00-41"),
+        ("rhino3.aca", 1, "11-00-42"),
+    ]
+    assert [run["archiveid"] for run in runs] == [1, 1, 2, 2, 3]
+
+
+@pytest.mark.parametrize("archive_name, jobs", [("%", 1), ("%", 2), ("rhino2%", 1)])
+def test_bp5_source_matches_the_campaign_source(small_campaign, archive_name, jobs):
+    campaign = build_feature_table(
+        acx_path=small_campaign["index"],
+        query_dir=small_campaign["query_dir"],
+        campaign_store=small_campaign["campaign_store"],
+        feature_specs=small_campaign["specs"],
+        archive_name=archive_name,
+    )
+    bp5 = build_bp5_feature_table(
+        small_layout(small_campaign),
+        small_campaign["query_dir"],
+        small_campaign["specs"],
+        archive_name=archive_name,
+        jobs=jobs,
+    )
+
+    assert len(campaign) == (2 if archive_name == "rhino2%" else 5)
+    pd.testing.assert_frame_equal(bp5, campaign)
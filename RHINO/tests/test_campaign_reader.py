@@ -0,0 +1,158 @@
+import shutil
+import sqlite3
+
+import pandas as pd
+import pytest
+from rhino.campaign.attribute_cache import build_attribute_cache
+
+from campaign_adios import ADIOS_SOURCES, load_adios_feature_table
+from campaign_reader import (
+    build_feature_table,
+    build_sql_feature_table,
+    iter_feature_batches,
+    read_adios_features,
+)
+
+
+def test_attribute_features_match_with_and_without_typed_cache(tmp_path, capsys):
+    index_path = tmp_path / "rhino.acx"
+    with sqlite3.connect(index_path) as connection:
+        connection.execute("CREATE TABLE archives (archiveid, name)")
+        connection.execute("CREATE TABLE datasets (datasetid, archiveid, name)")
+        connection.execute(
+            "CREATE TABLE attributes (archiveid, datasetid, name, value)"
+        )
+        connection.execute("INSERT INTO archives VALUES (1, 'IFE/rhino1.aca')")
+        connection.executemany(
+            "INSERT INTO datasets VALUES (?, 1, ?)",
+            [(1, "11-00-38"), (2, "11-00-39"), (3, "11-00-40")],
+        )
+        connection.executemany(
+            "INSERT INTO attributes VALUES (1, ?, ?, ?)",
+            [
+                (1, "/input:beta:Burn fraction", "[0.035]"),
+                (1, "/output:I_startup (g)", "{2500.5}"),
+                (1, "/date", '["2026-04-29 10:00:00"]'),
+                (2, "/input:beta:Burn fraction", "not a number"),
+                (2, "/date", '["2026-04-29 11:00:00"]'),
+                (3, "/output:I_startup (g)", "[12, 13]"),
+            ],
+        )
+    connection.close()
+    specs = [
+        {
+            "key": "burn_fraction",
+            "source": "campaign_sql",
+            "attribute": "/input:beta:Burn fraction",
+            "value_type": "real",
+        },
+        {
+            "key": "minimum_startup_inventory_g",
+            "source": "campaign_sql",
+            "attribute": "/output:I_startup (g)",
+            "value_type": "real",
+        },
+        {
+            "key": "simulation_date",
+            "source": "campaign_sql",
+            "attribute": "/date",
+            "value_type": "text",
+        },
+    ]
+
+    def build():
+        table = build_sql_feature_table(index_path, tmp_path, "IFE/rhino%", specs)
+        return table.sort_values("datasetid", ignore_index=True)
+
+    uncached = build()
+    assert "missing or older than the index" in capsys.readouterr().out
+    build_attribute_cache(index_path)
+    cached = build()
+    assert capsys.readouterr().out == ""
+
+    assert cached.equals(uncached)
+    assert uncached["burn_fraction"].tolist()[0] == 0.035
+    # Non-numeric values become missing, not 0.0 as the old CAST gave.
+    assert uncached["burn_fraction"].isna().tolist() == [False, True, True]
+    assert uncached["minimum_startup_inventory_g"].isna().tolist() == [
+        False,
+        True,
+        True,
+    ]
+    assert uncached["simulation_date"].tolist()[:2] == [
+        "2026-04-29 10:00:00",
+        "2026-04-29 11:00:00",
+    ]
+
+
+def campaign_arguments(campaign):
+    return {
+        "acx_path": campaign["index"],
+        "query_dir": campaign["query_dir"],
+        "campaign_store": campaign["campaign_store"],
+        "feature_specs": campaign["specs"],
+    }
+
+
+@pytest.mark.parametrize("batch_runs", [None, 1, 2])
+def test_feature_batches_concatenate_to_the_feature_table(small_campaign, batch_runs):
+    arguments = campaign_arguments(small_campaign)
+    table = build_feature_table(**arguments)
+    batches = list(iter_feature_batches(batch_runs=batch_runs, **arguments))
+
+    assert max(len(batch) for batch in batches) == (batch_runs or 2)
+    pd.testing.assert_frame_equal(pd.concat(batches, ignore_index=True), table)
+    assert table["run_id"].tolist() == [
+        "11-00-38",
+        "11-00-39",
+        "11-00-40",
+        "11-00-41",
+        "11-00-42",
+    ]
+    assert table["blanket_peak_inventory"].tolist() == [10.0, 20.0, 30.0, 40.0, 50.0]
+
+
+def test_feature_batches_skip_archives_without_runs(small_campaign, tmp_path):
+    index_path = tmp_path / "rhino.acx"
+    shutil.copy(small_campaign["index"], index_path)
+    with sqlite3.connect(index_path) as connection:
+        connection.execute("INSERT INTO archives VALUES (4, 'rhino4.aca')")
+    connection.close()
+    arguments = campaign_arguments(small_campaign) | {"acx_path": index_path}
+
+    batches = list(iter_feature_batches(**arguments))
+    assert [batch["archive"].unique().tolist() for batch in batches] == [
+        ["rhino1.aca"],
+        ["rhino2.aca"],
+        ["rhino3.aca"],
+    ]
+    assert list(iter_feature_batches(archive_name="other%", **arguments)) == []
+
+
+@pytest.mark.parametrize("jobs", [1, 3])
+def test_archive_adios_reads_match_per_run_reads(small_campaign, jobs):
+    store = small_campaign["campaign_store"]
+    specs = [
+        spec for spec in small_campaign["specs"] if spec["source"] in ADIOS_SOURCES
+    ]
+    # The first archive is split so that two workers read the same archive.
+    archives = ["rhino1.aca", "rhino1.aca", "rhino2.aca", "rhino3.aca"]
+    archive_runs = [["11-00-38"], ["11-00-39"], ["11-00-41", "11-00-40"], ["11-00-42"]]
+
+    rows = read_adios_features(store, archives, archive_runs, specs, jobs=jobs)
+
+    expected = [
+        {"archive": archive, **row}
+        for archive, runs in zip(archives, archive_runs)
+        for run_id in runs
+        for row in load_adios_feature_table(store / archive, [run_id], specs)
+    ]
+    assert rows == expected
+    assert [row["run_id"] for row in rows] == [
+        "11-00-38",
+        "11-00-39",
+        "11-00-41",
+        "11-00-40",
+        "11-00-42",
+    ]
+    assert [row["blanket_peak_inventory"] for row in rows] == [10, 20, 40, 30, 50]
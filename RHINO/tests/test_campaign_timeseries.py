@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+
+adios2 = pytest.importorskip("adios2")
+
+from campaign_timeseries import read_timeseries_features
+
+RUN_ID = "11-00-38"
+TIMES = "/data/inventory/Times/data"
+MASS = "/data/inventory/Tritium/mass"
+
+
+def reference_time_above(times, values, threshold):
+    total = 0.0
+    for t0, t1, v0, v1 in zip(times[:-1], times[1:], values[:-1], values[1:]):
+        if v0 > threshold and v1 > threshold:
+            total += t1 - t0
+        elif v0 > threshold or v1 > threshold:
+            crossing = (threshold - v0) / (v1 - v0)
+            total += (t1 - t0) * (1.0 - crossing if v0 <= threshold else crossing)
+    return total
+
+
+def test_chunked_reductions_match_numpy(tmp_path):
+    rng = np.random.default_rng(0)
+    times = np.cumsum(rng.uniform(0.5, 1.5, 101))
+    mass = np.stack(
+        [
+            np.full_like(times, 3.0),
+            5.0 + 4.0 * np.exp(-times / 20.0) * np.cos(times / 3.0),
+            -times,
+        ]
+    )
+    path = tmp_path / "run.bp5"
+    with adios2.Stream(str(path), "w") as stream:
+        for name, data in ((TIMES, times), (MASS, mass)):
+            stream.write(
+                f"{RUN_ID}/{name.lstrip('/')}",
+                data,
+                list(data.shape),
+                [0] * data.ndim,
+                list(data.shape),
+            )
+
+    row = mass[1]
+    window = [times[17] - 0.1, times[83] + 0.1]
+    inside = (times >= window[0]) & (times <= window[1])
+    window_times, window_values = times[inside], row[inside]
+    integral = float(np.trapezoid(window_values, window_times))
+    final = row[-1]
+    violations = np.flatnonzero(np.abs(row - final) > 0.01 * abs(final))
+    expected = {
+        "value_at_sample": row[40],
+        "value_at_between": float(np.interp(times[40] + 0.25, times, row)),
+        "max": window_values.max(),
+        "mean": integral / (window_times[-1] - window_times[0]),
+        "integral": integral,
+        "time_above": reference_time_above(window_times, window_values, 5.5),
+        "steady_state_time": times[violations[-1] + 1],
+    }
+    base = {"variable": MASS, "index": 1}
+    specs = [
+        {**base, "key": "value_at_sample", "reduction": "value_at", "time": times[40]},
+        {
+            **base,
+            "key": "value_at_between",
+            "reduction": "value_at",
+            "time": times[40] + 0.25,
+        },
+        {**base, "key": "max", "reduction": "max", "window": window},
+        {**base, "key": "mean", "reduction": "mean", "window": window},
+        {**base, "key": "integral", "reduction": "integral", "window": window},
+        {
+            **base,
+            "key": "time_above",
+            "reduction": "time_above",
+            "threshold": 5.5,
+            "window": window,
+        },
+        {
+            **base,
+            "key": "steady_state_time",
+            "reduction": "steady_state_time",
+            "tolerance": 0.01,
+        },
+    ]
+
+    with adios2.FileReader(str(path)) as reader:
+        available = reader.available_variables()
+        # Chunk sizes that do not divide the 101 samples.
+        for chunk_samples in (7, 13, 4096):
+            features = read_timeseries_features(
+                reader, available, RUN_ID, specs, chunk_samples=chunk_samples
+            )
+            assert features == pytest.approx(expected, rel=1e-12, abs=1e-12)
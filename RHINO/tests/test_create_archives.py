@@ -0,0 +1,100 @@
+import csv
+import subprocess
+from pathlib import Path
+
+import pytest
+
+import create_archives
+from create_archives import (
+    TAR_BLOCK_BYTES,
+    create_tar_archives,
+    estimated_tar_bytes,
+    plan_tar_shards,
+)
+from seekable_tar import scan_tar_members
+
+
+def make_dataset(directory, name, size):
+    dataset = directory / name
+    dataset.mkdir(parents=True)
+    (dataset / "data.0").write_bytes(bytes(size))
+    return dataset
+
+
+def test_plan_tar_shards_closes_shards_at_the_byte_limit(tmp_path):
+    datasets = [
+        make_dataset(tmp_path, f"run-{number}.bp5", TAR_BLOCK_BYTES)
+        for number in range(3)
+    ]
+    # Directory header, file header, and one data block.
+    dataset_bytes = estimated_tar_bytes(datasets[0])
+    assert dataset_bytes == 3 * TAR_BLOCK_BYTES
+
+    assert plan_tar_shards(datasets, None) == [datasets]
+    assert plan_tar_shards(datasets, 2 * dataset_bytes) == [
+        datasets[:2],
+        datasets[2:],
+    ]
+    assert plan_tar_shards(datasets, 2 * dataset_bytes - 1) == [
+        [dataset] for dataset in datasets
+    ]
+    assert plan_tar_shards(datasets, 1) == [[dataset] for dataset in datasets]
+
+
+def fake_run_command(command, *, cwd, dry_run):
+    if command[0] == "tar":
+        subprocess.run(command, cwd=cwd, check=True)
+        return
+    # hpc_campaign taridx <tar> <index>
+    with open(command[3], "w", encoding="utf-8", newline="") as stream:
+        writer = csv.writer(stream)
+        for member in scan_tar_members(Path(command[2])):
+            writer.writerow(
+                [
+                    member["type"],
+                    member["offset"],
+                    member["offset_data"],
+                    member["size"],
+                    member["name"],
+                ]
+            )
+
+
+def test_rebuild_with_fewer_shards_removes_stale_parts(tmp_path, monkeypatch):
+    monkeypatch.setattr(create_archives, "run_command", fake_run_command)
+    data_root = tmp_path / "data"
+    input_directory = data_root / "2026-04-30"
+    datasets = [
+        make_dataset(input_directory, f"run-{number}.bp5", TAR_BLOCK_BYTES)
+        for number in range(3)
+    ]
+    tar_output_dir = tmp_path / "tars"
+    arguments = dict(
+        data_root=data_root,
+        input_directories=[input_directory],
+        datasets=datasets,
+        tar_output_dir=tar_output_dir,
+        tar_prefix="rhino",
+        dry_run=False,
+    )
+
+    create_tar_archives(**arguments, rebuild_tars=False, max_tar_bytes=1)
+    assert len(list(tar_output_dir.glob("*-part*.tar"))) == 3
+
+    shard_bytes = 3 * estimated_tar_bytes(datasets[0])
+    with pytest.raises(ValueError, match="part002.tar, rhino-2026-04-30-part003"):
+        create_tar_archives(
+            **arguments, rebuild_tars=False, max_tar_bytes=shard_bytes
+        )
+
+    dataset_tars = create_tar_archives(
+        **arguments, rebuild_tars=True, max_tar_bytes=shard_bytes
+    )
+    assert set(dataset_tars.values()) == {
+        tar_output_dir / "rhino-2026-04-30-part001.tar"
+    }
+    assert sorted(path.name for path in tar_output_dir.iterdir()) == [
+        "rhino-2026-04-30-part001.tar",
+        "rhino-2026-04-30-part001.tar.idx",
+        "rhino-2026-04-30-part001.tar.sha256",
+    ]
@@ -0,0 +1,60 @@
+import math
+
+import numpy as np
+import pytest
+
+from crossValidateSurrogate import aggregate_metrics, fold_indexes
+
+
+@pytest.mark.parametrize("row_count, folds", [(23, 5), (10, 10), (100, 3)])
+def test_fold_indexes_test_every_row_once(row_count, folds):
+    splits = fold_indexes(row_count, folds, val_frac=0.2, seed=7)
+    assert len(splits) == folds
+
+    tested = np.concatenate([test_idx for _, _, test_idx in splits])
+    assert sorted(tested.tolist()) == list(range(row_count))
+    sizes = [len(test_idx) for _, _, test_idx in splits]
+    assert max(sizes) - min(sizes) <= 1
+    for train_idx, val_idx, test_idx in splits:
+        assert len(train_idx) > 0 and len(val_idx) > 0
+        parts = [set(train_idx.tolist()), set(val_idx.tolist()), set(test_idx.tolist())]
+        assert sum(len(part) for part in parts) == row_count
+        assert set.union(*parts) == set(range(row_count))
+
+
+def test_fold_indexes_rejects_impossible_splits():
+    with pytest.raises(ValueError, match="Folds"):
+        fold_indexes(5, 1, val_frac=0.2, seed=0)
+    with pytest.raises(ValueError, match="Folds"):
+        fold_indexes(5, 6, val_frac=0.2, seed=0)
+    with pytest.raises(ValueError, match="too small"):
+        # One row left per fold, which cannot both train and validate.
+        fold_indexes(2, 2, val_frac=0.5, seed=0)
+
+
+def test_aggregate_metrics_uses_student_t_interval():
+    fold_metrics = [
+        {"rmse": value, "per_output": {"y": {"rmse": 2.0 * value}}}
+        for value in (1.0, 2.0, 3.0, 4.0)
+    ]
+    summary = aggregate_metrics(fold_metrics, ["y"], confidence=0.95)
+
+    # t(0.975, 3 degrees of freedom) from the table, not the normal 1.96.
+    std = math.sqrt(5.0 / 3.0)
+    half_width = 3.182446305284263 * std / 2.0
+    assert summary["rmse"] == pytest.approx(
+        {
+            "mean": 2.5,
+            "std": std,
+            "ci_low": 2.5 - half_width,
+            "ci_high": 2.5 + half_width,
+        }
+    )
+    assert summary["per_output"]["y"]["rmse"] == pytest.approx(
+        {
+            "mean": 5.0,
+            "std": 2.0 * std,
+            "ci_low": 5.0 - 2.0 * half_width,
+            "ci_high": 5.0 + 2.0 * half_width,
+        }
+    )
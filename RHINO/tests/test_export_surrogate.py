@@ -0,0 +1,106 @@
+import json
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+import torch
+
+from RHINO.demo.surrogate.rhino_surrogate_fused_runtime import FusedRhinoSurrogate
+from exportSurrogate import build_fused_surrogate, reference_prediction
+from trainSurrogate import SurrogateMLP, stack_ensemble
+
+from conftest import RHINO_ROOT
+
+EXPORT_SCRIPT = RHINO_ROOT / "ML" / "surrogate_training" / "exportSurrogate.py"
+MODEL_CONFIG = {
+    "input_dim": 3,
+    "output_dim": 2,
+    "hidden_dim": 16,
+    "num_hidden_layers": 2,
+}
+
+
+def make_artifact(ensemble_size):
+    torch.manual_seed(ensemble_size)
+    models = [SurrogateMLP(**MODEL_CONFIG).eval() for _ in range(ensemble_size)]
+    artifact = {
+        "model_config": MODEL_CONFIG,
+        "model_state_dict": models[0].state_dict(),
+        "input_columns": ["a", "b", "c"],
+        "output_columns": ["y0", "y1"],
+        # Physical scales far from 1 so a wrong fold cannot pass.
+        "x_mean": torch.tensor([100.0, -3.0, 0.02]),
+        "x_std": torch.tensor([25.0, 0.5, 0.001]),
+        "y_mean": torch.tensor([1.0e3, -7.0]),
+        "y_std": torch.tensor([200.0, 0.25]),
+    }
+    if ensemble_size > 1:
+        artifact["ensemble_size"] = ensemble_size
+        artifact["ensemble_state_dict"] = stack_ensemble(models)
+    return artifact
+
+
+def physical_inputs(artifact, rows):
+    generator = torch.Generator().manual_seed(1)
+    return artifact["x_mean"] + artifact["x_std"] * torch.randn(
+        rows, 3, generator=generator
+    )
+
+
+@pytest.mark.parametrize("ensemble_size", [1, 4])
+def test_fused_graph_matches_reference_prediction(ensemble_size):
+    artifact = make_artifact(ensemble_size)
+    fused, model, ensemble_state = build_fused_surrogate(artifact)
+    x = physical_inputs(artifact, 64)
+
+    with torch.no_grad():
+        prediction = fused(x)
+    reference = reference_prediction(artifact, model, ensemble_state, x)
+    width = 2 if ensemble_size == 1 else 4
+    assert prediction.shape == reference.shape == (64, width)
+    scale = reference.abs().amax(dim=0).clamp_min(1.0)
+    assert float(((prediction - reference).abs() / scale).max()) < 1e-5
+    if ensemble_size > 1:
+        assert bool((reference[:, 2:] > 0).all())
+
+
+@pytest.mark.parametrize("ensemble_size", [1, 4])
+def test_fused_runtime_loads_exported_torchscript(tmp_path, ensemble_size):
+    artifact = make_artifact(ensemble_size)
+    torch.save(artifact, tmp_path / "rhino_surrogate.pt")
+    subprocess.run(
+        [
+            sys.executable,
+            str(EXPORT_SCRIPT),
+            "--model",
+            str(tmp_path / "rhino_surrogate.pt"),
+            "--outdir",
+            str(tmp_path),
+            "--formats",
+            "torchscript",
+        ],
+        check=True,
+        capture_output=True,
+    )
+    metadata = json.loads((tmp_path / "rhino_surrogate_fused.json").read_text())
+    assert metadata["formats"] == {"torchscript": "rhino_surrogate_fused.ts"}
+
+    surrogate = FusedRhinoSurrogate(tmp_path / "rhino_surrogate_fused.ts")
+    assert surrogate.input_keys == ["a", "b", "c"]
+    assert surrogate.output_display_names == ["y0", "y1"]
+
+    x = physical_inputs(artifact, 8)
+    _, model, ensemble_state = build_fused_surrogate(artifact)
+    reference = reference_prediction(artifact, model, ensemble_state, x).numpy()
+    mean, std = surrogate.predict_batch(x.numpy())
+    np.testing.assert_allclose(mean, reference[:, :2], rtol=1e-4, atol=1e-3)
+    if ensemble_size == 1:
+        assert not std.any()
+    else:
+        np.testing.assert_allclose(std, reference[:, 2:], rtol=1e-4, atol=1e-3)
+
+    inputs = dict(zip(surrogate.input_keys, x[0].tolist()))
+    assert surrogate.predict_from_dict(inputs) == pytest.approx(
+        dict(zip(surrogate.output_keys, mean[0].tolist())), rel=1e-5
+    )
@@ -0,0 +1,47 @@
+import sqlite3
+
+from rhino.campaign.attribute_cache import build_attribute_cache
+
+from extraction import build_training_dataset
+
+
+def test_cached_and_uncached_extraction_agree(tmp_path):
+    index_path = tmp_path / "rhino.acx"
+    with sqlite3.connect(index_path) as connection:
+        connection.execute("CREATE TABLE archives (archiveid, name)")
+        connection.execute("CREATE TABLE datasets (datasetid, dsid, name, archiveid)")
+        connection.execute(
+            "CREATE TABLE attributes (archiveid, datasetid, name, value)"
+        )
+        connection.execute("INSERT INTO archives VALUES (1, 'IFE/rhino1.aca')")
+        connection.executemany(
+            "INSERT INTO datasets VALUES (?, ?, ?, 1)",
+            [(1, "a", "11-00-38"), (2, "b", "11-00-39"), (3, "c", "11-00-40")],
+        )
+        connection.executemany(
+            "INSERT INTO attributes VALUES (1, ?, ?, ?)",
+            [
+                (1, "/input:Ndotminus:Tritium burned per day", "[82.4]"),
+                (1, "/input:beta:Burn fraction", "{0.035}"),
+                (1, "/output:I_startup (g)", '"2500.5"'),
+                (2, "/input:Ndotminus:Tritium burned per day", "[26.5, 3.1]"),
+                (2, "/input:beta:Burn fraction", "0.04"),
+                (2, "/output:I_startup (g)", "12 g"),
+                (3, "/input:Ndotminus:Tritium burned per day", "-1.5e2"),
+                (3, "/input:beta:Burn fraction", "n/a"),
+            ],
+        )
+    connection.close()
+
+    uncached = build_training_dataset(index_path, "IFE/rhino%.aca")
+    build_attribute_cache(index_path)
+    cached = build_training_dataset(index_path, "IFE/rhino%.aca")
+
+    assert cached.equals(uncached)
+    assert uncached["Ndotminus"].tolist()[::2] == [82.4, -150.0]
+    assert uncached["Ndotminus"].isna().tolist() == [False, True, False]
+    assert uncached["minimum_startup_inventory_g"].isna().tolist() == [
+        False,
+        True,
+        True,
+    ]
@@ -0,0 +1,73 @@
+import numpy as np
+
+from campaign_adios import ADIOS_SOURCES
+from campaign_reader import read_adios_features
+from feature_cache import decode_value, encode_value
+
+
+def test_cached_values_keep_their_numpy_dtype():
+    for value in (
+        np.float32(0.1),
+        np.array([[0.1, 0.2]], dtype=np.float32),
+        np.arange(3, dtype=np.int16),
+    ):
+        decoded = decode_value(encode_value(value))
+        assert type(decoded) is type(value)
+        assert decoded.dtype == value.dtype
+        assert np.array_equal(decoded, value)
+    assert decode_value(encode_value(1.5)) == 1.5
+    # Entries written before dtypes were stored still decode.
+    assert np.array_equal(decode_value("[1, 2]"), [1, 2])
+
+
+def test_cache_reuses_values_until_runs_or_specs_change(
+    small_campaign, tmp_path, capsys
+):
+    store = small_campaign["campaign_store"]
+    cache = tmp_path / "features.sqlite"
+    specs = [
+        spec for spec in small_campaign["specs"] if spec["source"] in ADIOS_SOURCES
+    ]
+    keys = [spec["key"] for spec in specs]
+
+    def read(archives, archive_runs, specs):
+        profile = {}
+        rows = read_adios_features(
+            store, archives, archive_runs, specs, feature_cache=cache, profile=profile
+        )
+        return rows, profile, capsys.readouterr().out
+
+    def field(profile, name):
+        return [profile[key][name] for key in keys]
+
+    first, profile, out = read(["rhino1.aca"], [["11-00-38", "11-00-39"]], specs)
+    assert field(profile, "cache_hits") == [0, 0]
+    assert "0 ADIOS value(s) reused, 4 extracted" in out
+
+    cached, profile, out = read(["rhino1.aca"], [["11-00-38", "11-00-39"]], specs)
+    assert cached == first
+    assert field(profile, "cache_hits") == [2, 2]
+    assert field(profile, "archives_opened") == [0, 0]
+    assert "4 ADIOS value(s) reused, 0 extracted" in out
+
+    # A new run is read and added; the runs already cached are not reread.
+    archives = ["rhino1.aca", "rhino2.aca"]
+    archive_runs = [["11-00-38", "11-00-39"], ["11-00-40"]]
+    appended, profile, out = read(archives, archive_runs, specs)
+    assert appended[:2] == first
+    assert appended[2]["blanket_peak_inventory"] == 30.0
+    assert field(profile, "cache_hits") == [2, 2]
+    assert field(profile, "rows") == [1, 1]
+    assert "4 ADIOS value(s) reused, 2 extracted" in out
+    _, profile, _ = read(archives, archive_runs, specs)
+    assert field(profile, "cache_hits") == [3, 3]
+
+    # Renaming a feature keeps its values; changing its definition does not.
+    changed = [
+        {**specs[0], "display_name": "Isotope separation"},
+        {**specs[1], "reduction": "min"},
+    ]
+    rows, profile, out = read(archives, archive_runs, changed)
+    assert field(profile, "cache_hits") == [3, 0]
+    assert [row["blanket_peak_inventory"] for row in rows] == [0.0, 0.0, 0.0]
+    assert "3 ADIOS value(s) reused, 3 extracted" in out
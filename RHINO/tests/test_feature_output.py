@@ -0,0 +1,62 @@
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from campaign_reader import build_feature_table, iter_feature_batches
+from feature_output import feature_schema, write_feature_batches, write_feature_table
+
+
+def test_arrow_tables_reject_text_model_columns(tmp_path):
+    specs = [
+        {"key": "burn_fraction", "role": "input", "value_type": "real"},
+        {"key": "plant_state", "role": "output", "value_type": "text"},
+    ]
+    with pytest.raises(ValueError, match="plant_state"):
+        feature_schema(specs, {})
+
+    specs[1] = {"key": "plant_state", "role": "output", "query": "state.sql"}
+    frame = pd.DataFrame(
+        {
+            "archive": ["rhino1.aca"],
+            "datasetid": [1],
+            "run_id": ["11-00-38"],
+            "burn_fraction": [0.035],
+            "plant_state": ["steady"],
+        }
+    )
+    path = tmp_path / "features.parquet"
+    with pytest.raises(ValueError, match="'plant_state' cannot be stored as double"):
+        write_feature_table(frame, path, specs, {})
+    assert not path.exists()
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".parquet", ".feather"])
+def test_streamed_batches_write_the_feature_table(small_campaign, tmp_path, suffix):
+    arguments = {
+        "acx_path": small_campaign["index"],
+        "query_dir": small_campaign["query_dir"],
+        "campaign_store": small_campaign["campaign_store"],
+        "feature_specs": small_campaign["specs"],
+    }
+    provenance = {"campaign": "small"}
+    table = build_feature_table(**arguments)
+    whole_path = tmp_path / f"whole{suffix}"
+    write_feature_table(table, whole_path, small_campaign["specs"], provenance)
+
+    streamed_path = tmp_path / f"streamed{suffix}"
+    rows, missing = write_feature_batches(
+        iter_feature_batches(batch_runs=1, **arguments),
+        streamed_path,
+        small_campaign["specs"],
+        provenance,
+    )
+    assert rows == len(table)
+    assert missing.sum() == 0
+
+    read = {
+        ".csv": pd.read_csv,
+        ".parquet": pd.read_parquet,
+        ".feather": pd.read_feather,
+    }[suffix]
+    pd.testing.assert_frame_equal(read(streamed_path), read(whole_path))
@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+import torch
+
+pytest.importorskip("mlflow")
+
+from benchmark_pyfunc import input_layouts, reference_predict
+from mlflow_model import RhinoSurrogatePyFunc
+from trainSurrogate import SurrogateMLP, stack_ensemble
+
+INPUT_COLUMNS = ["tritium_burning_rate", "burn_fraction", "tbr"]
+OUTPUT_COLUMNS = ["plant_doubling_time_days", "minimum_startup_inventory_g"]
+
+
+@pytest.fixture
+def serving_model():
+    torch.manual_seed(0)
+    config = dict(input_dim=3, output_dim=2, hidden_dim=16, num_hidden_layers=2)
+    members = [SurrogateMLP(**config) for _ in range(3)]
+    return RhinoSurrogatePyFunc(
+        model=SurrogateMLP(**config),
+        input_columns=INPUT_COLUMNS,
+        output_columns=OUTPUT_COLUMNS,
+        x_mean=np.array([80.0, 0.03, 1.1]),
+        x_std=np.array([15.0, 0.01, 0.05]),
+        y_mean=np.array([12.0, 900.0]),
+        y_std=np.array([3.0, 150.0]),
+        ensemble_state=stack_ensemble(members),
+    )
+
+
+def test_every_layout_returns_the_same_ensemble_columns(serving_model):
+    rng = np.random.default_rng(0)
+    x = serving_model.x_mean + serving_model.x_std * rng.standard_normal((257, 3))
+    layouts = input_layouts(x, INPUT_COLUMNS)
+    structured = np.empty(len(x), dtype=[(column, "<f8") for column in INPUT_COLUMNS])
+    for position, column in enumerate(INPUT_COLUMNS):
+        structured[column] = x[:, position]
+    layouts["structured"] = structured
+
+    expected = serving_model.predict(None, layouts["dataframe"])
+    assert list(expected.columns) == [
+        *OUTPUT_COLUMNS,
+        *(f"{column}_std" for column in OUTPUT_COLUMNS),
+    ]
+    assert (expected[[f"{column}_std" for column in OUTPUT_COLUMNS]] > 0).all().all()
+    np.testing.assert_allclose(
+        expected[OUTPUT_COLUMNS].to_numpy(),
+        reference_predict(serving_model, layouts["dataframe"]).to_numpy(),
+        rtol=1e-5,
+    )
+    for layout, batch in layouts.items():
+        prediction = serving_model.predict(None, batch)
+        assert list(prediction.columns) == list(expected.columns), layout
+        np.testing.assert_allclose(
+            prediction.to_numpy(), expected.to_numpy(), rtol=1e-5, err_msg=layout
+        )
+
+
+@pytest.mark.parametrize("dtype", [bool, np.complex128])
+def test_boolean_and_complex_inputs_are_rejected(serving_model, dtype):
+    x = np.ones((4, 3), dtype=dtype)
+    frame = pd.DataFrame(x, columns=INPUT_COLUMNS)
+    layouts = {
+        "dataframe": frame,
+        "object_dataframe": frame.astype(object),
+        "dict": dict(zip(INPUT_COLUMNS, x.T)),
+        "ndarray": x,
+    }
+    if dtype is bool:
+        # Arrow has no complex type.
+        pa = pytest.importorskip("pyarrow")
+        layouts["arrow"] = pa.Table.from_pandas(frame, preserve_index=False)
+    for layout, batch in layouts.items():
+        with pytest.raises(ValueError, match="real numbers"):
+            serving_model.predict(None, batch)
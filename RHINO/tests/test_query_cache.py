@@ -0,0 +1,66 @@
+import sqlite3
+
+from rhino.campaign.query_cache import (
+    CachedQueryRunner,
+    evict_query_cache,
+    load_cached_result,
+)
+
+
+def test_query_cache_reuses_results_until_index_changes(tmp_path):
+    index_path = tmp_path / "rhino.acx"
+    cache_dir = tmp_path / "query-cache"
+    with sqlite3.connect(index_path) as connection:
+        connection.execute("CREATE TABLE archives (archiveid, name)")
+        connection.execute("INSERT INTO archives VALUES (1, 'rhino1.aca')")
+    connection.close()
+
+    query = "SELECT name FROM archives WHERE name LIKE ? ORDER BY name"
+    with CachedQueryRunner(index_path, cache_dir) as runner:
+        first = runner.read_sql(query, ("rhino%",))
+    with CachedQueryRunner(index_path, cache_dir) as runner:
+        second = runner.read_sql(query, ("rhino%",))
+        assert (runner.hits, runner.misses) == (1, 0)
+        assert runner.connection is None
+        runner.read_sql(query, ("other%",))
+        assert (runner.hits, runner.misses) == (1, 1)
+    assert second.equals(first)
+
+    with sqlite3.connect(index_path) as connection:
+        connection.execute("INSERT INTO archives VALUES (2, 'rhino2.aca')")
+    connection.close()
+
+    with CachedQueryRunner(index_path, cache_dir) as runner:
+        third = runner.read_sql(query, ("rhino%",))
+        assert runner.misses == 1
+    assert third["name"].tolist() == ["rhino1.aca", "rhino2.aca"]
+
+    assert len(list(cache_dir.glob("*.pkl"))) == 3
+    assert evict_query_cache(cache_dir, max_bytes=0) == 3
+    assert not list(cache_dir.glob("*.pkl"))
+
+
+def test_unreadable_results_are_deleted_and_rerun(tmp_path):
+    index_path = tmp_path / "rhino.acx"
+    cache_dir = tmp_path / "query-cache"
+    with sqlite3.connect(index_path) as connection:
+        connection.execute("CREATE TABLE archives (archiveid, name)")
+        connection.execute("INSERT INTO archives VALUES (1, 'rhino1.aca')")
+    connection.close()
+
+    query = "SELECT name FROM archives"
+    with CachedQueryRunner(index_path, cache_dir) as runner:
+        expected = runner.read_sql(query)
+    (result_path,) = cache_dir.glob("*.pkl")
+    valid = result_path.read_bytes()
+
+    for damaged in (valid[: len(valid) // 2], b"not a pickle", b""):
+        result_path.write_bytes(damaged)
+        assert load_cached_result(cache_dir, result_path.stem) is None
+        assert not result_path.exists()
+
+        result_path.write_bytes(damaged)
+        with CachedQueryRunner(index_path, cache_dir) as runner:
+            assert runner.read_sql(query).equals(expected)
+            assert (runner.hits, runner.misses) == (0, 1)
+        assert result_path.read_bytes() == valid
@@ -0,0 +1,147 @@
+import json
+import sys
+
+import numpy as np
+import pytest
+import torch
+
+from RHINO.demo.surrogate import build_response_surface
+from RHINO.demo.surrogate.rhino_response_surface import (
+    ResponseSurfaceSurrogate,
+    bilinear_interpolate,
+)
+from RHINO.demo.surrogate.rhino_surrogate_runtime import (
+    RhinoSurrogate,
+    SurrogateMLP,
+)
+
+DOMAIN = [(50.0, 100.0), (0.01, 0.06)]
+
+
+def test_bilinear_interpolate_reproduces_a_bilinear_function():
+    axis_0 = np.array([0.0, 1.0, 3.0, 7.0])
+    axis_1 = np.array([-2.0, 0.5, 1.0])
+
+    def surface(x0, x1):
+        return np.stack([1.0 + 2.0 * x0 - x1 + 0.5 * x0 * x1, x0 * x1], axis=-1)
+
+    mesh = np.meshgrid(axis_0, axis_1, indexing="ij")
+    values = surface(*mesh)
+    rng = np.random.default_rng(0)
+    points = np.column_stack(
+        [rng.uniform(0.0, 7.0, 200), rng.uniform(-2.0, 1.0, 200)]
+    )
+    # Grid nodes, including the upper corner that belongs to the last cell.
+    points = np.concatenate([points, [[0.0, -2.0], [3.0, 0.5], [7.0, 1.0]]])
+
+    np.testing.assert_allclose(
+        bilinear_interpolate(axis_0, axis_1, values, points),
+        surface(points[:, 0], points[:, 1]),
+        atol=1e-12,
+    )
+
+
+@pytest.fixture
+def surrogate_paths(tmp_path, monkeypatch):
+    torch.manual_seed(0)
+    config = {
+        "input_dim": 2,
+        "output_dim": 2,
+        "hidden_dim": 8,
+        "num_hidden_layers": 2,
+    }
+    members = [SurrogateMLP(**config) for _ in range(3)]
+    member_params = [dict(member.named_parameters()) for member in members]
+    artifact = {
+        "model_config": config,
+        "model_state_dict": members[0].state_dict(),
+        "ensemble_state_dict": {
+            name: torch.stack([params[name].detach() for params in member_params])
+            for name in member_params[0]
+        },
+        "input_specs": [
+            {"key": "Ndotminus", "display_name": "Ndotminus"},
+            {"key": "beta", "display_name": "beta"},
+        ],
+        "output_specs": [
+            {"key": "tbr", "display_name": "TBR"},
+            {"key": "doubling_time", "display_name": "Doubling time"},
+        ],
+        "x_mean": torch.tensor([75.0, 0.035]),
+        "x_std": torch.tensor([15.0, 0.015]),
+        "y_mean": torch.tensor([1.1, 20.0]),
+        "y_std": torch.tensor([0.05, 4.0]),
+    }
+    model_path = tmp_path / "rhino_surrogate.pt"
+    torch.save(artifact, model_path)
+
+    index_path = tmp_path / "simulation_index.json"
+    corners = [
+        {"inputs": {"Ndotminus": x0, "beta": x1}}
+        for x0 in DOMAIN[0]
+        for x1 in DOMAIN[1]
+    ]
+    index_path.write_text(json.dumps({"records": corners}))
+
+    surface_path = tmp_path / "rhino_response_surface.npz"
+    # Several chunks per predict_rows call.
+    monkeypatch.setattr(build_response_surface, "BATCH_ROWS", 100)
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "build_response_surface.py",
+            "--model", str(model_path),
+            "--index", str(index_path),
+            "--output", str(surface_path),
+            "--points", "17", "9",
+            "--check-samples", "500",
+        ],
+    )
+    build_response_surface.main()
+    return model_path, surface_path
+
+
+def test_predict_rows_matches_the_runtime_batch(surrogate_paths):
+    model_path, _ = surrogate_paths
+    surrogate = RhinoSurrogate(str(model_path))
+    rng = np.random.default_rng(1)
+    x_raw = np.column_stack([rng.uniform(*bounds, 250) for bounds in DOMAIN])
+
+    np.testing.assert_array_equal(
+        build_response_surface.predict_rows(surrogate, x_raw),
+        surrogate.predict_batch(x_raw)[0],
+    )
+
+
+def test_response_surface_agrees_with_itself_and_falls_back(surrogate_paths):
+    model_path, surface_path = surrogate_paths
+    fallback = RhinoSurrogate(str(model_path))
+    surface = ResponseSurfaceSurrogate(surface_path, fallback, model_path=model_path)
+    assert surface.metadata["points"] == [17, 9]
+
+    rng = np.random.default_rng(2)
+    inside = np.column_stack([rng.uniform(*bounds, 50) for bounds in DOMAIN])
+    y_batch, y_std = surface.predict_batch(inside)
+    y_scalar = np.array([surface.interpolate(x0, x1) for x0, x1 in inside])
+    np.testing.assert_allclose(y_batch, y_scalar, rtol=1e-6)
+    assert not y_std.any()
+    assert surface.fallback_calls == 0
+
+    outside = np.array([[DOMAIN[0][1] + 10.0, 0.03], [75.0, DOMAIN[1][0] - 0.005]])
+    mixed = np.concatenate([inside[:2], outside])
+    y_mixed, y_mixed_std = surface.predict_batch(mixed)
+    assert surface.fallback_calls == 1
+    y_fallback, y_fallback_std = fallback.predict_batch(outside)
+    np.testing.assert_array_equal(y_mixed[2:], y_fallback)
+    np.testing.assert_array_equal(y_mixed_std[2:], y_fallback_std)
+    assert (y_mixed_std[2:] > 0).all()
+    np.testing.assert_array_equal(y_mixed[:2], y_batch[:2])
+
+    assert surface.interpolate(*outside[0]) is None
+    inputs = dict(zip(surface.input_keys, outside[0]))
+    assert surface.predict_from_dict(inputs) == fallback.predict_from_dict(inputs)
+    np.testing.assert_array_equal(
+        surface.predict_array(outside[1]), fallback.predict_array(outside[1])
+    )
+    assert surface.fallback_calls == 3
@@ -0,0 +1,74 @@
+import argparse
+
+import numpy as np
+import pytest
+
+import searchSurrogate
+from searchSurrogate import evaluate_candidate, successive_halving
+
+CONTROLS = {
+    "lr_schedule": "constant",
+    "lr_patience": 10,
+    "patience": None,
+    "min_delta": 0.0,
+    "time_budget": None,
+}
+
+
+def synthetic_data():
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=(60, 3)).astype(np.float32)
+    y = np.stack([x.sum(axis=1), x[:, 0] * x[:, 1]], axis=1).astype(np.float32)
+    return x[:48], y[:48], x[48:], y[48:]
+
+
+def test_survivors_resume_from_their_previous_round(monkeypatch):
+    monkeypatch.setattr(searchSurrogate, "_worker_data", synthetic_data())
+    config = {"hidden_dim": 8, "hidden_layers": 2, "lr": 1e-2}
+    first, state = evaluate_candidate(config, 3, 16, 42, CONTROLS)
+    assert first["stopped_epoch"] == 3
+
+    # Without learning, a resumed model keeps the previous round's best loss.
+    frozen = {**config, "lr": 1e-12}
+    resumed, _ = evaluate_candidate(frozen, 1, 16, 42, CONTROLS, state)
+    assert resumed["val_loss"] == pytest.approx(first["val_loss"], rel=1e-5)
+    restarted, _ = evaluate_candidate(frozen, 1, 16, 42, CONTROLS)
+    assert restarted["val_loss"] != pytest.approx(first["val_loss"], rel=1e-5)
+
+
+def test_halving_rounds_keep_the_best_fraction(capsys):
+    candidates = [
+        {"hidden_dim": hidden_dim, "hidden_layers": 2, "lr": lr}
+        for hidden_dim, lr in [(4, 1e-5), (8, 1e-2), (16, 3e-3), (8, 1e-4), (4, 1e-3)]
+    ]
+    args = argparse.Namespace(
+        jobs=2,
+        min_epochs=2,
+        epochs=16,
+        eta=2,
+        batch_size=16,
+        seed=42,
+        lr_schedule="constant",
+        lr_patience=10,
+        patience=None,
+        min_delta=0.0,
+        time_budget=None,
+    )
+
+    winner, results = successive_halving(candidates, synthetic_data(), args)
+
+    rounds = results.groupby("round")
+    assert rounds.size().tolist() == [5, 3, 2]
+    assert rounds["promoted"].sum().tolist() == [3, 2, 1]
+    assert rounds["epochs"].first().tolist() == [2, 4, 8]
+    assert rounds["round_epochs"].first().tolist() == [2, 2, 4]
+    # Only promoted candidates reach the next round, ranked by validation loss.
+    for number, frame in rounds:
+        assert frame["val_loss"].is_monotonic_increasing
+        if number < 2:
+            promoted = set(frame.loc[frame["promoted"], "candidate"])
+            assert set(rounds.get_group(number + 1)["candidate"]) == promoted
+    final = rounds.get_group(2)
+    assert candidates[final.loc[final["promoted"], "candidate"].item()] == winner
+    assert results["stopped_epoch"].sum() == 5 * 2 + 3 * 2 + 2 * 4
+    assert "Search trained 24 epochs over 3 round(s)" in capsys.readouterr().out
@@ -0,0 +1,70 @@
+import csv
+import io
+import tarfile
+
+import numpy as np
+import pytest
+
+zstandard = pytest.importorskip("zstandard")
+
+from seekable_tar import (
+    SeekableTarReader,
+    fetch_dataset,
+    frame_index_path_for_replica,
+    scan_tar_members,
+    write_seekable_replica,
+)
+
+
+def test_seekable_replica_round_trips_tar_and_datasets(tmp_path):
+    tar_path = tmp_path / "rhino1.tar"
+    rng = np.random.default_rng(0)
+    contents = {
+        "2026-04-29/run-a.bp5/data.0": rng.bytes(70_000),
+        "2026-04-29/run-a.bp5/md.idx": b"metadata-a" * 50,
+        "2026-04-29/run-b.bp5/data.0": bytes(40_000) + rng.bytes(5_000),
+        "2026-04-29/run-b.bp5/md.idx": b"metadata-b" * 50,
+    }
+    with tarfile.open(tar_path, mode="w") as archive:
+        for name, data in contents.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+
+    index_path = tmp_path / "rhino1.tar.idx"
+    with index_path.open("w", encoding="utf-8", newline="") as stream:
+        writer = csv.writer(stream)
+        for member in scan_tar_members(tar_path):
+            writer.writerow(
+                [
+                    member["type"],
+                    member["offset"],
+                    member["offset_data"],
+                    member["size"],
+                    member["name"],
+                ]
+            )
+
+    # Small frames so members span several frames.
+    replica_path = write_seekable_replica(
+        tar_path, index_path=index_path, frame_bytes=16_384, level=3
+    )
+    assert frame_index_path_for_replica(replica_path).is_file()
+
+    tar_bytes = tar_path.read_bytes()
+    with replica_path.open("rb") as stream:
+        reader = zstandard.ZstdDecompressor().stream_reader(
+            stream, read_across_frames=True
+        )
+        assert reader.read() == tar_bytes
+    with SeekableTarReader(replica_path) as reader:
+        assert reader.size == len(tar_bytes)
+        assert reader.read(12_345, 30_000) == tar_bytes[12_345:42_345]
+
+    written = fetch_dataset(
+        replica_path, index_path, "2026-04-29/run-b.bp5", tmp_path / "restored"
+    )
+    assert sorted(path.name for path in written) == ["data.0", "md.idx"]
+    for name in ("2026-04-29/run-b.bp5/data.0", "2026-04-29/run-b.bp5/md.idx"):
+        assert (tmp_path / "restored" / name).read_bytes() == contents[name]
+    assert not (tmp_path / "restored" / "2026-04-29" / "run-a.bp5").exists()
@@ -0,0 +1,70 @@
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+import torch
+
+from RHINO.demo.surrogate.rhino_surrogate_runtime import RhinoSurrogate
+
+from conftest import RHINO_ROOT
+
+TRAIN_SCRIPT = RHINO_ROOT / "ML" / "surrogate_training" / "trainSurrogate.py"
+FEATURE_SPEC = RHINO_ROOT / "AI_ready_workflow" / "3_feature_extraction" / "feature_spec.json"
+
+
+def test_runtime_loads_train_surrogate_ensemble(tmp_path):
+    rng = np.random.default_rng(0)
+    x = rng.uniform(0.0, 1.0, size=(120, 2))
+    pd.DataFrame(
+        {
+            "run_id": [f"run-{row}" for row in range(len(x))],
+            "tritium_burning_rate": 50.0 + 50.0 * x[:, 0],
+            "burn_fraction": 0.01 + 0.05 * x[:, 1],
+            "plant_doubling_time_days": 10.0 + 3.0 * x[:, 0] * x[:, 1],
+        }
+    ).to_csv(tmp_path / "features.csv", index=False)
+    subprocess.run(
+        [
+            sys.executable,
+            str(TRAIN_SCRIPT),
+            "--features",
+            str(tmp_path / "features.csv"),
+            "--feature-spec",
+            str(FEATURE_SPEC),
+            "--outputs",
+            "plant_doubling_time_days",
+            "--ensemble-size",
+            "3",
+            "--epochs",
+            "3",
+            "--hidden-dim",
+            "8",
+            "--hidden-layers",
+            "1",
+            "--outdir",
+            str(tmp_path),
+        ],
+        check=True,
+        capture_output=True,
+    )
+
+    artifact_path = tmp_path / "rhino_surrogate.pt"
+    surrogate = RhinoSurrogate(str(artifact_path))
+    assert surrogate.input_keys == ["tritium_burning_rate", "burn_fraction"]
+    assert surrogate.output_display_names == ["Plant doubling time [days]"]
+
+    inputs = {"tritium_burning_rate": 80.0, "burn_fraction": 0.03}
+    prediction = surrogate.predict_with_uncertainty(inputs)["Plant doubling time [days]"]
+    assert prediction["std"] > 0.0
+    assert prediction["mean"] == surrogate.predict_from_dict(inputs)[
+        "plant_doubling_time_days"
+    ]
+
+    # Artifacts written before input_specs fall back to the column names.
+    artifact = torch.load(artifact_path)
+    del artifact["input_specs"], artifact["output_specs"]
+    torch.save(artifact, tmp_path / "columns_only.pt")
+    legacy = RhinoSurrogate(str(tmp_path / "columns_only.pt"))
+    assert legacy.output_display_names == ["plant_doubling_time_days"]
+    assert legacy.predict_batch(np.array([[80.0, 0.03]]))[1][0, 0] > 0.0
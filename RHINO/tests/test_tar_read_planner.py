@@ -0,0 +1,121 @@
+import sqlite3
+from pathlib import Path
+
+from tar_read_planner import coalesce_extents, plan_tar_reads, prefetch_extents
+
+
+def member(run_id, tar, start, end):
+    return {
+        "run_id": run_id,
+        "tar": Path(tar),
+        "filename": f"{run_id}/data.0",
+        "start": start,
+        "end": end,
+    }
+
+
+def test_extents_merge_within_the_gap_and_per_tar():
+    members = [
+        member("c", "a.tar", 300, 400),
+        member("a", "a.tar", 0, 100),
+        # Adjacent to the first extent.
+        member("a", "a.tar", 100, 150),
+        # Overlaps and lies inside the merged extent.
+        member("b", "a.tar", 120, 140),
+        # Exactly max_gap bytes after the merged extent.
+        member("b", "a.tar", 160, 200),
+        member("d", "b.tar", 200, 250),
+    ]
+
+    assert coalesce_extents(members, max_gap=10) == [
+        (Path("a.tar"), 0, 200),
+        (Path("a.tar"), 300, 400),
+        (Path("b.tar"), 200, 250),
+    ]
+    assert coalesce_extents(members, max_gap=0) == [
+        (Path("a.tar"), 0, 150),
+        (Path("a.tar"), 160, 200),
+        (Path("a.tar"), 300, 400),
+        (Path("b.tar"), 200, 250),
+    ]
+    assert coalesce_extents(members, max_gap=1000)[0] == (Path("a.tar"), 0, 400)
+    assert coalesce_extents([]) == []
+
+
+def write_archive_index(path, replicas):
+    with sqlite3.connect(path) as connection:
+        connection.executescript(
+            """
+            CREATE TABLE directory (name);
+            CREATE TABLE archive (dirid, tarname);
+            CREATE TABLE dataset (name);
+            CREATE TABLE replica (datasetid, archiveid, deltime);
+            CREATE TABLE archiveidx (
+                archiveid, replicaid, filename, offset_data, size
+            );
+            INSERT INTO directory VALUES ('/store/rhino');
+            INSERT INTO archive VALUES (1, 'rhino1.tar'), (1, 'rhino2.tar');
+            """
+        )
+        for run_id, archiveid, deltime, files in replicas:
+            datasetid = connection.execute(
+                "INSERT INTO dataset VALUES (?)", (run_id,)
+            ).lastrowid
+            replicaid = connection.execute(
+                "INSERT INTO replica VALUES (?, ?, ?)",
+                (datasetid, archiveid, deltime),
+            ).lastrowid
+            connection.executemany(
+                "INSERT INTO archiveidx VALUES (?, ?, ?, ?, ?)",
+                (
+                    (archiveid, replicaid, f"{run_id}/{name}", offset, size)
+                    for name, offset, size in files
+                ),
+            )
+    connection.close()
+
+
+def test_plan_orders_runs_by_tar_offset(tmp_path):
+    index_path = tmp_path / "rhino.aca"
+    write_archive_index(
+        index_path,
+        [
+            ("11-00-38", 2, 0, [("md.idx", 0, 10), ("data.0", 10, 90)]),
+            ("11-00-39", 1, 0, [("data.0", 600, 100), ("md.idx", 500, 20)]),
+            ("11-00-40", 1, 0, [("data.0", 0, 200), ("empty", 200, 0)]),
+            # A local replica and a deleted TAR replica are not planned.
+            ("11-00-41", 0, 0, [("data.0", 0, 50)]),
+            ("11-00-42", 1, 1, [("data.0", 900, 50)]),
+        ],
+    )
+    run_ids = ["11-00-42", "11-00-41", "11-00-40", "11-00-39", "11-00-38"]
+
+    plan = plan_tar_reads(index_path, run_ids, max_gap=100)
+    assert plan["run_ids"] == [
+        "11-00-40",
+        "11-00-39",
+        "11-00-38",
+        "11-00-42",
+        "11-00-41",
+    ]
+    tar = Path("/store/rhino/rhino1.tar")
+    assert plan["extents"] == [
+        (tar, 0, 200),
+        (tar, 500, 700),
+        (tar.with_name("rhino2.tar"), 0, 100),
+    ]
+
+    plan = plan_tar_reads(index_path, ["11-00-40", "11-00-39"], max_gap=0)
+    assert plan["extents"] == [(tar, 0, 200), (tar, 500, 520), (tar, 600, 700)]
+    assert plan_tar_reads(index_path, []) == {"run_ids": [], "extents": []}
+
+
+def test_prefetch_skips_missing_tars(tmp_path):
+    tar = tmp_path / "rhino1.tar"
+    tar.write_bytes(bytes(1000))
+
+    requested = prefetch_extents(
+        [(tar, 0, 300), (tmp_path / "missing.tar", 0, 50), (tar, 500, 1000)],
+        chunk_bytes=128,
+    )
+    assert requested == 800
@@ -0,0 +1,81 @@
+import math
+
+import pytest
+import torch
+
+import trainSurrogate
+from trainSurrogate import TrainingController
+
+
+def controller(**controls):
+    parameter = torch.nn.Parameter(torch.zeros(1))
+    optimizer = torch.optim.SGD([parameter], lr=0.1)
+    return TrainingController(optimizer, **controls)
+
+
+def run(training, val_losses):
+    lrs = []
+    for epoch, val_loss in enumerate(val_losses, start=1):
+        training.optimizer.step()
+        stop = training.step(epoch, val_loss)
+        lrs.append(training.lr)
+        if stop:
+            break
+    return lrs
+
+
+def test_patience_counts_epochs_without_a_min_delta_improvement():
+    training = controller(epochs=100, patience=3, min_delta=0.05)
+    # Epochs 3 and 4 improve by less than min_delta, so epoch 2 stays best.
+    run(training, [1.0, 0.5, 0.48, 0.46, 0.47, 0.1])
+    assert training.summary()["stopped_epoch"] == 5
+    assert training.best_epoch == 2
+    assert training.best_loss == 0.5
+    assert training.stop_reason == "early_stopping"
+
+    training = controller(epochs=100, patience=3)
+    run(training, [1.0, 0.5, 0.48, 0.46, 0.47, 0.1])
+    assert training.stopped_epoch == 6
+    assert training.best_epoch == 6
+    assert training.stop_reason == "completed"
+
+
+def test_training_completes_after_the_last_epoch():
+    training = controller(epochs=4, patience=10)
+    lrs = run(training, [4.0, 3.0, 2.0, 1.0, 0.5])
+    assert training.summary() | {"training_seconds": 0} == {
+        "stopped_epoch": 4,
+        "best_epoch": 4,
+        "stop_reason": "completed",
+        "training_seconds": 0,
+    }
+    assert lrs == [0.1] * 4
+
+
+def test_plateau_halves_the_learning_rate_after_lr_patience():
+    training = controller(epochs=100, lr_schedule="plateau", lr_patience=2)
+    lrs = run(training, [1.0, 0.9, 0.9, 0.9, 0.9, 0.8, 0.8, 0.8, 0.8])
+    assert lrs == pytest.approx([0.1] * 4 + [0.05] * 4 + [0.025])
+    assert training.stopped_epoch == 9
+
+
+def test_cosine_anneals_to_zero_over_the_epochs():
+    training = controller(epochs=4, lr_schedule="cosine")
+    lrs = run(training, [1.0, 1.0, 1.0, 1.0])
+    expected = [0.05 * (1 + math.cos(math.pi * epoch / 4)) for epoch in range(1, 5)]
+    assert lrs == pytest.approx(expected, abs=1e-12)
+    assert lrs[-1] == pytest.approx(0.0, abs=1e-12)
+
+
+def test_time_budget_stops_training(monkeypatch):
+    clock = iter([0.0, 10.0, 20.0, 30.0, 40.0])
+    monkeypatch.setattr(trainSurrogate.time, "perf_counter", lambda: next(clock))
+    training = controller(epochs=100, time_budget=25.0)
+    run(training, [1.0, 0.9, 0.8, 0.7])
+    assert training.stopped_epoch == 3
+    assert training.stop_reason == "time_budget"
+
+
+def test_unknown_schedules_are_rejected():
+    with pytest.raises(ValueError, match="constant, plateau, cosine"):
+        controller(epochs=10, lr_schedule="step")
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+import torch
+
+from trainSurrogate import SurrogateMLP, fit_model
+
+
+@pytest.mark.parametrize("lr_schedule", ["constant", "plateau"])
+def test_resident_loop_matches_the_dataloader_loop(lr_schedule):
+    rng = np.random.default_rng(1)
+    x = rng.normal(size=(150, 3)).astype(np.float32)
+    y = np.stack([x.sum(axis=1), x[:, 0] * x[:, 2]], axis=1).astype(np.float32)
+
+    runs = {}
+    for training_loop in ("resident", "dataloader"):
+        torch.manual_seed(7)
+        model = SurrogateMLP(
+            input_dim=3, output_dim=2, hidden_dim=16, num_hidden_layers=2
+        )
+        # 120 training rows leave a short last batch of 24.
+        best_val_loss, history, _ = fit_model(
+            model,
+            x[:120],
+            y[:120],
+            x[120:],
+            y[120:],
+            epochs=6,
+            batch_size=32,
+            lr=1e-2,
+            training_loop=training_loop,
+            log_every=None,
+            lr_schedule=lr_schedule,
+            lr_patience=1,
+        )
+        runs[training_loop] = best_val_loss, history, model.state_dict()
+
+    resident, dataloader = runs["resident"], runs["dataloader"]
+    assert resident[0] == pytest.approx(dataloader[0], rel=1e-12)
+    for name in ("train_loss", "val_loss", "lr"):
+        assert resident[1][name] == pytest.approx(dataloader[1][name], rel=1e-12)
+    assert resident[2].keys() == dataloader[2].keys()
+    for name, tensor in resident[2].items():
+        assert torch.equal(tensor, dataloader[2][name]), name
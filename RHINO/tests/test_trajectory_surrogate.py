@@ -0,0 +1,93 @@
+import json
+import sys
+
+import numpy as np
+import torch
+
+from RHINO.demo.surrogate import train_trajectory_surrogate
+from RHINO.demo.surrogate.rhino_surrogate_runtime import SurrogateMLP
+from RHINO.demo.surrogate.rhino_trajectory_runtime import RhinoTrajectorySurrogate
+
+
+def write_trajectories(path):
+    rng = np.random.default_rng(0)
+    runs = 40
+    inputs = np.column_stack(
+        [rng.uniform(50.0, 100.0, runs), rng.uniform(0.01, 0.06, runs)]
+    )
+    times = np.linspace(0.0, 10.0, 25)
+    # Subsystem inventories several orders of magnitude apart.
+    mass = np.stack(
+        [
+            inputs[:, :1]
+            * (1.0 + 10.0 * inputs[:, 1:])
+            * (1.0 - np.exp(-times / (1.0 + subsystem)))
+            * 10.0**subsystem
+            for subsystem in range(3)
+        ],
+        axis=1,
+    )
+    metadata = {
+        "input_specs": [
+            {"key": "Ndotminus", "display_name": "Ndotminus"},
+            {"key": "beta", "display_name": "beta"},
+        ],
+        "downsample_step": 1,
+        "subsystems": {"FW": 0, "BLK": 1, "TES": 2},
+        "injectors": {},
+        "flows": {},
+    }
+    np.savez_compressed(
+        path,
+        inputs=inputs,
+        mass=mass,
+        times=times,
+        metadata=np.array(json.dumps(metadata)),
+    )
+    return inputs
+
+
+def test_folded_reconstruction_matches_mlp_and_basis(tmp_path, monkeypatch):
+    inputs = write_trajectories(tmp_path / "trajectories.npz")
+    model_path = tmp_path / "trajectory_surrogate.pt"
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "train_trajectory_surrogate.py",
+            "--dataset", str(tmp_path / "trajectories.npz"),
+            "--output", str(model_path),
+            "--epochs", "20",
+            "--hidden-dim", "16",
+            "--num-hidden-layers", "2",
+        ],
+    )
+    train_trajectory_surrogate.main()
+
+    surrogate = RhinoTrajectorySurrogate(model_path)
+    assert surrogate.trajectory_shape == (3, 25)
+    assert surrogate.names_map == {0: "FW", 1: "BLK", 2: "TES"}
+
+    # Unfused reference: network coefficients times the basis, in float64.
+    artifact = torch.load(model_path)
+    model = SurrogateMLP(**artifact["model_config"])
+    model.load_state_dict(artifact["model_state_dict"])
+    model.eval()
+    x_raw = inputs.astype(np.float32)
+    with torch.no_grad():
+        coefficients = model(
+            (torch.from_numpy(x_raw) - artifact["x_mean"]) / artifact["x_std"]
+        ).double()
+    reference = (
+        coefficients @ artifact["basis"].double() + artifact["offset"].double()
+    ).numpy().reshape(-1, 3, 25)
+
+    predicted = surrogate.predict_trajectories(x_raw)
+    assert predicted.shape == reference.shape
+    # float32 rounding of the folded weights, relative to the largest inventory.
+    assert np.abs(predicted - reference).max() <= 1e-6 * np.abs(reference).max()
+
+    inputs_by_key = {"Ndotminus": float(x_raw[3, 0]), "beta": float(x_raw[3, 1])}
+    np.testing.assert_array_equal(
+        surrogate.predict_trajectory(inputs_by_key), predicted[3]
+    )
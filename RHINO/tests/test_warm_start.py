@@ -0,0 +1,158 @@
+import json
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+import torch
+
+from trainSurrogate import SurrogateMLP, extend_split, rebase_normalization
+
+from conftest import RHINO_ROOT
+
+TRAIN_SCRIPT = RHINO_ROOT / "ML" / "surrogate_training" / "trainSurrogate.py"
+
+
+def identities(names):
+    return [("rhino.tar", str(number), name) for number, name in enumerate(names)]
+
+
+def test_extend_split_follows_runs_inserted_mid_table():
+    old_runs = identities([f"old-{number}" for number in range(20)])
+    previous_split = {
+        "run_identities": [list(run) for run in old_runs],
+        "train_idx": list(range(0, 14)),
+        "val_idx": [14, 15, 16],
+        "test_idx": [17, 18, 19],
+    }
+    new_runs = [("rhino2.tar", str(number), f"new-{number}") for number in range(10)]
+    # New runs in the middle, and the old runs in a different order.
+    current = old_runs[12:] + new_runs + old_runs[:12][::-1]
+
+    train_idx, val_idx, test_idx = extend_split(previous_split, current, seed=3)
+
+    assignment = {}
+    for name, rows in (("train", train_idx), ("val", val_idx), ("test", test_idx)):
+        for row in rows:
+            assert current[row] not in assignment
+            assignment[current[row]] = name
+    assert set(assignment) == set(current)
+    for key, name in (("train_idx", "train"), ("val_idx", "val"), ("test_idx", "test")):
+        for previous_row in previous_split[key]:
+            assert assignment[old_runs[previous_row]] == name
+    new_assignment = [assignment[run] for run in new_runs]
+    assert new_assignment.count("train") == 8
+    assert new_assignment.count("val") == 2
+
+
+def test_extend_split_rejects_missing_runs():
+    old_runs = identities(["a", "b", "c", "d"])
+    previous_split = {
+        "run_identities": [list(run) for run in old_runs],
+        "train_idx": [0, 1],
+        "val_idx": [2],
+        "test_idx": [3],
+    }
+    with pytest.raises(ValueError, match="1 run"):
+        extend_split(previous_split, old_runs[:2] + old_runs[3:], seed=0)
+    with pytest.raises(ValueError, match="duplicate"):
+        extend_split(previous_split, old_runs + old_runs[:1], seed=0)
+    with pytest.raises(ValueError, match="run identity"):
+        extend_split(previous_split, None, seed=0)
+
+
+def test_rebase_normalization_keeps_physical_predictions():
+    torch.manual_seed(0)
+    model = SurrogateMLP(input_dim=3, output_dim=2, hidden_dim=16, num_hidden_layers=2)
+    old = [
+        np.array([10.0, -1.0, 0.5]),
+        np.array([2.0, 0.1, 3.0]),
+        np.array([100.0, 0.0]),
+        np.array([5.0, 0.01]),
+    ]
+    new = [
+        np.array([11.0, -0.5, 0.4]),
+        np.array([2.5, 0.2, 2.0]),
+        np.array([90.0, 0.02]),
+        np.array([7.0, 0.02]),
+    ]
+    x = torch.randn(32, 3, dtype=torch.float64) * 3.0 + 10.0
+
+    def physical(statistics):
+        x_mean, x_std, y_mean, y_std = (torch.tensor(value) for value in statistics)
+        with torch.no_grad():
+            y = model.double()((x - x_mean) / x_std)
+        return y * y_std + y_mean
+
+    before = physical(old)
+    rebase_normalization(model, old, new)
+    torch.testing.assert_close(physical(new), before, rtol=1e-5, atol=1e-6)
+
+
+def write_features(path, runs):
+    rng = np.random.default_rng(len(runs))
+    x = rng.uniform(0.0, 1.0, size=(len(runs), 2))
+    pd.DataFrame(
+        {
+            "archive": [run[0] for run in runs],
+            "datasetid": [int(run[1]) for run in runs],
+            "run_id": [run[2] for run in runs],
+            "a": x[:, 0],
+            "b": x[:, 1],
+            "y": np.sin(3.0 * x[:, 0]) + x[:, 1] ** 2,
+        }
+    ).to_csv(path, index=False)
+
+
+def train(*arguments):
+    subprocess.run(
+        [
+            sys.executable,
+            str(TRAIN_SCRIPT),
+            "--inputs", "a", "b",
+            "--outputs", "y",
+            "--epochs", "4",
+            "--hidden-dim", "8",
+            "--hidden-layers", "1",
+            *arguments,
+        ],
+        check=True,
+        capture_output=True,
+    )
+
+
+def test_warm_start_reports_full_retrain_comparison(tmp_path):
+    old_runs = identities([f"old-{number}" for number in range(60)])
+    new_runs = [("rhino2.tar", str(number), f"new-{number}") for number in range(20)]
+    write_features(tmp_path / "old.csv", old_runs)
+    write_features(tmp_path / "new.csv", old_runs[:30] + new_runs + old_runs[30:])
+    train("--features", str(tmp_path / "old.csv"), "--outdir", str(tmp_path / "v1"))
+    train(
+        "--features", str(tmp_path / "new.csv"),
+        "--outdir", str(tmp_path / "v2"),
+        "--warm-start", str(tmp_path / "v1" / "rhino_surrogate.pt"),
+        "--fine-tune-epochs", "2",
+        "--compare-full-retrain",
+    )
+
+    splits = [
+        json.loads((tmp_path / version / "split_indices.json").read_text())
+        for version in ("v1", "v2")
+    ]
+    split_keys = ("train_idx", "val_idx", "test_idx")
+    for key in split_keys:
+        before = {tuple(splits[0]["run_identities"][row]) for row in splits[0][key]}
+        after = {tuple(splits[1]["run_identities"][row]) for row in splits[1][key]}
+        assert before <= after
+    assert sum(len(splits[1][key]) for key in split_keys) == 80
+
+    report = splits[1]["warm_start"]
+    assert report["full_retrain_epochs"] == 4
+    assert report["fine_tune_epochs"] == 2
+    assert report["full_retrain_test_loss"] > 0
+    assert report["test_loss_ratio"] == pytest.approx(
+        report["test_loss"] / report["full_retrain_test_loss"]
+    )
+    artifact = torch.load(tmp_path / "v2" / "rhino_surrogate.pt")
+    assert artifact["warm_start"] == report